@@ -1,90 +1,152 @@
 """审计节点 - 验证候选人主页并提取信息"""
 
+import asyncio
 import logging
-import json
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Sequence, Tuple
 
 from app.agents.state import AgentState
-from app.agents.tools.verify import check_url_connectivity, fetch_page_text, semantic_match, extract_email_simple
-from app.core.llm import get_llm
-from langchain.prompts import ChatPromptTemplate
+from app.agents.tools.verify import check_url_connectivity, fetch_page, fetch_page_text
+from app.agents.tools.page_analyzer import PageAnalysis, analyze_page
+from app.agents.tools.negative_cache import negative_cache
+from app.agents.tools.page_store import PageStore, get_page_store
+from app.agents.tools.llm_extractor import BatchItem, extract_profile_with_llm, get_llm_batch_queue
+from app.agents.tools.rule_extractor import RULE_FIELDS, extract_profile_rules
+from app.api.models import CandidateProfile
+from app.core.config import settings
+from app.core.executor import run_cpu_bound
+from app.core.llm_gateway import llm_gateway
 
 logger = logging.getLogger(__name__)
 
 
-# LLM提示词用于档案提取
-PROFILE_EXTRACTION_PROMPT = """你是一位专业的HR研究员。
-我将提供一位学者主页的文本内容。
-你必须将以下字段提取为JSON格式：
-
-- `name_cn`: 中文姓名汉字（例如："张三"）。如果未找到则返回null。
-- `email`: 电子邮箱地址。如果未找到则返回null。
-- `bachelor_univ`: 他们获得学士/本科学位的大学。查找"B.S."、"B.E."、"Bachelor"、"Undergraduate"。如果未找到则返回null。
-- `is_verified`: 布尔值。如果页面明确提到所属单位"{affiliation}"则为True。
-
-输入姓名: {name}
-输入所属单位: {affiliation}
-
-页面内容:
-{page_text}
-
-仅返回包含这4个字段的有效JSON对象。不要额外的文本或解释。
-"""
+async def verify_homepage(
+    url: str,
+    name: str,
+    affiliation: str,
+    page_store: Optional[PageStore] = None
+) -> Tuple[Optional[str], Optional[PageAnalysis], Optional[str]]:
+    """
+    对单个URL执行连接性检查、内容获取和语义匹配
+    
+    Args:
+        url: 候选主页URL
+        name: 候选人姓名
+        affiliation: 预期所属单位
+        page_store: 任务级页面缓存（可选），同一页面在任务内只获取一次
+        
+    Returns:
+        元组(page_text, analysis, failure_reason)，验证通过时failure_reason为None
+    """
+    # 步骤1: 检查连接性（页面已在任务缓存中时无需再检查）
+    if not (page_store and page_store.contains(url)):
+        is_accessible, status_code = await check_url_connectivity(url)
+        
+        if not is_accessible:
+            logger.warning(f"[审计节点] URL不可访问 (状态码 {status_code}): {url}")
+            return None, None, f"主页不可访问 (HTTP {status_code})"
+    
+    # 步骤2: 获取页面内容
+    if page_store:
+        page_text = await page_store.get_text(url, fetch_page)
+    else:
+        page_text = await fetch_page_text(url)
+    
+    if not page_text:
+        logger.warning(f"[审计节点] 获取页面文本失败: {url}")
+        return None, None, "无法提取页面内容"
+    
+    # 步骤3: 单次扫描页面，语义匹配并提取邮箱/中文名/教育经历线索
+    analysis = await run_cpu_bound(analyze_page, page_text, name, affiliation, size_hint=len(page_text))
+    
+    if not analysis.is_match:
+        logger.warning(f"[审计节点] 页面内容与候选人不匹配: {url}")
+        negative_cache.record_mismatch(url, name, affiliation)
+        return None, None, "页面内容与姓名/所属单位不匹配"
+    
+    return page_text, analysis, None
 
 
-async def extract_profile_with_llm(
-    page_text: str, 
-    name: str, 
-    affiliation: str
-) -> Optional[Dict]:
+async def verify_homepages_hedged(
+    urls: List[str],
+    name: str,
+    affiliation: str,
+    page_store: Optional[PageStore] = None
+) -> Tuple[Optional[str], Optional[str], Optional[PageAnalysis], Optional[str]]:
     """
-    使用LLM从主页文本中提取结构化信息
+    并发验证多个候选URL，采用第一个验证通过的结果并取消其余任务
     
     Args:
-        page_text: 主页的文本内容
+        urls: 按评分排序的候选URL列表
         name: 候选人姓名
         affiliation: 预期所属单位
+        page_store: 任务级页面缓存（可选）
         
     Returns:
-        包含提取字段的字典，如果提取失败则返回None
+        元组(url, page_text, analysis, failure_reason)；全部失败时返回排名第一的URL的失败原因
     """
+    tasks = {
+        asyncio.create_task(verify_homepage(url, name, affiliation, page_store)): url
+        for url in urls
+    }
+    failures: Dict[str, str] = {}
+    
     try:
-        llm = get_llm()
-        
-        prompt = ChatPromptTemplate.from_template(PROFILE_EXTRACTION_PROMPT)
-        chain = prompt | llm
-        
-        response = await chain.ainvoke({
-            "name": name,
-            "affiliation": affiliation,
-            "page_text": page_text[:8000]  # 限制长度以避免token溢出
-        })
-        
-        # 将LLM响应解析为JSON
-        content = response.content
-        
-        # 尝试从响应中提取JSON
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0]
-        
-        extracted = json.loads(content.strip())
-        
-        logger.info(f"[审计节点] LLM提取结果: {extracted}")
-        return extracted
-        
-    except Exception as e:
-        logger.error(f"[审计节点] LLM提取失败: {str(e)}")
-        return None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                url = tasks[task]
+                try:
+                    page_text, analysis, reason = task.result()
+                except Exception as e:
+                    page_text, analysis, reason = None, None, f"验证异常: {str(e)}"
+                
+                if page_text:
+                    logger.info(f"[审计节点] 并发验证命中: {url} (共{len(urls)}个候选)")
+                    return url, page_text, analysis, None
+                failures[url] = reason
+    finally:
+        # 取消仍在运行的验证任务
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+    
+    return None, None, None, failures.get(urls[0], "所有候选主页验证失败")
+
+
+def apply_extraction(
+    candidate: CandidateProfile,
+    extracted: Optional[Dict],
+    fields: Sequence[str] = RULE_FIELDS
+) -> None:
+    """
+    将LLM提取结果写回候选人（仅覆盖请求提取的非空字段）
+    
+    Args:
+        candidate: 候选人档案
+        extracted: LLM提取结果，提取失败或未调用LLM时为None
+        fields: 交给LLM提取的字段
+    """
+    if extracted:
+        # 如果有LLM结果则覆盖
+        for field in fields:
+            if extracted.get(field):
+                setattr(candidate, field, extracted[field])
+    
+    logger.info(f"[审计节点] 提取结果 - 邮箱: {candidate.email}, 中文名: {candidate.name_cn}, 本科院校: {candidate.bachelor_univ}")
 
 
 async def auditor_node(state: AgentState) -> AgentState:
     """
     节点4: 审计
     对有主页URL的候选人执行二元验证
-    如果验证通过，使用LLM提取额外信息
+    如果验证通过，先用规则提取邮箱/中文名/本科院校，仅对缺失或低置信度的字段调用LLM
+    
+    启用批量提取时，已验证的候选人进入任务级队列，凑满一批后合并为一次LLM请求
+    
+    启用并发验证时，同时审计侦探节点给出的前K个候选URL，
+    第一个验证通过的URL将替换为候选人主页
     
     Args:
         state: 当前智能体状态
@@ -93,39 +155,36 @@ async def auditor_node(state: AgentState) -> AgentState:
         包含验证结果的更新状态
     """
     candidates = state["candidates"]
+    page_store = get_page_store(state["job_id"])
+    batch_queue = get_llm_batch_queue(state["job_id"])
+    # 强制刷新时跳过LLM缓存读取（全局配置或本次请求指定）
+    use_llm_cache = not (settings.LLM_CACHE_REFRESH or state.get("refresh_llm_cache", False))
     
     # 查找需要审计的候选人（有主页但尚未验证/失败）
     for idx, candidate in enumerate(candidates):
         if candidate.homepage and candidate.status == "PENDING":
             logger.info(f"[审计节点] 验证 #{idx}: {candidate.name} -> {candidate.homepage}")
             
-            # 步骤1: 检查连接性
-            is_accessible, status_code = await check_url_connectivity(candidate.homepage)
+            # 步骤1-3: 连接性检查、获取页面内容、语义匹配
+            urls = candidate.candidate_urls or [candidate.homepage]
+            if settings.HEDGED_VERIFICATION_ENABLED and len(urls) > 1:
+                verified_url, page_text, analysis, failure_reason = await verify_homepages_hedged(
+                    urls, candidate.name, candidate.affiliation, page_store
+                )
+                if verified_url:
+                    candidate.homepage = verified_url
+            else:
+                page_text, analysis, failure_reason = await verify_homepage(
+                    candidate.homepage, candidate.name, candidate.affiliation, page_store
+                )
             
-            if not is_accessible:
-                logger.warning(f"[审计节点] URL不可访问 (状态码 {status_code})")
-                candidate.status = "FAILED"
-                candidate.skip_reason = f"主页不可访问 (HTTP {status_code})"
-                candidate.verification_time = datetime.now()
-                continue
-            
-            # 步骤2: 获取页面内容
-            page_text = await fetch_page_text(candidate.homepage)
+            # 释放侦探节点登记的页面引用（文本已由本地变量持有）
+            for url in urls:
+                page_store.release(url)
             
-            if not page_text:
-                logger.warning(f"[审计节点] 获取页面文本失败")
+            if failure_reason:
                 candidate.status = "FAILED"
-                candidate.skip_reason = "无法提取页面内容"
-                candidate.verification_time = datetime.now()
-                continue
-            
-            # 步骤3: 语义匹配
-            is_match = semantic_match(page_text, candidate.name, candidate.affiliation)
-            
-            if not is_match:
-                logger.warning(f"[审计节点] 页面内容与候选人不匹配")
-                candidate.status = "FAILED"
-                candidate.skip_reason = "页面内容与姓名/所属单位不匹配"
+                candidate.skip_reason = failure_reason
                 candidate.verification_time = datetime.now()
                 continue
             
@@ -133,24 +192,70 @@ async def auditor_node(state: AgentState) -> AgentState:
             logger.info(f"[审计节点] ✓ 验证通过: {candidate.name}")
             candidate.status = "VERIFIED"
             
-            # 首先提取简单邮箱（回退方案）
-            candidate.email = extract_email_simple(page_text)
+            candidate.verification_time = datetime.now()
             
-            # 使用LLM进行高级提取
-            extracted = await extract_profile_with_llm(page_text, candidate.name, candidate.affiliation)
+            if settings.RULE_EXTRACTION_ENABLED:
+                # 规则提取：上游已提供（例如AMiner中文名）或页面中无歧义的字段不再交给LLM
+                guesses = extract_profile_rules(
+                    page_text, analysis, candidate.name, candidate.affiliation,
+                    known={"email": candidate.email, "name_cn": candidate.name_cn}
+                )
+                # 只采用高置信度结果；低置信度字段交给LLM，不写入候选人
+                fields = []
+                for field, guess in guesses.items():
+                    if guess.value and guess.confidence >= settings.RULE_EXTRACTION_MIN_CONFIDENCE:
+                        setattr(candidate, field, guess.value)
+                    else:
+                        fields.append(field)
+            else:
+                # 首先使用页面分析得到的邮箱（回退方案）
+                candidate.email = analysis.primary_email
+                fields = list(RULE_FIELDS)
             
-            if extracted:
-                # 如果有LLM结果则覆盖
-                if extracted.get('email'):
-                    candidate.email = extracted['email']
-                if extracted.get('name_cn'):
-                    candidate.name_cn = extracted['name_cn']
-                if extracted.get('bachelor_univ'):
-                    candidate.bachelor_univ = extracted['bachelor_univ']
+            if not fields:
+                logger.info(f"[审计节点] 规则提取已解析全部字段，跳过LLM: {candidate.name}")
+                llm_gateway.record_avoided_call()
+                apply_extraction(candidate, None)
+                continue
             
-            candidate.verification_time = datetime.now()
+            if settings.LLM_BATCH_SIZE > 1:
+                # 批量模式：加入任务队列，凑满一批后统一提取
+                extracted = await batch_queue.enqueue(BatchItem(
+                    key=idx,
+                    name=candidate.name,
+                    affiliation=candidate.affiliation,
+                    page_text=page_text,
+                    analysis=analysis,
+                    fields=fields,
+                ), use_cache=use_llm_cache)
+                if extracted:
+                    apply_extraction(candidate, extracted, fields)
+                continue
             
-            logger.info(f"[审计节点] 提取结果 - 邮箱: {candidate.email}, 中文名: {candidate.name_cn}, 本科院校: {candidate.bachelor_univ}")
+            # 使用LLM提取剩余字段（复用页面分析结果作为线索）
+            extracted = await extract_profile_with_llm(
+                page_text, candidate.name, candidate.affiliation, analysis,
+                use_cache=use_llm_cache, fields=fields
+            )
+            apply_extraction(candidate, extracted, fields)
+    
+    # 没有待处理候选人时任务的审计阶段结束
+    no_pending = not any(c.status == "PENDING" for c in candidates[state["current_index"]:])
+    
+    if settings.LLM_BATCH_SIZE > 1:
+        # 发送已凑满的批次；审计结束时连同最后一个未凑满的批次一起发送
+        for item, extracted in await batch_queue.drain(force=no_pending):
+            apply_extraction(candidates[item.key], extracted, item.fields)
+        
+        if no_pending and batch_queue.requests:
+            logger.info(f"[审计节点] LLM批量提取完成，共{batch_queue.requests}次请求")
+    
+    if no_pending:
+        usage = llm_gateway.job_usage(state["job_id"])
+        if usage.get("avoided_calls"):
+            logger.info(
+                f"[审计节点] 规则提取避免了{usage['avoided_calls']}次LLM调用 "
+                f"(占比 {usage['avoided_ratio']:.1%})"
+            )
     
     return state
-
@@ -1,19 +1,25 @@
 """侦探节点 - 搜索并发现候选人主页，集成AMiner学者验证"""
 
+import asyncio
 import logging
-from typing import Optional
+from typing import List, Optional
 
 from app.agents.state import AgentState
+from app.agents.nodes.auditor import verify_homepage
 from app.agents.tools.search import search_scholar_homepage
 from app.agents.tools.aminer_api import aminer_api
+from app.agents.tools.institution_registry import lookup_domains, is_on_domain
+from app.agents.tools.negative_cache import negative_cache
+from app.agents.tools.page_store import get_page_store
 from app.core.config import settings
+from app.services.scholar_kb import scholar_kb, apply_profile
 
 logger = logging.getLogger(__name__)
 
 
-def find_best_homepage_url(search_results: list, candidate_name: str, affiliation: str) -> Optional[str]:
+def rank_homepage_urls(search_results: list, candidate_name: str, affiliation: str) -> List[str]:
     """
-    分析搜索结果并选择最可能的主页URL
+    分析搜索结果并按主页可能性对URL排序
     
     Args:
         search_results: DuckDuckGo的搜索结果列表
@@ -21,16 +27,21 @@ def find_best_homepage_url(search_results: list, candidate_name: str, affiliatio
         affiliation: 要匹配的所属单位
         
     Returns:
-        最佳匹配的URL或None
+        得分为正的URL列表，按得分从高到低排序
     """
     if not search_results:
-        return None
+        return []
     
-    # URL选择的评分启发式
-    best_url = None
-    best_score = 0
+    scored = []
+    
+    # 从机构注册表获取官方域名（每个候选人只查一次）
+    domains = lookup_domains(affiliation)
     
     for result in search_results:
+        # 跳过近期不可访问或已知与该候选人不匹配的URL
+        if negative_cache.should_skip(result.get('url', ''), candidate_name, affiliation):
+            continue
+        
         url = result.get('url', '').lower()
         title = result.get('title', '').lower()
         snippet = result.get('snippet', '').lower()
@@ -44,8 +55,11 @@ def find_best_homepage_url(search_results: list, candidate_name: str, affiliatio
         if any(keyword in title for keyword in ['homepage', 'home page', 'personal page']):
             score += 2
         
-        # 大学域名是好的信号
-        if any(domain in url for domain in ['.edu', '.ac.', affiliation.lower().replace(' ', '')[:10]]):
+        # 机构官方域名是强信号；注册表未收录时回退到通用大学域名判断
+        if domains:
+            if is_on_domain(url, domains):
+                score += 4
+        elif any(domain in url for domain in ['.edu', '.ac.', affiliation.lower().replace(' ', '')[:10]]):
             score += 2
         
         # URL中包含姓名是强信号
@@ -60,11 +74,28 @@ def find_best_homepage_url(search_results: list, candidate_name: str, affiliatio
         if any(keyword in url for keyword in ['pdf', 'paper', 'publication', 'arxiv']):
             score -= 2
         
-        if score > best_score:
-            best_score = score
-            best_url = result['url']
+        if score > 0 and result['url'] not in (u for _, u in scored):
+            scored.append((score, result['url']))
     
-    return best_url
+    # 稳定排序：同分时保留搜索引擎的原始顺序
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [url for _, url in scored]
+
+
+def find_best_homepage_url(search_results: list, candidate_name: str, affiliation: str) -> Optional[str]:
+    """
+    分析搜索结果并选择最可能的主页URL
+    
+    Args:
+        search_results: DuckDuckGo的搜索结果列表
+        candidate_name: 候选人姓名
+        affiliation: 要匹配的所属单位
+        
+    Returns:
+        最佳匹配的URL或None
+    """
+    ranked = rank_homepage_urls(search_results, candidate_name, affiliation)
+    return ranked[0] if ranked else None
 
 
 async def detective_node(state: AgentState) -> AgentState:
@@ -75,8 +106,10 @@ async def detective_node(state: AgentState) -> AgentState:
     一次处理一个PENDING候选人
     
     处理流程：
-    1. 尝试通过AMiner API验证候选人身份（如果启用）
-    2. 如果AMiner验证失败或未启用，使用DuckDuckGo搜索主页
+    0. 查询学者知识库（如果启用），命中新鲜档案时不再发起任何外部调用；
+       过期档案的主页失效时继续执行以下步骤
+    1. AMiner身份验证（如果启用）与DuckDuckGo主页搜索并发执行
+    2. AMiner匹配成功后在后台获取学者详情，同时对搜索结果排序
     3. 补充候选人信息
     
     Args:
@@ -95,50 +128,100 @@ async def detective_node(state: AgentState) -> AgentState:
         if candidate.status == "PENDING":
             logger.info(f"[侦探节点] 处理 #{current_index}: {candidate.name} ({candidate.affiliation})")
             
-            # 步骤1: 尝试使用AMiner API进行验证和补充（如果启用）
+            # 步骤0: 先查学者知识库，新鲜档案直接使用；过期档案先检查已知主页，仍有效时只交给审计节点重新验证
+            if settings.SCHOLAR_KB_ENABLED:
+                entry = scholar_kb.lookup(candidate.name, candidate.affiliation, candidate.aminer_id)
+                if entry and entry.get("homepage"):
+                    if entry["fresh"]:
+                        logger.info(f"[侦探节点] 知识库命中: {candidate.name} (来源: {', '.join(entry['sources'])})")
+                        apply_profile(candidate, entry)
+                        candidate.homepage = entry["homepage"]
+                        candidate.status = "VERIFIED"
+                        state["current_index"] = current_index + 1
+                        return state
+                    
+                    # 页面进入任务级缓存，审计节点重新验证时不再下载
+                    page_store = get_page_store(state["job_id"])
+                    _, _, failure_reason = await verify_homepage(
+                        entry["homepage"], candidate.name, candidate.affiliation, page_store
+                    )
+                    if failure_reason is None:
+                        logger.info(f"[侦探节点] 知识库档案已过期，交给审计节点重新验证主页: {entry['homepage']}")
+                        apply_profile(candidate, entry)
+                        candidate.homepage = entry["homepage"]
+                        candidate.candidate_urls = [entry["homepage"]]
+                        page_store.retain(entry["homepage"])
+                        candidate.status = "PENDING"  # 等待审计节点重新验证
+                        state["current_index"] = current_index + 1
+                        return state
+                    
+                    logger.info(f"[侦探节点] 知识库档案主页已失效({failure_reason})，回退到AMiner/搜索: {candidate.name}")
+            
+            # 步骤1-2: AMiner学者匹配与DuckDuckGo主页搜索并发执行
+            # （DDGS是同步客户端，放到线程中执行以免阻塞事件循环）
+            search_task = asyncio.create_task(
+                asyncio.to_thread(search_scholar_homepage, candidate.name, candidate.affiliation)
+            )
+            
             aminer_enriched = False
+            detail_task = None
+            aminer_match = None
             if settings.AMINER_ENABLED and settings.AMINER_API_KEY:
                 try:
                     logger.info(f"[侦探节点] 尝试AMiner验证: {candidate.name}")
-                    aminer_result = await aminer_api.validate_and_enrich(
+                    aminer_match = await aminer_api.match_scholar(
                         name=candidate.name,
                         affiliation=candidate.affiliation,
                         email=candidate.email
                     )
                     
-                    if aminer_result and aminer_result.get("is_verified"):
-                        # 成功验证并补充信息
-                        candidate.name_cn = aminer_result.get("name_cn")
-                        candidate.email = aminer_result.get("email") or candidate.email
-                        
-                        # 存储interests作为研究方向补充
-                        if not hasattr(candidate, 'interests'):
-                            candidate.interests = []
-                        candidate.interests.extend(aminer_result.get("interests", []))
-                        
-                        # 存储AMiner ID用于后续参考
-                        if not hasattr(candidate, 'aminer_id'):
-                            candidate.aminer_id = None
-                        candidate.aminer_id = aminer_result.get("aminer_id")
-                        
-                        logger.info(f"[侦探节点] AMiner验证成功: {candidate.name} (置信度: {aminer_result.get('confidence_score', 0):.2f})")
-                        aminer_enriched = True
+                    if aminer_match.get("is_verified"):
+                        # 学者详情在后台获取，与搜索结果排序重叠
+                        detail_task = asyncio.create_task(aminer_api.get_person_detail(aminer_match["id"]))
                     else:
-                        reason = aminer_result.get("reason", "unknown") if aminer_result else "api_error"
+                        reason = aminer_match.get("reason", "unknown")
                         logger.debug(f"[侦探节点] AMiner未找到匹配或置信度低: {candidate.name} ({reason})")
                         
                 except Exception as e:
                     logger.warning(f"[侦探节点] AMiner API异常: {str(e)}")
             
-            # 步骤2: 使用DuckDuckGo搜索主页（AMiner成功或未启用时都需要搜索主页）
-            search_results = search_scholar_homepage(candidate.name, candidate.affiliation)
+            search_results = await search_task
+            ranked_urls = rank_homepage_urls(search_results, candidate.name, candidate.affiliation) if search_results else []
+            
+            if detail_task:
+                try:
+                    aminer_result = aminer_api.build_enrichment(
+                        candidate.name, aminer_match, await detail_task, candidate.email
+                    )
+                    
+                    # 成功验证并补充信息
+                    candidate.name_cn = aminer_result.get("name_cn")
+                    candidate.email = aminer_result.get("email") or candidate.email
+                    
+                    # 存储AMiner ID用于后续参考（学者知识库也按该ID索引）
+                    candidate.aminer_id = aminer_result.get("aminer_id")
+                    
+                    # 存储interests作为研究方向补充（模型中interests默认为None）
+                    candidate.interests = (candidate.interests or []) + aminer_result.get("interests", [])
+                    
+                    logger.info(f"[侦探节点] AMiner验证成功: {candidate.name} (置信度: {aminer_result.get('confidence_score', 0):.2f})")
+                    aminer_enriched = True
+                    
+                except Exception as e:
+                    logger.warning(f"[侦探节点] AMiner API异常: {str(e)}")
             
             if search_results:
-                # 查找最佳匹配URL
-                best_url = find_best_homepage_url(search_results, candidate.name, candidate.affiliation)
+                # 按评分排序的候选URL中排名第一的作为主页
+                best_url = ranked_urls[0] if ranked_urls else None
                 
                 if best_url:
                     candidate.homepage = best_url
+                    # 保留前K个候选URL供审计节点并发验证
+                    candidate.candidate_urls = ranked_urls[:settings.HEDGED_VERIFICATION_TOP_K]
+                    # 在任务级页面缓存中登记引用，多个候选人共享的页面只获取一次
+                    page_store = get_page_store(state["job_id"])
+                    for url in candidate.candidate_urls:
+                        page_store.retain(url)
                     logger.info(f"[侦探节点] 找到URL: {best_url}")
                     # 如果找到主页，更新状态为继续处理
                     candidate.status = "PENDING"  # 等待审计节点处理
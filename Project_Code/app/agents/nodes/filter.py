@@ -1,26 +1,26 @@
 """过滤节点 - 识别海外华人学者"""
 
-from xpinyin import Pinyin
 import logging
+from collections import Counter
+from typing import List, Optional, Tuple
 
 from app.agents.state import AgentState
+from app.api.models import CandidateProfile
+from app.agents.tools.chinese_name import classify_name, classify_names
+from app.agents.tools.country_resolver import resolve_countries, resolve_country
+from app.agents.tools.region_gazetteer import MAINLAND_CHINA
+from app.core.config import settings
+from app.core.executor import map_sharded
 
 logger = logging.getLogger(__name__)
 
-# 初始化拼音转换器
-pinyin = Pinyin()
-
-# 表明是中国大陆的关键词（这些应该被跳过，因为不是"海外"）
-MAINLAND_CHINA_KEYWORDS = [
-    "tsinghua", "peking university", "pku", "beijing", "shanghai",
-    "fudan", "zhejiang university", "nanjing", "china", "chinese academy",
-    "cas", "ustc", "harbin", "wuhan", "xi'an", "chengdu", "guangzhou"
-]
+SKIP_REASON_NOT_CHINESE = "姓名看起来不是中文"
+SKIP_REASON_MAINLAND = "所属单位在中国大陆（非海外）"
 
 
 def is_chinese_name(name: str) -> bool:
     """
-    使用拼音转换检查姓名是否为中文
+    检查姓名是否为中文（汉字、普通话拼音、威妥玛或粤语拼写的姓氏）
     
     Args:
         name: 要检查的全名
@@ -28,35 +28,7 @@ def is_chinese_name(name: str) -> bool:
     Returns:
         如果姓名看起来是中文则返回True
     """
-    try:
-        # 转换为拼音 - 如果已经是拼音/英文，不会有太大变化
-        pinyin_result = pinyin.get_pinyin(name, '')
-        
-        # 简单启发式：如果姓名较短（2-4个字符）且包含汉字
-        # 或者姓名包含常见的中文姓氏模式
-        
-        # 直接检查汉字
-        has_chinese = any('\u4e00' <= char <= '\u9fff' for char in name)
-        
-        if has_chinese:
-            return True
-        
-        # 常见的中文姓氏英文拼音
-        common_surnames = [
-            'wang', 'li', 'zhang', 'liu', 'chen', 'yang', 'huang', 'zhao',
-            'wu', 'zhou', 'xu', 'sun', 'ma', 'zhu', 'hu', 'guo', 'he', 'gao',
-            'lin', 'luo', 'zheng', 'liang', 'song', 'tang', 'xu', 'han', 'feng',
-            'xie', 'yu', 'peng', 'cao'
-        ]
-        
-        name_lower = name.lower()
-        first_word = name_lower.split()[0] if name_lower.split() else ""
-        
-        return first_word in common_surnames
-        
-    except Exception as e:
-        logger.warning(f"拼音检查失败 '{name}': {str(e)}")
-        return False
+    return classify_name(name)
 
 
 def is_mainland_china(affiliation: str) -> bool:
@@ -69,8 +41,58 @@ def is_mainland_china(affiliation: str) -> bool:
     Returns:
         如果所属单位在中国大陆则返回True（应该被跳过）
     """
-    aff_lower = affiliation.lower()
-    return any(keyword in aff_lower for keyword in MAINLAND_CHINA_KEYWORDS)
+    return resolve_country(affiliation) == MAINLAND_CHINA
+
+
+def classify_shard(names: List[str], affiliations: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    对一个分片的候选人批量分类（模块级函数，可在进程池中执行）
+    
+    Args:
+        names: 姓名列表
+        affiliations: 所属单位列表（与names一一对应）
+        
+    Returns:
+        每位候选人的(跳过原因, 国家/地区)，跳过原因为None表示通过
+    """
+    chinese_flags = classify_names(names)
+    regions = resolve_countries(affiliations)
+    
+    results = []
+    for name_is_chinese, region in zip(chinese_flags, regions):
+        if not name_is_chinese:
+            reason = SKIP_REASON_NOT_CHINESE
+        elif region == MAINLAND_CHINA:
+            reason = SKIP_REASON_MAINLAND
+        else:
+            reason = None
+        results.append((reason, region))
+    return results
+
+
+def prefilter_candidates(candidates: List[CandidateProfile]) -> List[CandidateProfile]:
+    """
+    采集阶段的流式预过滤：只保留通过过滤的候选人
+    
+    用于大规模来源（例如Technical Track作者），被跳过的候选人不进入状态，
+    过滤节点之后不会再看到它们
+    
+    Args:
+        candidates: 一批新采集的候选人
+        
+    Returns:
+        通过过滤的候选人（已记录国家/地区）
+    """
+    results = classify_shard([c.name for c in candidates], [c.affiliation for c in candidates])
+    
+    kept = []
+    for candidate, (reason, region) in zip(candidates, results):
+        if reason:
+            continue
+        if region and not candidate.country_region:
+            candidate.country_region = region
+        kept.append(candidate)
+    return kept
 
 
 def filter_node(state: AgentState) -> AgentState:
@@ -80,6 +102,9 @@ def filter_node(state: AgentState) -> AgentState:
     1. 不是中文姓名，或
     2. 在中国大陆（不是"海外"）
     
+    候选人数量较大时按分片交给进程池并行分类，结果按原顺序合并；
+    只输出汇总计数，不逐个记录候选人
+    
     Args:
         state: 当前智能体状态
         
@@ -89,36 +114,37 @@ def filter_node(state: AgentState) -> AgentState:
     logger.info("[过滤节点] 开始过滤流程")
     
     candidates = state["candidates"]
+    pending = [c for c in candidates if c.status == "PENDING"]
+    names = [c.name for c in pending]
+    affiliations = [c.affiliation for c in pending]
     
-    for idx, candidate in enumerate(candidates):
-        if candidate.status != "PENDING":
-            continue
-        
-        # 检查1: 姓名是否为中文？
-        name_is_chinese = is_chinese_name(candidate.name)
-        
-        # 检查2: 所属单位是否在中国大陆？
-        is_mainland = is_mainland_china(candidate.affiliation)
+    if len(pending) >= settings.FILTER_SHARDING_MIN_CANDIDATES:
+        size = max(1, settings.FILTER_SHARD_SIZE)
+        shards = [(names[i:i + size], affiliations[i:i + size]) for i in range(0, len(pending), size)]
+        logger.info(f"[过滤节点] {len(pending)}位候选人分为{len(shards)}个分片并行分类")
+        results = [item for shard in map_sharded(classify_shard, shards) for item in shard]
+    else:
+        results = classify_shard(names, affiliations)
+    
+    reason_counts: Counter = Counter()
+    region_counts: Counter = Counter()
+    
+    for candidate, (reason, region) in zip(pending, results):
+        if region and not candidate.country_region:
+            candidate.country_region = region
+        region_counts[region or "未知"] += 1
         
-        # 如果不是中文或在中国大陆则跳过
-        if not name_is_chinese:
-            candidate.status = "SKIPPED"
-            candidate.skip_reason = "姓名看起来不是中文"
-            logger.info(f"  [{idx}] 跳过: {candidate.name} - 不是中文姓名")
-            
-        elif is_mainland:
+        if reason:
             candidate.status = "SKIPPED"
-            candidate.skip_reason = "所属单位在中国大陆（非海外）"
-            logger.info(f"  [{idx}] 跳过: {candidate.name} - 大陆单位")
-        
-        else:
-            logger.info(f"  [{idx}] 通过: {candidate.name} ({candidate.affiliation})")
+            candidate.skip_reason = reason
+            reason_counts[reason] += 1
     
-    # 统计结果
-    pending_count = sum(1 for c in candidates if c.status == "PENDING")
+    passed = len(pending) - sum(reason_counts.values())
     skipped_count = sum(1 for c in candidates if c.status == "SKIPPED")
     
-    logger.info(f"[过滤节点] 完成: {pending_count}个待处理, {skipped_count}个已跳过")
+    for reason, count in reason_counts.most_common():
+        logger.info(f"  跳过 {count}个: {reason}")
+    logger.info(f"  国家/地区分布: {dict(region_counts.most_common(10))}")
+    logger.info(f"[过滤节点] 完成: {passed}个待处理, {skipped_count}个已跳过")
     
     return state
-
@@ -8,7 +8,10 @@ import logging
 from app.agents.state import AgentState
 from app.api.models import CandidateProfile
 from app.core.config import settings
-from app.agents.tools.aaai_scraper import scrape_all_aaai_sources
+from app.agents.tools.aaai_scraper import scrape_all_aaai_sources, stream_technical_track
+from app.agents.tools.entity_resolution import resolve_entities
+from app.agents.nodes.filter import prefilter_candidates
+from app.services.ingestion_store import restore_previous_results
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +70,41 @@ async def scrape_aaai_page(url: str) -> List[CandidateProfile]:
     return []
 
 
+async def ingest_technical_track(existing: List[CandidateProfile]) -> List[CandidateProfile]:
+    """
+    流式采集Technical Track论文作者
+    
+    每页作者在下一页下载期间完成过滤，只保留通过过滤且未重复的作者，
+    内存占用不随论文总数增长
+    
+    Args:
+        existing: 已从其他来源采集的候选人（用于去重）
+        
+    Returns:
+        新增的候选人列表
+    """
+    seen = {(c.name.lower(), c.affiliation.lower()) for c in existing}
+    added = []
+    streamed = 0
+    
+    try:
+        async for page in stream_technical_track(
+            settings.AAAI_TECHNICAL_TRACK_URL,
+            max_pages=settings.TECHNICAL_TRACK_MAX_PAGES
+        ):
+            streamed += len(page)
+            for candidate in prefilter_candidates(page):
+                key = (candidate.name.lower(), candidate.affiliation.lower())
+                if key not in seen:
+                    seen.add(key)
+                    added.append(candidate)
+    except Exception as e:
+        logger.error(f"[采集节点] Technical Track抓取失败: {str(e)}")
+    
+    logger.info(f"[采集节点] Technical Track: 扫描{streamed}名作者, 新增{len(added)}位候选人")
+    return added
+
+
 async def ingestion_node(state: AgentState) -> AgentState:
     """
     节点1: 采集
@@ -77,6 +115,7 @@ async def ingestion_node(state: AgentState) -> AgentState:
     2. Bridge Program - Bridge Committee成员
     3. Tutorials and Labs - 讲师和指导员
     4. Workshops - Workshop组织者
+    5. Technical Track - 论文作者（逐页流式抓取，每页下载后立即预过滤）
     
     Args:
         state: 当前智能体状态
@@ -108,6 +147,15 @@ async def ingestion_node(state: AgentState) -> AgentState:
             # 降级到模拟数据
             logger.warning("[采集节点] 降级到模拟数据")
             candidates = MOCK_CANDIDATES.copy()
+        
+        if settings.TECHNICAL_TRACK_ENABLED:
+            technical = await ingest_technical_track(candidates)
+            if technical:
+                # 论文作者可能也是讲者/组织者：与其他来源一起做实体消解
+                candidates = resolve_entities(candidates + technical)
+        
+        # 增量采集：未变化的候选人沿用上次任务的结果，只有新增/变化的保持PENDING
+        restore_previous_results(candidates)
     
     state["candidates"] = candidates
     state["current_index"] = 0
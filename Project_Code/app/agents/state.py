@@ -15,4 +15,5 @@ class AgentState(TypedDict):
     current_index: int  # 当前候选人的处理指针
     is_complete: bool  # 标志所有处理是否完成
     error_message: str  # 可选的错误跟踪
+    refresh_llm_cache: bool  # 跳过LLM缓存读取，重新提取（结果仍写入缓存）
 
@@ -1,13 +1,118 @@
 """AAAI-26页面数据提取工具"""
 
+import asyncio
+import re
 import httpx
 import logging
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from urllib.parse import urljoin
 from app.api.models import CandidateProfile
+from app.agents.tools.entity_resolution import resolve_entities
+from app.agents.tools.html_text import parse_html
+from app.agents.tools.workshop_crawler import WorkshopCrawler, parse_workshop_links
+from app.core.config import settings
+from app.core.executor import run_cpu_bound
+from app.services.ingestion_store import load_unchanged_page, save_page
 
 logger = logging.getLogger(__name__)
 
+# 页面解析器版本：修改任一解析函数后递增，使增量采集中缓存的旧解析结果失效
+PARSER_VERSION = 1
+
+
+async def _fetch_html(url: str) -> Optional[str]:
+    """
+    获取页面HTML源码
+    
+    Args:
+        url: 页面URL
+        
+    Returns:
+        HTML源码，请求失败时返回None
+    """
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        response = await client.get(url)
+        
+        if response.status_code != 200:
+            logger.error(f"获取{url}失败: {response.status_code}")
+            return None
+        
+        return response.text
+
+
+async def _parse_page(url: str, html: str, parser) -> List[CandidateProfile]:
+    """
+    解析来源页面；页面内容与上次抓取相同时直接复用上次的解析结果
+    
+    Args:
+        url: 页面URL
+        html: 页面HTML源码
+        parser: 页面解析函数（模块级纯CPU函数）
+        
+    Returns:
+        CandidateProfile列表
+    """
+    parser_version = f"{parser.__name__}@{PARSER_VERSION}"
+    stored = load_unchanged_page(url, html, parser_version)
+    if stored is not None:
+        logger.info(f"页面未变化，复用上次解析结果: {url}")
+        return [CandidateProfile(**c) for c in stored["candidates"]]
+    
+    candidates = await run_cpu_bound(parser, html, size_hint=len(html))
+    save_page(url, html, parser_version, candidates)
+    return candidates
+
+
+def parse_invited_speakers(html: str) -> List[CandidateProfile]:
+    """
+    解析Invited Speakers页面HTML，提取讲者信息
+    
+    纯CPU函数，可在进程池中执行
+    
+    Args:
+        html: 页面HTML源码
+        
+    Returns:
+        CandidateProfile列表
+    """
+    candidates = []
+    
+    soup = parse_html(html)
+    
+    # 查找目标容器
+    target_div = soup.find('div', class_='wp-block-columns')
+    
+    if not target_div:
+        logger.warning("未找到目标div容器")
+        return candidates
+    
+    # 提取讲者信息
+    # 通常讲者信息在<h3>或<strong>标签中，机构在相邻的<p>或<em>中
+    for section in target_div.find_all(['section', 'div'], class_=['wp-block-column']):
+        name = None
+        affiliation = None
+        
+        # 尝试提取姓名
+        name_tag = section.find(['h3', 'h4', 'strong'])
+        if name_tag:
+            name = name_tag.get_text(strip=True)
+        
+        # 尝试提取机构
+        aff_tag = section.find(['p', 'em'])
+        if aff_tag:
+            affiliation = aff_tag.get_text(strip=True)
+        
+        if name and affiliation:
+            candidates.append(CandidateProfile(
+                name=name,
+                affiliation=affiliation,
+                role="Invited Speaker",
+                status="PENDING"
+            ))
+            logger.info(f"找到讲者: {name} ({affiliation})")
+    
+    return candidates
+
 
 async def scrape_invited_speakers(url: str) -> List[CandidateProfile]:
     """
@@ -24,46 +129,11 @@ async def scrape_invited_speakers(url: str) -> List[CandidateProfile]:
     candidates = []
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            
-            if response.status_code != 200:
-                logger.error(f"获取{url}失败: {response.status_code}")
-                return candidates
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 查找目标容器
-            target_div = soup.find('div', class_='wp-block-columns')
-            
-            if not target_div:
-                logger.warning("未找到目标div容器")
-                return candidates
-            
-            # 提取讲者信息
-            # 通常讲者信息在<h3>或<strong>标签中，机构在相邻的<p>或<em>中
-            for section in target_div.find_all(['section', 'div'], class_=['wp-block-column']):
-                name = None
-                affiliation = None
-                
-                # 尝试提取姓名
-                name_tag = section.find(['h3', 'h4', 'strong'])
-                if name_tag:
-                    name = name_tag.get_text(strip=True)
-                
-                # 尝试提取机构
-                aff_tag = section.find(['p', 'em'])
-                if aff_tag:
-                    affiliation = aff_tag.get_text(strip=True)
-                
-                if name and affiliation:
-                    candidates.append(CandidateProfile(
-                        name=name,
-                        affiliation=affiliation,
-                        role="Invited Speaker",
-                        status="PENDING"
-                    ))
-                    logger.info(f"找到讲者: {name} ({affiliation})")
+        html = await _fetch_html(url)
+        if html is None:
+            return candidates
+        
+        candidates = await _parse_page(url, html, parse_invited_speakers)
         
         logger.info(f"从Invited Speakers页面提取了{len(candidates)}名讲者")
         
@@ -73,6 +143,49 @@ async def scrape_invited_speakers(url: str) -> List[CandidateProfile]:
     return candidates
 
 
+def parse_bridge_committee(html: str) -> List[CandidateProfile]:
+    """
+    解析Bridge Program页面HTML，提取Bridge Committee成员信息
+    
+    纯CPU函数，可在进程池中执行
+    
+    Args:
+        html: 页面HTML源码
+        
+    Returns:
+        CandidateProfile列表
+    """
+    candidates = []
+    
+    soup = parse_html(html)
+    
+    # 查找"Bridge Committee"标题之后的内容
+    for heading in soup.find_all(['h2', 'h3']):
+        if 'bridge committee' in heading.get_text(strip=True).lower():
+            # 查找该标题后的内容
+            section = heading.find_next(['div', 'ul', 'ol'])
+            
+            if section:
+                # 提取列表项中的人员信息
+                for item in section.find_all('li'):
+                    text = item.get_text(strip=True)
+                    # 假设格式为"名字 - 机构"或类似
+                    if '-' in text:
+                        parts = text.split('-')
+                        name = parts[0].strip()
+                        affiliation = parts[1].strip() if len(parts) > 1 else "Unknown"
+                        
+                        candidates.append(CandidateProfile(
+                            name=name,
+                            affiliation=affiliation,
+                            role="Bridge Committee",
+                            status="PENDING"
+                        ))
+                        logger.info(f"找到Bridge Committee成员: {name}")
+    
+    return candidates
+
+
 async def scrape_bridge_committee(url: str) -> List[CandidateProfile]:
     """
     从Bridge Program页面提取Bridge Committee成员信息
@@ -86,38 +199,11 @@ async def scrape_bridge_committee(url: str) -> List[CandidateProfile]:
     candidates = []
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            
-            if response.status_code != 200:
-                logger.error(f"获取{url}失败: {response.status_code}")
-                return candidates
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 查找"Bridge Committee"标题之后的内容
-            for heading in soup.find_all(['h2', 'h3']):
-                if 'bridge committee' in heading.get_text(strip=True).lower():
-                    # 查找该标题后的内容
-                    section = heading.find_next(['div', 'ul', 'ol'])
-                    
-                    if section:
-                        # 提取列表项中的人员信息
-                        for item in section.find_all('li'):
-                            text = item.get_text(strip=True)
-                            # 假设格式为"名字 - 机构"或类似
-                            if '-' in text:
-                                parts = text.split('-')
-                                name = parts[0].strip()
-                                affiliation = parts[1].strip() if len(parts) > 1 else "Unknown"
-                                
-                                candidates.append(CandidateProfile(
-                                    name=name,
-                                    affiliation=affiliation,
-                                    role="Bridge Committee",
-                                    status="PENDING"
-                                ))
-                                logger.info(f"找到Bridge Committee成员: {name}")
+        html = await _fetch_html(url)
+        if html is None:
+            return candidates
+        
+        candidates = await _parse_page(url, html, parse_bridge_committee)
         
         logger.info(f"从Bridge Program页面提取了{len(candidates)}名成员")
         
@@ -127,6 +213,59 @@ async def scrape_bridge_committee(url: str) -> List[CandidateProfile]:
     return candidates
 
 
+def parse_tutorials_and_labs(html: str) -> List[CandidateProfile]:
+    """
+    解析Tutorials and Labs页面HTML，提取讲师信息
+    
+    纯CPU函数，可在进程池中执行
+    
+    Args:
+        html: 页面HTML源码
+        
+    Returns:
+        CandidateProfile列表
+    """
+    candidates = []
+    
+    soup = parse_html(html)
+    
+    # 查找所有Tutorial部分
+    for heading in soup.find_all(['h2', 'h3', 'h4']):
+        heading_text = heading.get_text(strip=True).lower()
+        
+        # 查找包含"tutorial"或"half day"的标题
+        if 'tutorial' in heading_text or 'half day' in heading_text:
+            # 查找标题下的内容
+            section = heading.find_next(['div', 'table', 'ul'])
+            
+            if section:
+                # 在section中查找人员信息
+                # 通常在<strong>, <b>, 或单独的行中
+                for person_tag in section.find_all(['strong', 'b', 'span']):
+                    name = person_tag.get_text(strip=True)
+                    
+                    # 简单的名字过滤：英文名字通常有2-4个单词
+                    if name and len(name.split()) <= 4 and name.strip():
+                        # 尝试从相邻元素获取机构信息
+                        parent = person_tag.find_parent('li') or person_tag.find_parent('tr')
+                        affiliation = "Unknown"
+                        
+                        if parent:
+                            affiliation_tag = parent.find(['em', 'span', 'td'])
+                            if affiliation_tag and affiliation_tag != person_tag:
+                                affiliation = affiliation_tag.get_text(strip=True)
+                        
+                        candidates.append(CandidateProfile(
+                            name=name,
+                            affiliation=affiliation,
+                            role="Tutorial Instructor",
+                            status="PENDING"
+                        ))
+                        logger.info(f"找到讲师: {name}")
+    
+    return candidates
+
+
 async def scrape_tutorials_and_labs(url: str) -> List[CandidateProfile]:
     """
     从Tutorial and Lab Forum页面提取讲师信息
@@ -142,48 +281,11 @@ async def scrape_tutorials_and_labs(url: str) -> List[CandidateProfile]:
     candidates = []
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            
-            if response.status_code != 200:
-                logger.error(f"获取{url}失败: {response.status_code}")
-                return candidates
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 查找所有Tutorial部分
-            for heading in soup.find_all(['h2', 'h3', 'h4']):
-                heading_text = heading.get_text(strip=True).lower()
-                
-                # 查找包含"tutorial"或"half day"的标题
-                if 'tutorial' in heading_text or 'half day' in heading_text:
-                    # 查找标题下的内容
-                    section = heading.find_next(['div', 'table', 'ul'])
-                    
-                    if section:
-                        # 在section中查找人员信息
-                        # 通常在<strong>, <b>, 或单独的行中
-                        for person_tag in section.find_all(['strong', 'b', 'span']):
-                            name = person_tag.get_text(strip=True)
-                            
-                            # 简单的名字过滤：英文名字通常有2-4个单词
-                            if name and len(name.split()) <= 4 and name.strip():
-                                # 尝试从相邻元素获取机构信息
-                                parent = person_tag.find_parent('li') or person_tag.find_parent('tr')
-                                affiliation = "Unknown"
-                                
-                                if parent:
-                                    affiliation_tag = parent.find(['em', 'span', 'td'])
-                                    if affiliation_tag and affiliation_tag != person_tag:
-                                        affiliation = affiliation_tag.get_text(strip=True)
-                                
-                                candidates.append(CandidateProfile(
-                                    name=name,
-                                    affiliation=affiliation,
-                                    role="Tutorial Instructor",
-                                    status="PENDING"
-                                ))
-                                logger.info(f"找到讲师: {name}")
+        html = await _fetch_html(url)
+        if html is None:
+            return candidates
+        
+        candidates = await _parse_page(url, html, parse_tutorials_and_labs)
         
         logger.info(f"从Tutorials and Labs页面提取了{len(candidates)}名讲师")
         
@@ -193,10 +295,64 @@ async def scrape_tutorials_and_labs(url: str) -> List[CandidateProfile]:
     return candidates
 
 
+def parse_workshops_organization(html: str) -> List[CandidateProfile]:
+    """
+    解析Workshops页面HTML，提取Organization Committee成员信息
+    
+    纯CPU函数，可在进程池中执行
+    
+    Args:
+        html: 页面HTML源码
+        
+    Returns:
+        CandidateProfile列表
+    """
+    candidates = []
+    
+    soup = parse_html(html)
+    
+    # 查找Workshop列表
+    for workshop_section in soup.find_all(['div', 'section'], class_=['workshop', 'ws-item']):
+        # 查找Organization Committee或类似的标题
+        for heading in workshop_section.find_all(['h3', 'h4', 'h5']):
+            if 'organization' in heading.get_text(strip=True).lower():
+                # 查找该标题下的成员列表
+                org_section = heading.find_next(['ul', 'ol', 'div'])
+                
+                if org_section:
+                    for item in org_section.find_all('li'):
+                        text = item.get_text(strip=True)
+                        
+                        # 解析格式："名字 (机构)"或"名字 - 机构"
+                        name = text
+                        affiliation = "Unknown"
+                        
+                        if '(' in text and ')' in text:
+                            name = text[:text.index('(')].strip()
+                            affiliation = text[text.index('(')+1:text.index(')')].strip()
+                        elif '-' in text:
+                            parts = text.split('-')
+                            name = parts[0].strip()
+                            affiliation = parts[1].strip() if len(parts) > 1 else affiliation
+                        
+                        if name:
+                            candidates.append(CandidateProfile(
+                                name=name,
+                                affiliation=affiliation,
+                                role="Workshop Organizer",
+                                status="PENDING"
+                            ))
+                            logger.info(f"找到Workshop组织者: {name}")
+    
+    return candidates
+
+
 async def scrape_workshops_organization(url: str) -> List[CandidateProfile]:
     """
     从Workshops页面提取Organization Committee成员信息
     
+    除索引页本身外，还会跟随索引页上的链接有界并发地爬取各Workshop站点
+    
     Args:
         url: https://aaai.org/conference/aaai/aaai-26/workshops/
         
@@ -206,56 +362,158 @@ async def scrape_workshops_organization(url: str) -> List[CandidateProfile]:
     candidates = []
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            
-            if response.status_code != 200:
-                logger.error(f"获取{url}失败: {response.status_code}")
-                return candidates
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 查找Workshop列表
-            for workshop_section in soup.find_all(['div', 'section'], class_=['workshop', 'ws-item']):
-                # 查找Organization Committee或类似的标题
-                for heading in workshop_section.find_all(['h3', 'h4', 'h5']):
-                    if 'organization' in heading.get_text(strip=True).lower():
-                        # 查找该标题下的成员列表
-                        org_section = heading.find_next(['ul', 'ol', 'div'])
-                        
-                        if org_section:
-                            for item in org_section.find_all('li'):
-                                text = item.get_text(strip=True)
-                                
-                                # 解析格式："名字 (机构)"或"名字 - 机构"
-                                name = text
-                                affiliation = "Unknown"
-                                
-                                if '(' in text and ')' in text:
-                                    name = text[:text.index('(')].strip()
-                                    affiliation = text[text.index('(')+1:text.index(')')].strip()
-                                elif '-' in text:
-                                    parts = text.split('-')
-                                    name = parts[0].strip()
-                                    affiliation = parts[1].strip() if len(parts) > 1 else affiliation
-                                
-                                if name:
-                                    candidates.append(CandidateProfile(
-                                        name=name,
-                                        affiliation=affiliation,
-                                        role="Workshop Organizer",
-                                        status="PENDING"
-                                    ))
-                                    logger.info(f"找到Workshop组织者: {name}")
+        html = await _fetch_html(url)
+        if html is None:
+            return candidates
+        
+        candidates = await _parse_page(url, html, parse_workshops_organization)
         
         logger.info(f"从Workshops页面提取了{len(candidates)}名组织者")
         
+        # 组织者名单通常在各Workshop自己的站点上
+        if settings.WORKSHOP_CRAWL_ENABLED:
+            links = await run_cpu_bound(parse_workshop_links, html, url, size_hint=len(html))
+            logger.info(f"Workshops页面链接到{len(links)}个Workshop站点，开始并发爬取")
+            candidates.extend(await WorkshopCrawler().crawl(links))
+        
     except Exception as e:
         logger.error(f"Workshops页面提取异常: {str(e)}")
     
     return candidates
 
 
+# 技术论文条目的常见容器（OJS论文集摘要、会议网站论文列表）
+_PAPER_CLASSES = ['obj_article_summary', 'paper', 'paper-item', 'accepted-paper']
+_AUTHOR_CLASSES = ['authors', 'paper-authors', 'author-list', 'meta']
+# "名字 (机构)"格式的作者
+_AUTHOR_WITH_AFFILIATION = re.compile(r"([^,;()]+?)\s*\(([^()]*)\)")
+_AUTHOR_SPLIT = re.compile(r"\s*(?:,|;|\band\b|&)\s*")
+_NEXT_PAGE_TEXTS = {"next", "next page", "next »", "»", "›", "下一页"}
+
+
+def _parse_author_line(text: str) -> List[Tuple[str, str]]:
+    """解析作者行，返回[(姓名, 机构), ...]，无机构信息时机构为Unknown"""
+    if "(" in text:
+        return [
+            (name.strip(" ,;"), affiliation.strip() or "Unknown")
+            for name, affiliation in _AUTHOR_WITH_AFFILIATION.findall(text)
+            if name.strip(" ,;")
+        ]
+    return [(name, "Unknown") for name in _AUTHOR_SPLIT.split(text.strip()) if name]
+
+
+def parse_technical_track_page(html: str, page_url: str) -> Tuple[List[CandidateProfile], Optional[str]]:
+    """
+    解析Technical Track论文列表的一页，提取论文作者及下一页链接
+    
+    纯CPU函数，可在进程池中执行
+    
+    Args:
+        html: 页面HTML源码
+        page_url: 页面URL（用于解析相对链接）
+        
+    Returns:
+        (CandidateProfile列表, 下一页URL或None)
+    """
+    candidates = []
+    
+    soup = parse_html(html)
+    
+    for paper in soup.find_all(['div', 'li', 'article'], class_=_PAPER_CLASSES):
+        author_tag = paper.find(['div', 'p', 'span'], class_=_AUTHOR_CLASSES) or paper.find(['em', 'i'])
+        if not author_tag:
+            continue
+        
+        for name, affiliation in _parse_author_line(author_tag.get_text(" ", strip=True)):
+            # 简单的名字过滤：英文名字通常有2-5个单词
+            if 2 <= len(name.split()) <= 5:
+                candidates.append(CandidateProfile(
+                    name=name,
+                    affiliation=affiliation,
+                    role="Technical Track",
+                    status="PENDING"
+                ))
+    
+    # 分页链接：rel="next"、class含next，或文本为"Next"/"»"
+    next_url = None
+    next_tag = soup.find('a', rel='next') or soup.find('a', class_=['next', 'next-page'])
+    if not next_tag:
+        next_tag = next(
+            (a for a in soup.find_all('a', href=True) if a.get_text(strip=True).lower() in _NEXT_PAGE_TEXTS),
+            None
+        )
+    if next_tag and next_tag.get('href'):
+        next_url = urljoin(page_url, next_tag['href'])
+    
+    return candidates, next_url
+
+
+async def stream_technical_track(url: str, max_pages: int = 200) -> AsyncIterator[List[CandidateProfile]]:
+    """
+    逐页流式提取Technical Track论文作者
+    
+    每解析完一页即产出该页的作者，同时在后台下载下一页；
+    调用方可以边下载边过滤，内存占用与总页数无关
+    
+    Args:
+        url: https://aaai.org/conference/aaai/aaai-26/technical-track/
+        max_pages: 最多跟随的分页数
+        
+    Yields:
+        每页的CandidateProfile列表
+    """
+    visited = set()
+    parser_version = f"{parse_technical_track_page.__name__}@{PARSER_VERSION}"
+    
+    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        
+        async def fetch(page_url: str) -> Optional[str]:
+            try:
+                response = await client.get(page_url)
+            except httpx.HTTPError as e:
+                logger.error(f"获取{page_url}失败: {str(e)}")
+                return None
+            if response.status_code != 200:
+                logger.error(f"获取{page_url}失败: {response.status_code}")
+                return None
+            return response.text
+        
+        page_url: Optional[str] = url
+        pending_fetch = asyncio.create_task(fetch(url))
+        total = 0
+        
+        try:
+            while page_url and len(visited) < max_pages:
+                visited.add(page_url)
+                html = await pending_fetch
+                pending_fetch = None
+                if html is None:
+                    break
+                
+                stored = load_unchanged_page(page_url, html, parser_version)
+                if stored is not None:
+                    candidates = [CandidateProfile(**c) for c in stored["candidates"]]
+                    next_url = stored.get("next_url")
+                else:
+                    candidates, next_url = await run_cpu_bound(
+                        parse_technical_track_page, html, page_url, size_hint=len(html)
+                    )
+                    save_page(page_url, html, parser_version, candidates, next_url=next_url)
+                
+                # 下一页与调用方处理当前页并行
+                page_url = next_url if next_url not in visited else None
+                if page_url and len(visited) < max_pages:
+                    pending_fetch = asyncio.create_task(fetch(page_url))
+                
+                total += len(candidates)
+                yield candidates
+        finally:
+            if pending_fetch:
+                pending_fetch.cancel()
+    
+    logger.info(f"从Technical Track的{len(visited)}个页面提取了{total}名作者")
+
+
 async def scrape_all_aaai_sources(
     invited_speakers_url: str,
     bridge_program_url: str,
@@ -290,15 +548,8 @@ async def scrape_all_aaai_sources(
     all_candidates.extend(tutorials)
     all_candidates.extend(workshops)
     
-    # 去重：基于名字和机构组合
-    seen = set()
-    unique_candidates = []
-    
-    for candidate in all_candidates:
-        key = (candidate.name.lower(), candidate.affiliation.lower())
-        if key not in seen:
-            seen.add(key)
-            unique_candidates.append(candidate)
+    # 去重：跨来源实体消解（"Lei Chen / HKUST"与"Lei Chen / Hong Kong University of Science and Technology"合并，角色合并）
+    unique_candidates = resolve_entities(all_candidates)
     
     logger.info(f"[AAAI数据提取] 汇总提取了{len(unique_candidates)}名唯一候选人")
     
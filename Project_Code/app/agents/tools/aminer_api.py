@@ -1,9 +1,13 @@
 """AMiner学者搜索API集成工具"""
 
+import asyncio
 import httpx
 import logging
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterable
 from app.core.config import settings
+from app.agents.tools.institution_registry import normalize_affiliation
+from app.agents.tools.scholar_matcher import find_best_match
+from app.services.aminer_cache import aminer_search_cache, aminer_detail_cache, make_search_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +83,17 @@ class AMinerAPI:
             logger.warning("[AMiner] API密钥未配置，跳过学者搜索")
             return None
         
+        # 按规范化查询读取缓存（同一学者在多个任务/会议中反复出现）
+        cache_key = None
+        if settings.AMINER_CACHE_ENABLED:
+            cache_key = make_search_cache_key(
+                " ".join(name.lower().split()), normalize_affiliation(organization or ""), offset, size
+            )
+            cached = aminer_search_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"[AMiner] 搜索缓存命中: {name}")
+                return cached
+        
         try:
             # 构建请求体
             payload = {
@@ -105,6 +120,8 @@ class AMinerAPI:
                 if response.status_code == 200:
                     result = response.json()
                     logger.info(f"[AMiner] 搜索成功: {name} - 找到{len(result.get('data', {}).get('hits', []))}个结果")
+                    if cache_key:
+                        aminer_search_cache.set(cache_key, result)
                     return result
                 else:
                     logger.error(f"[AMiner] 搜索失败 - 状态码: {response.status_code}")
@@ -124,29 +141,67 @@ class AMinerAPI:
         Returns:
             包含详细信息的字典，如果失败返回None
         """
-        if not self.api_key:
-            return None
+        details = await self.get_person_details([person_id])
+        return details.get(person_id)
+    
+    async def get_person_details(self, person_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        批量获取学者详细信息
+        
+        先读取缓存，未命中的ID共用一个HTTP连接池并发请求（并发数受AMINER_DETAIL_CONCURRENCY限制）
+        
+        Args:
+            person_ids: AMiner学者ID列表（自动去重）
+            
+        Returns:
+            学者ID -> 详细信息字典（失败为None）
+        """
+        ids = list(dict.fromkeys(pid for pid in person_ids if pid))
+        if not self.api_key or not ids:
+            return {pid: None for pid in ids}
         
+        details: Dict[str, Optional[Dict[str, Any]]] = {}
+        if settings.AMINER_CACHE_ENABLED:
+            details.update(aminer_detail_cache.get_many(ids))
+        
+        missing = [pid for pid in ids if pid not in details]
+        if missing:
+            semaphore = asyncio.Semaphore(max(1, settings.AMINER_DETAIL_CONCURRENCY))
+            
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                async def fetch(pid: str) -> None:
+                    async with semaphore:
+                        details[pid] = await self._fetch_person_detail(client, pid)
+                
+                await asyncio.gather(*(fetch(pid) for pid in missing))
+            
+            logger.info(f"[AMiner] 获取详情: {len(missing)}个请求, {len(ids) - len(missing)}个缓存命中")
+        
+        return details
+    
+    async def _fetch_person_detail(self, client: httpx.AsyncClient, person_id: str) -> Optional[Dict[str, Any]]:
+        """请求单个学者详情，成功时写入缓存"""
         try:
             headers = {
                 "Authorization": self.api_key
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.BASE_URL}{self.ENDPOINTS['person_detail']}",
-                    params={"id": person_id},
-                    headers=headers
-                )
+            response = await client.get(
+                f"{self.BASE_URL}{self.ENDPOINTS['person_detail']}",
+                params={"id": person_id},
+                headers=headers
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                logger.info(f"[AMiner] 获取详情成功: {person_id}")
+                if settings.AMINER_CACHE_ENABLED:
+                    aminer_detail_cache.set(person_id, result)
+                return result
+            else:
+                logger.error(f"[AMiner] 获取详情失败 - 状态码: {response.status_code}")
+                return None
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    logger.info(f"[AMiner] 获取详情成功: {person_id}")
-                    return result
-                else:
-                    logger.error(f"[AMiner] 获取详情失败 - 状态码: {response.status_code}")
-                    return None
-                    
         except Exception as e:
             logger.error(f"[AMiner] 获取详情异常: {str(e)}")
             return None
@@ -183,47 +238,15 @@ class AMinerAPI:
             }
         """
         try:
-            # 步骤1: 搜索学者
-            search_result = await self.search_scholar(name, affiliation, size=10)
-            if not search_result or not search_result.get('data', {}).get('hits'):
-                logger.warning(f"[AMiner] 未找到 {name} 的学者记录")
-                return {
-                    "is_verified": False,
-                    "reason": "no_aminer_record"
-                }
-            
-            hits = search_result['data']['hits']
-            
-            # 步骤2: 通过语义匹配找到最佳候选
-            best_match = self._find_best_match(name, affiliation, hits, email)
-            
-            if best_match['confidence_score'] < 0.7:
-                logger.warning(f"[AMiner] {name} 匹配度不足: {best_match['confidence_score']}")
-                return {
-                    "is_verified": False,
-                    "reason": "low_confidence",
-                    "confidence_score": best_match['confidence_score']
-                }
+            # 步骤1-2: 搜索学者并通过语义匹配找到最佳候选
+            best_match = await self.match_scholar(name, affiliation, email)
+            if not best_match.get("is_verified"):
+                return best_match
             
             # 步骤3: 获取详细信息并补充interests
             person_detail = await self.get_person_detail(best_match['id'])
             
-            # 提取关键字段
-            enriched_data = {
-                "is_verified": True,
-                "aminer_id": best_match['id'],
-                "name_cn": best_match.get('name_cn') or person_detail.get('name_cn'),
-                "interests": best_match.get('interests', []),
-                "email": best_match.get('email') or email,
-                "organization": best_match.get('org'),
-                "organization_cn": best_match.get('org_cn'),
-                "confidence_score": best_match['confidence_score'],
-                "education": best_match.get('education', []),
-                "positions": best_match.get('positions', [])
-            }
-            
-            logger.info(f"[AMiner] 验证成功: {name} - 置信度 {best_match['confidence_score']:.2f}")
-            return enriched_data
+            return self.build_enrichment(name, best_match, person_detail, email)
             
         except Exception as e:
             logger.error(f"[AMiner] 验证和补充过程异常: {str(e)}")
@@ -233,6 +256,87 @@ class AMinerAPI:
                 "error": str(e)
             }
     
+    async def match_scholar(
+        self,
+        name: str,
+        affiliation: str,
+        email: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        搜索学者并选出最佳匹配（不获取详情）
+        
+        调用方可以在获取详情的同时处理其他工作，再用build_enrichment组装结果
+        
+        Args:
+            name: 候选人英文姓名
+            affiliation: 候选人所属机构
+            email: 候选人邮箱（可选，用于额外验证）
+            
+        Returns:
+            匹配成功时为最佳匹配的学者记录（is_verified=True，含id和confidence_score），
+            否则为包含is_verified=False和reason的字典
+        """
+        search_result = await self.search_scholar(name, affiliation, size=10)
+        if not search_result or not search_result.get('data', {}).get('hits'):
+            logger.warning(f"[AMiner] 未找到 {name} 的学者记录")
+            return {
+                "is_verified": False,
+                "reason": "no_aminer_record"
+            }
+        
+        hits = search_result['data']['hits']
+        
+        best_match = self._find_best_match(name, affiliation, hits, email)
+        
+        if best_match['confidence_score'] < 0.7:
+            logger.warning(f"[AMiner] {name} 匹配度不足: {best_match['confidence_score']}")
+            return {
+                "is_verified": False,
+                "reason": "low_confidence",
+                "confidence_score": best_match['confidence_score']
+            }
+        
+        best_match["is_verified"] = True
+        return best_match
+    
+    def build_enrichment(
+        self,
+        name: str,
+        best_match: Dict[str, Any],
+        person_detail: Optional[Dict[str, Any]],
+        email: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        由最佳匹配和学者详情组装补充信息
+        
+        Args:
+            name: 候选人英文姓名
+            best_match: match_scholar返回的最佳匹配
+            person_detail: get_person_detail的结果（获取失败时为None）
+            email: 候选人邮箱（可选）
+            
+        Returns:
+            包含验证和补充信息的字典（结构同validate_and_enrich）
+        """
+        person_detail = person_detail or {}
+        
+        # 提取关键字段
+        enriched_data = {
+            "is_verified": True,
+            "aminer_id": best_match['id'],
+            "name_cn": best_match.get('name_cn') or person_detail.get('name_cn'),
+            "interests": best_match.get('interests', []),
+            "email": best_match.get('email') or email,
+            "organization": best_match.get('org'),
+            "organization_cn": best_match.get('org_cn'),
+            "confidence_score": best_match['confidence_score'],
+            "education": best_match.get('education', []),
+            "positions": best_match.get('positions', [])
+        }
+        
+        logger.info(f"[AMiner] 验证成功: {name} - 置信度 {best_match['confidence_score']:.2f}")
+        return enriched_data
+    
     def _find_best_match(
         self,
         name: str,
@@ -257,51 +361,7 @@ class AMinerAPI:
         Returns:
             包含匹配信息和置信度的字典
         """
-        best_hit = None
-        best_score = 0.0
-        
-        name_lower = name.lower()
-        affiliation_lower = affiliation.lower()
-        
-        for hit in hits:
-            score = 0.0
-            
-            # 维度1: 名字匹配（权重0.4）
-            hit_name = hit.get('name', '').lower()
-            if hit_name == name_lower:
-                score += 0.4  # 完全匹配
-            elif name_lower.split()[-1] in hit_name.split():
-                score += 0.3  # 姓氏匹配
-            elif any(part in hit_name for part in name_lower.split()):
-                score += 0.2  # 部分匹配
-            
-            # 维度2: 机构匹配（权重0.35）
-            hit_org = hit.get('org', '').lower()
-            if hit_org and affiliation_lower in hit_org or hit_org in affiliation_lower:
-                score += 0.35  # 机构包含关系
-            elif hit_org and len(hit_org) > 5:
-                # 模糊匹配：检查关键词重叠
-                affiliation_words = set(affiliation_lower.split())
-                org_words = set(hit_org.split())
-                overlap = len(affiliation_words & org_words) / max(len(affiliation_words), len(org_words))
-                score += 0.35 * overlap
-            
-            # 维度3: 邮箱匹配（权重0.25，如果有）
-            if email:
-                hit_email = hit.get('email', '').lower()
-                if hit_email == email.lower():
-                    score += 0.25
-                elif hit_email and email.split('@')[1] == hit_email.split('@')[1]:
-                    score += 0.15  # 同域名
-            
-            if score > best_score:
-                best_score = score
-                best_hit = hit
-        
-        result = best_hit.copy() if best_hit else {"id": None}
-        result['confidence_score'] = min(best_score, 1.0)  # 归一化到[0, 1]
-        
-        return result
+        return find_best_match(name, affiliation, hits, email)
 
 
 # 创建全局API实例
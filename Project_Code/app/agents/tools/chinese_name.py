@@ -0,0 +1,185 @@
+"""中文姓名识别 - 基于预计算姓氏/音节表（普通话拼音、威妥玛、粤语拼写）的批量分类"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, List
+
+# 普通话拼音姓氏
+MANDARIN_SURNAMES = frozenset({
+    "wang", "li", "zhang", "liu", "chen", "yang", "huang", "zhao", "wu", "zhou",
+    "xu", "sun", "ma", "zhu", "hu", "guo", "he", "gao", "lin", "luo",
+    "zheng", "liang", "song", "tang", "han", "feng", "xie", "yu", "peng", "cao",
+    "deng", "xiao", "tian", "dong", "pan", "yuan", "cai", "jiang", "lu", "ding",
+    "wei", "shen", "ren", "yao", "jin", "fu", "cheng", "qian", "du", "su",
+    "lyu", "lv", "ye", "wan", "qin", "bai", "jia", "xia", "fang", "shi",
+    "fan", "kong", "qiu", "hou", "zou", "xiong", "meng", "qi", "mao", "cui",
+    "tan", "yin", "duan", "lei", "hao", "kang", "gu", "mo", "niu", "qu",
+    "shao", "wen", "yan", "chang", "long", "yi", "dai", "xiang", "hong", "ni",
+    "lai", "zhan", "ou", "ouyang", "situ", "zhuge", "shangguan", "sima", "geng", "bao",
+    "zhong", "chu", "ji", "miao", "guan", "pei", "rao", "tu", "zhai", "zhuang",
+})
+
+# 威妥玛拼写（台湾及早期移民常见）
+WADE_GILES_SURNAMES = frozenset({
+    "chang", "chen", "cheng", "chiang", "chien", "chin", "chou", "chu", "chuang", "chung",
+    "hsia", "hsiao", "hsieh", "hsu", "hsueh", "huang", "hung", "jen", "juan", "kao",
+    "ko", "kuan", "kuo", "liao", "lien", "tai", "teng", "tien", "ting", "tsai",
+    "tsao", "tseng", "tsou", "tsui", "tung", "wei", "weng", "yeh", "yen", "yin",
+})
+
+# 粤语拼写（香港、东南亚常见）
+CANTONESE_SURNAMES = frozenset({
+    "au", "chan", "chau", "cheuk", "cheung", "ching", "choi", "chow", "chui", "fong",
+    "fung", "ho", "hui", "ip", "kam", "kwan", "kwok", "kwong", "lam", "lau",
+    "law", "lee", "leung", "lo", "lui", "mak", "mok", "ng", "poon", "sin",
+    "siu", "so", "tam", "tang", "tong", "tsang", "tse", "wong", "woo", "yau",
+    "yeung", "yip", "yiu", "yuen", "yung",
+})
+
+ALL_SURNAMES = MANDARIN_SURNAMES | WADE_GILES_SURNAMES | CANTONESE_SURNAMES
+
+# 与常见西方/韩国姓氏同形的拼写：需要名字部分也像拼音才判为中文（例如"Robert Lee"、"Yejin Choi"不算）
+KOREAN_SURNAMES = frozenset({"choi", "chung", "kang", "ko"})
+AMBIGUOUS_SURNAMES = frozenset({"lee", "long", "ho", "law", "so", "sin", "woo", "lo"}) | KOREAN_SURNAMES
+
+# 常见的韩国、日本、越南姓氏：出现在姓名另一端时不是中文姓名（"Jin Kim"、"Yu Sato"、"Hoang Ma"）
+NON_CHINESE_SURNAMES = frozenset({
+    "kim", "park", "jeong", "jung", "cho", "yoon", "jang", "lim", "shin", "kwon", "hwang", "ahn",
+    "ryu", "jeon", "seo", "oh", "baek", "nam", "yoo", "bae",
+    "sato", "suzuki", "takahashi", "tanaka", "watanabe", "ito", "yamamoto", "nakamura", "kobayashi",
+    "kato", "yoshida", "yamada", "sasaki", "yamaguchi", "matsumoto", "inoue", "kimura", "hayashi",
+    "shimizu", "mori", "abe", "ikeda", "hashimoto", "ishikawa", "fujita", "ogawa", "okada", "goto",
+    "nguyen", "tran", "pham", "hoang", "huynh", "phan", "vu", "vo", "dang", "bui", "ngo", "duong",
+})
+
+# 只属于威妥玛/粤语拼写的姓氏：名字按惯例逐音节分写或以连字符连接（"Wai Kin"、"Ka-Wai"），
+# 连写的多音节名字（"Yejin"）多为韩文罗马字
+_SPLIT_GIVEN_SURNAMES = (WADE_GILES_SURNAMES | CANTONESE_SURNAMES) - MANDARIN_SURNAMES
+
+# 与拼音音节同形的常见西方名字，姓氏有歧义时不视为拼音名字
+_WESTERN_GIVEN_NAMES = frozenset({
+    "anna", "ben", "dan", "dana", "gene", "hana", "hanna", "jana", "kate", "ken", "lana",
+    "lena", "lina", "lisa", "luke", "mike", "nina", "tina", "wendy", "shane", "diane",
+})
+
+# 普通话拼音全部合法音节（ü写作v），另加常见威妥玛/粤语音节，用于判断"Xiaoming"、"Wai-Kin"等
+_PINYIN = """
+a ai an ang ao ba bai ban bang bao bei ben beng bi bian biao bie bin bing bo bu ca cai can cang cao ce cei cen
+ceng cha chai chan chang chao che chen cheng chi chong chou chu chua chuai chuan chuang chui chun chuo ci cong
+cou cu cuan cui cun cuo da dai dan dang dao de dei den deng di dia dian diao die ding diu dong dou du duan dui
+dun duo e ei en eng er fa fan fang fei fen feng fo fou fu ga gai gan gang gao ge gei gen geng gong gou gu gua
+guai guan guang gui gun guo ha hai han hang hao he hei hen heng hong hou hu hua huai huan huang hui hun huo ji
+jia jian jiang jiao jie jin jing jiong jiu ju juan jue jun ka kai kan kang kao ke kei ken keng kong kou ku kua
+kuai kuan kuang kui kun kuo la lai lan lang lao le lei leng li lia lian liang liao lie lin ling liu lo long lou
+lu luan lun luo lv lve lue ma mai man mang mao me mei men meng mi mian miao mie min ming miu mo mou mu na nai
+nan nang nao ne nei nen neng ni nian niang niao nie nin ning niu nong nou nu nuan nun nuo nv nve nue o ou pa
+pai pan pang pao pei pen peng pi pian piao pie pin ping po pou pu qi qia qian qiang qiao qie qin qing qiong qiu
+qu quan que qun ran rang rao re ren reng ri rong rou ru rua ruan rui run ruo sa sai san sang sao se sen seng sha
+shai shan shang shao she shei shen sheng shi shou shu shua shuai shuan shuang shui shun shuo si song sou su suan
+sui sun suo ta tai tan tang tao te teng ti tian tiao tie ting tong tou tu tuan tui tun tuo wa wai wan wang wei
+wen weng wo wu xi xia xian xiang xiao xie xin xing xiong xiu xu xuan xue xun ya yan yang yao ye yi yin ying yo
+yong you yu yuan yue yun za zai zan zang zao ze zei zen zeng zha zhai zhan zhang zhao zhe zhei zhen zheng zhi
+zhong zhou zhu zhua zhuai zhuan zhuang zhui zhun zhuo zi zong zou zu zuan zui zun zuo
+"""
+_EXTRA_SYLLABLES = frozenset({
+    "hsi", "hsin", "hsiang", "hsiung", "hsiao", "hsieh", "hsu", "hsuan", "hsueh", "kuei", "tsung", "tzu", "szu",
+    "kin", "kit", "kwok", "yiu", "hoi", "siu", "tak", "kam", "fai", "hing", "wing", "yee", "keung", "sum", "yuk",
+    "chee", "kei", "pui", "shing", "cheong", "lok", "tat", "hon", "chiu", "kuen", "lap", "chih", "chien",
+})
+PINYIN_SYLLABLES = frozenset(_PINYIN.split()) | _EXTRA_SYLLABLES
+_MAX_SYLLABLE_LEN = max(len(s) for s in PINYIN_SYLLABLES)
+
+_CJK_PATTERN = re.compile(r"[\u4e00-\u9fff]")
+_TOKEN_SPLIT = re.compile(r"[^a-z\-]+")
+
+
+def _is_romanized_given(token: str) -> bool:
+    """名字部分能否切分为至多3个音节（支持"Wai-Kin"形式的连字符）"""
+    if token in _WESTERN_GIVEN_NAMES:
+        return False
+    parts = [p for p in token.split("-") if p]
+    if not parts or len(parts) > 3:
+        return False
+    return all(_segment_count(p) for p in parts) and sum(_segment_count(p) for p in parts) <= 3
+
+
+def _segment_count(text: str) -> int:
+    """
+    将字符串切分为音节的最少数量，无法切分时返回0
+
+    拼音书写规则：以a/o/e开头的音节不出现在词中（需要隔音符号，例如"Xi'an"），
+    因此"Sean"、"Maria"不能切分为"se|an"、"ma|ri|a"
+    """
+    n = len(text)
+    best = [0] + [n + 1] * n  # best[i]: text[:i]的最少音节数
+    for end in range(1, n + 1):
+        for start in range(max(0, end - _MAX_SYLLABLE_LEN), end):
+            if start and text[start] in "aoe":
+                continue
+            if best[start] <= n and text[start:end] in PINYIN_SYLLABLES:
+                best[end] = min(best[end], best[start] + 1)
+    return best[n] if best[n] <= n else 0
+
+
+@lru_cache(maxsize=65536)
+def classify_name(name: str) -> bool:
+    """
+    判断姓名是否为中文姓名
+
+    包含汉字时直接判定；否则检查首词或末词是否为中文姓氏
+    （英文署名通常"名 姓"，中文署名或"姓, 名"格式姓氏在前）。
+    姓氏在前时其余部分必须像拼音名字；另一端是韩国/日本/越南姓氏时不判为中文
+
+    Args:
+        name: 全名
+
+    Returns:
+        如果姓名看起来是中文则返回True
+    """
+    if not name:
+        return False
+    if _CJK_PATTERN.search(name):
+        return True
+
+    tokens = [t.strip("-") for t in _TOKEN_SPLIT.split(name.lower())]
+    tokens = [t for t in tokens if t]
+    if not tokens:
+        return False
+
+    if len(tokens) > 1 and (tokens[0] in NON_CHINESE_SURNAMES or tokens[-1] in NON_CHINESE_SURNAMES):
+        return False
+
+    # (姓氏, 其余部分, 是否姓氏在前)：先按末词为姓，再按首词为姓
+    orders = [(tokens[-1], tokens[:-1], False), (tokens[0], tokens[1:], True)] if len(tokens) > 1 else [(tokens[0], [], False)]
+    for surname, given, surname_first in orders:
+        if surname not in ALL_SURNAMES:
+            continue
+        if surname not in AMBIGUOUS_SURNAMES and not surname_first:
+            return True
+        if surname in _SPLIT_GIVEN_SURNAMES and any(_segment_count(p) > 1 for t in given for p in t.split("-")):
+            continue
+        if given and all(_is_romanized_given(t) for t in given):
+            return True
+    return False
+
+
+def classify_names(names: Iterable[str]) -> List[bool]:
+    """
+    批量判断一列姓名是否为中文姓名
+
+    重复姓名只分类一次
+
+    Args:
+        names: 姓名列表
+
+    Returns:
+        与names一一对应的判断结果
+    """
+    results = {}
+    flags = []
+    for name in names:
+        flag = results.get(name)
+        if flag is None:
+            flag = results[name] = classify_name(name)
+        flags.append(flag)
+    return flags
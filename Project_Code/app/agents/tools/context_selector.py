@@ -0,0 +1,176 @@
+"""LLM上下文选择器 - 按与目标字段的相关性挑选页面片段，在token预算内构建紧凑输入"""
+
+import re
+from typing import List, Optional, Tuple
+
+from app.agents.tools.page_analyzer import PageAnalysis
+
+# 单个片段的目标长度（字符数）
+PASSAGE_CHARS = 400
+
+# 片段之间的连接符，提示LLM中间有省略
+PASSAGE_SEPARATOR = "\n...\n"
+
+# 个人简介/联系方式类关键词
+_BIO_PATTERN = re.compile(
+    r"\b(?:about|bio|biography|contact|email|e-mail|office|professor|lecturer|scientist|researcher)\b"
+    r"|个人简介|联系方式|简介",
+    re.IGNORECASE,
+)
+_CJK_CHAR = re.compile(r"[\u4e00-\u9fff]")
+_BOUNDARY = re.compile(r"(?<=[.!?;。！？；])\s+|\s{2,}")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    粗略估算文本的token数
+
+    汉字约1个token/字，其余约4个字符/token
+
+    Args:
+        text: 文本
+
+    Returns:
+        估算的token数
+    """
+    cjk = len(_CJK_CHAR.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def split_passages(page_text: str, passage_chars: int = PASSAGE_CHARS) -> List[Tuple[int, int]]:
+    """
+    将页面文本切分为长度约为passage_chars的片段，尽量在句子边界处断开
+
+    Args:
+        page_text: 页面文本
+        passage_chars: 目标片段长度
+
+    Returns:
+        片段区间列表 [(start, end), ...]
+    """
+    passages = []
+    start = 0
+    length = len(page_text)
+
+    while start < length:
+        end = min(start + passage_chars, length)
+        if end < length:
+            # 在目标长度的后半段寻找句子边界
+            boundary = None
+            for match in _BOUNDARY.finditer(page_text, start + passage_chars // 2, end):
+                boundary = match.end()
+            if boundary:
+                end = boundary
+        passages.append((start, end))
+        start = end
+
+    return passages
+
+
+def _overlaps(span: Tuple[int, int], spans: List[Tuple[int, int]]) -> int:
+    """统计与区间重叠的span数量"""
+    start, end = span
+    return sum(1 for s, e in spans if s < end and e > start)
+
+
+def score_passage(
+    passage: str,
+    span: Tuple[int, int],
+    analysis: PageAnalysis,
+    index: int
+) -> float:
+    """
+    计算片段与目标字段（教育经历、邮箱、姓名、中文名）的相关性得分
+
+    Args:
+        passage: 片段文本
+        span: 片段在页面中的区间
+        analysis: 页面分析结果
+        index: 片段序号
+
+    Returns:
+        相关性得分
+    """
+    score = 0.0
+
+    # 教育经历是LLM最难从截断文本中获得的字段，权重最高
+    score += 4.0 * _overlaps(span, analysis.education_spans)
+
+    if any(email in passage for email in analysis.emails) or "@" in passage:
+        score += 3.0
+
+    if any(cjk in passage for cjk in analysis.cjk_names):
+        score += 3.0
+
+    score += 2.0 * min(_overlaps(span, analysis.name_hits), 2)
+
+    if any(span[0] <= pos < span[1] for _, pos in analysis.affiliation_hits):
+        score += 1.0
+
+    if _BIO_PATTERN.search(passage):
+        score += 1.0
+
+    # 页面开头通常是姓名/职位/单位
+    if index == 0:
+        score += 1.5
+
+    return score
+
+
+def select_llm_context(
+    page_text: str,
+    analysis: Optional[PageAnalysis],
+    token_budget: int
+) -> str:
+    """
+    在token预算内挑选最相关的页面片段，按原文顺序拼接
+
+    Args:
+        page_text: 页面文本
+        analysis: 页面分析结果；为None时按原文顺序截断
+        token_budget: token预算
+
+    Returns:
+        用于LLM提示词的页面内容
+    """
+    if not page_text:
+        return ""
+
+    if estimate_tokens(page_text) <= token_budget:
+        return page_text
+
+    passages = split_passages(page_text)
+
+    if analysis is None:
+        ranked = list(range(len(passages)))
+    else:
+        scores = [
+            score_passage(page_text[start:end], (start, end), analysis, i)
+            for i, (start, end) in enumerate(passages)
+        ]
+        # 只保留有相关信号的片段，同分时保留原文顺序
+        ranked = sorted(
+            (i for i in range(len(passages)) if scores[i] > 0),
+            key=lambda i: (-scores[i], i)
+        )
+
+    selected = []
+    used = 0
+    for i in ranked:
+        start, end = passages[i]
+        cost = estimate_tokens(page_text[start:end])
+        if used + cost > token_budget:
+            continue
+        selected.append(i)
+        used += cost
+
+    # 相邻片段直接拼接，不相邻的片段之间插入省略标记
+    blocks: List[Tuple[int, int]] = []
+    for i in sorted(selected):
+        start, end = passages[i]
+        if blocks and blocks[-1][1] == start:
+            blocks[-1] = (blocks[-1][0], end)
+        else:
+            blocks.append((start, end))
+
+    return PASSAGE_SEPARATOR.join(page_text[start:end].strip() for start, end in blocks)
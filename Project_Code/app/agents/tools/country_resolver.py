@@ -0,0 +1,58 @@
+"""国家/地区解析 - 离线将所属单位映射到国家/地区（机构注册表 + 地区词典），无网络或LLM调用"""
+
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from app.agents.tools.institution_registry import fuzzy_lookup_institution
+from app.agents.tools.region_gazetteer import PRIORITY_SPECIFIC, lookup_region_match
+
+
+@lru_cache(maxsize=16384)
+def resolve_country(affiliation: str) -> Optional[str]:
+    """
+    解析所属单位所在的国家/地区
+
+    先查机构注册表（精确/别名，失败时模糊匹配）；未收录或跨国机构再查地区词典，
+    例如"Microsoft Research Asia, Beijing"按城市解析。
+    字符串中的具体地名与注册表国家/地区冲突时以地名为准：分校区的限定词
+    （"HKUST (Guangzhou)"、"CUHK, Shenzhen"）不能被母校的别名覆盖
+
+    Args:
+        affiliation: 所属单位字符串
+
+    Returns:
+        国家/地区名称（例如"中国大陆"、"美国"），无法识别时返回None
+    """
+    if not affiliation:
+        return None
+
+    region = lookup_region_match(affiliation)
+
+    institution = fuzzy_lookup_institution(affiliation)
+    if institution and institution.country:
+        if region and region[1] == PRIORITY_SPECIFIC and region[0] != institution.country:
+            return region[0]
+        return institution.country
+
+    return region[0] if region else None
+
+
+def resolve_countries(affiliations: Iterable[str]) -> List[Optional[str]]:
+    """
+    批量解析一列所属单位的国家/地区
+
+    重复的所属单位只解析一次
+
+    Args:
+        affiliations: 所属单位列表
+
+    Returns:
+        与affiliations一一对应的国家/地区（无法识别时为None）
+    """
+    results = {}
+    countries = []
+    for affiliation in affiliations:
+        if affiliation not in results:
+            results[affiliation] = resolve_country(affiliation)
+        countries.append(results[affiliation])
+    return countries
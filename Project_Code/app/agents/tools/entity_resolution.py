@@ -0,0 +1,225 @@
+"""实体消解 - 跨来源合并同一候选人（分块索引 + 块内相似度比较）"""
+
+import logging
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.api.models import CandidateProfile
+from app.agents.tools.institution_registry import fuzzy_lookup_institution, normalize_affiliation
+
+logger = logging.getLogger(__name__)
+
+# 未知单位的占位值
+_UNKNOWN_AFFILIATIONS = frozenset({"", "unknown", "n a", "na", "tba"})
+
+# 合并时从重复记录补全的字段
+_FILL_FIELDS = (
+    "homepage", "email", "name_cn", "bachelor_univ", "country_region", "position",
+    "research_interests", "interests", "aminer_id", "organization_cn",
+)
+
+_NON_ALPHA = re.compile(r"[^a-z\s]")
+
+
+@lru_cache(maxsize=65536)
+def _name_parts(name: str) -> Tuple[str, Tuple[str, ...]]:
+    """返回(姓氏, 名字各部分)，去掉重音和标点；"姓, 名"格式按逗号识别姓氏"""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+    if "," in text:
+        surname, _, given = text.partition(",")
+        words = _NON_ALPHA.sub(" ", given.replace("-", "")).split()
+        surname_words = _NON_ALPHA.sub(" ", surname).split()
+        return ("".join(surname_words), tuple(words))
+
+    words = _NON_ALPHA.sub(" ", text.replace("-", "")).split()
+    if not words:
+        return ("", ())
+    return (words[-1], tuple(words[:-1]))
+
+
+def _given_compatible(a: Tuple[str, ...], b: Tuple[str, ...]) -> bool:
+    """名字部分是否一致：完全相同、连写相同（"Wai Kin"/"Waikin"），或一方只有首字母"""
+    if not a or not b:
+        return True
+    if "".join(a) == "".join(b):
+        return True
+    # 首字母形式："L Chen" 与 "Lei Chen"
+    if all(len(w) == 1 for w in a) or all(len(w) == 1 for w in b):
+        return [w[0] for w in a] == [w[0] for w in b]
+    return False
+
+
+def _is_initials(given: Tuple[str, ...]) -> bool:
+    return bool(given) and all(len(w) == 1 for w in given)
+
+
+@lru_cache(maxsize=65536)
+def _affiliation(affiliation: str) -> str:
+    """
+    规范化所属单位：注册表中的机构（含缩写、模糊匹配）统一为规范名称（"HKUST" -> hong kong university of science and technology）
+
+    Returns:
+        规范名称，单位未知时返回空字符串
+    """
+    normalized = normalize_affiliation(affiliation)
+    if normalized in _UNKNOWN_AFFILIATIONS:
+        return ""
+
+    institution = fuzzy_lookup_institution(affiliation)
+    return normalize_affiliation(institution.name) if institution else normalized
+
+
+def identity_key(name: str, affiliation: str) -> Optional[str]:
+    """
+    候选人的规范化身份键：姓氏 + 连写名字 + 规范单位名称
+
+    "Lei Chen / HKUST"与"Chen, Lei / Hong Kong University of Science and Technology"得到相同的键；
+    单位未知时仅凭姓名无法区分同名者，不生成身份键
+
+    Args:
+        name: 英文姓名
+        affiliation: 所属单位
+
+    Returns:
+        身份键字符串，单位未知时返回None
+    """
+    canonical = _affiliation(affiliation)
+    if not canonical:
+        return None
+    surname, given = _name_parts(name)
+    return f"{surname}|{''.join(given)}|{canonical}"
+
+
+def _same_affiliation(a: str, b: str) -> bool:
+    """单位一致：规范名称相同（同一注册表机构），或一方未知；不同机构即使共享地名（"Hong Kong"）也不合并"""
+    return not a or not b or a == b
+
+
+def _merge_into(target: CandidateProfile, other: CandidateProfile) -> None:
+    """将重复记录的角色和已知字段合并到目标记录"""
+    roles = [r.strip() for r in target.role.split(" / ")]
+    for role in other.role.split(" / "):
+        if role.strip() and role.strip() not in roles:
+            roles.append(role.strip())
+    target.role = " / ".join(roles)
+
+    if not _affiliation(target.affiliation) and _affiliation(other.affiliation):
+        target.affiliation = other.affiliation
+
+    for field_name in _FILL_FIELDS:
+        if getattr(target, field_name) is None and getattr(other, field_name) is not None:
+            setattr(target, field_name, getattr(other, field_name))
+
+
+def resolve_entities(candidates: List[CandidateProfile]) -> List[CandidateProfile]:
+    """
+    合并指向同一人的候选人记录
+
+    分块键为(姓氏, 规范单位名称)；单位未知的记录按(姓氏, 完整名字)与同名记录比较。只在共享分块键的记录之间比较：
+    名字一致（含连写形式）且单位一致（规范名称相同，或一方未知）即合并。
+    只有首字母的记录（"L. Chen"）、单位未知的记录只在唯一对应一个人时合并，避免把不同的人串在一起。
+    合并后保留最早出现的记录，角色合并为"A / B"
+
+    Args:
+        candidates: 多个来源汇总的候选人列表
+
+    Returns:
+        去重后的候选人列表（保持首次出现的顺序）
+    """
+    parent = list(range(len(candidates)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    blocks: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    # 同名分块：单位未知的记录只需与同名记录比较
+    unknown_by_name: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    known_by_name: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    keys = []
+    for i, candidate in enumerate(candidates):
+        surname, given = _name_parts(candidate.name)
+        affiliation = _affiliation(candidate.affiliation)
+        keys.append((given, affiliation))
+        if affiliation:
+            blocks[(surname, affiliation)].append(i)
+            known_by_name[(surname, "".join(given))].append(i)
+        else:
+            unknown_by_name[(surname, "".join(given))].append(i)
+
+    # 每个簇的名字和单位取最完整的形式，合并时按簇比较，
+    # 避免经由首字母或单位未知的记录把不同的人串在一起
+    cluster_given = [given for given, _ in keys]
+    cluster_affiliation = [affiliation for _, affiliation in keys]
+    comparisons = 0
+
+    def try_merge(i: int, j: int) -> None:
+        nonlocal comparisons
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j:
+            return
+        comparisons += 1
+        if not _given_compatible(cluster_given[root_i], cluster_given[root_j]):
+            return
+        if not _same_affiliation(cluster_affiliation[root_i], cluster_affiliation[root_j]):
+            return
+        # 保留较早出现的记录作为代表
+        root, child = min(root_i, root_j), max(root_i, root_j)
+        parent[child] = root
+        if not cluster_affiliation[root]:
+            cluster_affiliation[root] = cluster_affiliation[child]
+        if not cluster_given[root] or (_is_initials(cluster_given[root]) and not _is_initials(cluster_given[child])):
+            cluster_given[root] = cluster_given[child]
+
+    for members in blocks.values():
+        # 块内按连写名字分组，组内依次合并；只有首字母的记录仅在恰好匹配一个组时合并
+        groups: Dict[str, List[int]] = defaultdict(list)
+        initials_only: List[int] = []
+        for i in members:
+            if _is_initials(keys[i][0]):
+                initials_only.append(i)
+            else:
+                groups["".join(keys[i][0])].append(i)
+
+        for group in groups.values():
+            for j in group[1:]:
+                try_merge(group[0], j)
+        for i in initials_only:
+            matches = [group[0] for group in groups.values() if _given_compatible(keys[i][0], keys[group[0]][0])]
+            if len(matches) == 1:
+                try_merge(i, matches[0])
+            elif not matches:
+                for j in initials_only:
+                    if j > i:
+                        try_merge(i, j)
+
+    for name_key, unknown in unknown_by_name.items():
+        # 同名的已知记录分属多个单位时无法判断是哪一位，不合并
+        known = known_by_name.get(name_key, ())
+        if len({find(j) for j in known}) == 1:
+            try_merge(unknown[0], known[0])
+        for j in unknown[1:]:
+            try_merge(unknown[0], j)
+
+    resolved: List[CandidateProfile] = []
+    representatives: Dict[int, CandidateProfile] = {}
+    for i, candidate in enumerate(candidates):
+        root = find(i)
+        if root == i:
+            representatives[i] = candidate
+            resolved.append(candidate)
+        else:
+            _merge_into(representatives[root], candidate)
+
+    logger.info(
+        f"[实体消解] {len(candidates)}条记录合并为{len(resolved)}位候选人"
+        f"（{len(blocks) + len(unknown_by_name)}个分块，{comparisons}次比较）"
+    )
+    return resolved
@@ -0,0 +1,130 @@
+"""HTML转文本引擎 - 可配置的快速文本提取（lxml直接解析 / 流式分词 / BeautifulSoup回退）"""
+
+import logging
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 不输出文本内容的标签
+SKIP_TAGS = frozenset({"script", "style", "noscript", "template"})
+
+
+def _extract_bs4(html: str) -> str:
+    """BeautifulSoup实现（回退方案，与历史行为一致）"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup(list(SKIP_TAGS)):
+        tag.decompose()
+    return soup.get_text(separator=" ", strip=True)
+
+
+def _extract_lxml(html: str) -> str:
+    """lxml直接解析实现：不构建BeautifulSoup对象树，直接遍历libxml2文档"""
+    from lxml import etree, html as lxml_html
+
+    try:
+        root = lxml_html.fromstring(html)
+    except ValueError:
+        # 带编码声明的str不能直接交给lxml，按UTF-8字节重新解析
+        parser = lxml_html.HTMLParser(encoding="utf-8")
+        root = lxml_html.fromstring(html.encode("utf-8"), parser=parser)
+    etree.strip_elements(root, etree.Comment, *SKIP_TAGS, with_tail=False)
+
+    parts = (text.strip() for text in root.itertext())
+    return " ".join(part for part in parts if part)
+
+
+class _TextCollector(HTMLParser):
+    """流式分词器：边扫描边收集文本，不构建文档树"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            data = data.strip()
+            if data:
+                self.parts.append(data)
+
+
+def _extract_stream(html: str) -> str:
+    """流式分词实现：仅依赖标准库，内存占用与页面大小无关"""
+    collector = _TextCollector()
+    collector.feed(html)
+    collector.close()
+    return " ".join(collector.parts)
+
+
+EXTRACTORS: Dict[str, Callable[[str], str]] = {
+    "lxml": _extract_lxml,
+    "stream": _extract_stream,
+    "bs4": _extract_bs4,
+}
+
+
+def html_to_text(html: str, engine: Optional[str] = None, max_chars: Optional[int] = None) -> str:
+    """
+    将HTML转换为纯文本（去除script/style等标签）
+
+    所选引擎失败时回退到BeautifulSoup
+
+    Args:
+        html: HTML源码
+        engine: 引擎名称（lxml / stream / bs4），默认使用配置HTML_TEXT_ENGINE
+        max_chars: 可选的最大字符数，超出部分截断并追加"..."
+
+    Returns:
+        提取的文本
+    """
+    if not html:
+        return ""
+
+    engine = engine or settings.HTML_TEXT_ENGINE
+    extractor = EXTRACTORS.get(engine, _extract_bs4)
+
+    try:
+        text = extractor(html)
+    except Exception as e:
+        if extractor is _extract_bs4:
+            raise
+        logger.warning(f"[HTML提取] {engine}引擎失败，回退到BeautifulSoup: {str(e)}")
+        text = _extract_bs4(html)
+
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars] + "..."
+
+    return text
+
+
+def parse_html(html: str):
+    """
+    构建用于结构化查询的BeautifulSoup对象
+
+    优先使用lxml解析器（比html.parser快数倍），未安装时回退到html.parser
+
+    Args:
+        html: HTML源码
+
+    Returns:
+        BeautifulSoup对象
+    """
+    from bs4 import BeautifulSoup, FeatureNotFound
+
+    try:
+        return BeautifulSoup(html, "lxml")
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser")
@@ -0,0 +1,253 @@
+"""机构注册表 - 所属单位名称/别名到官方域名的本地索引"""
+
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# 注册表数据文件（TSV格式：规范名称、别名、域名、国家/地区）
+REGISTRY_PATH = Path(__file__).resolve().parents[2] / "data" / "institutions.tsv"
+
+# 所属单位字符串中常见的分段符号（例如"Dept. of CS, Carnegie Mellon University"）
+_SEGMENT_SPLIT = re.compile(r"[,;/()|]|\s[-–—]\s")
+_NON_WORD = re.compile(r"[^0-9a-z\u4e00-\u9fff]+")
+
+
+@dataclass(frozen=True)
+class Institution:
+    """注册表中的一条机构记录"""
+    name: str
+    aliases: Tuple[str, ...]
+    domains: Tuple[str, ...]
+    country: str = ""  # 跨国机构为空
+    exact_names: Tuple[str, ...] = ()  # 有歧义的名称/别名，只用于整串查找，不参与分段、模糊与页面匹配
+
+
+# 懒加载的索引：规范化名称/别名 -> 机构
+_index: Optional[Dict[str, Institution]] = None
+# 有歧义的单词别名（例如"Rice"、"Meta"）-> 机构，只在整个所属单位字符串完全一致时使用
+_exact_index: Optional[Dict[str, Institution]] = None
+
+# 模糊匹配：Jaccard相似度阈值、缩写展开、忽略的虚词与不参与召回的通用词
+FUZZY_MATCH_THRESHOLD = 0.75
+_ABBREVIATIONS = {
+    "univ": "university", "uni": "university", "inst": "institute", "tech": "technology",
+    "technol": "technology", "natl": "national", "nat": "national", "intl": "international",
+    "sci": "science", "sch": "school", "coll": "college", "lab": "laboratory", "labs": "laboratory",
+    "ctr": "center", "centre": "center", "acad": "academy", "res": "research",
+}
+_FUZZY_STOPWORDS = frozenset({"of", "the", "and", "at", "for", "in", "de", "dept", "department"})
+_GENERIC_WORDS = frozenset({
+    "university", "institute", "technology", "national", "college", "school", "science",
+    "sciences", "research", "laboratory", "center", "academy", "state", "international",
+})
+_token_index: Optional[Dict[str, List[Tuple[FrozenSet[str], Institution]]]] = None
+
+
+@lru_cache(maxsize=8192)
+def normalize_affiliation(text: str) -> str:
+    """
+    规范化所属单位名称，用于哈希查找
+
+    去除重音符号、标点和前导"the"，统一大小写与空白
+
+    Args:
+        text: 原始所属单位字符串
+
+    Returns:
+        规范化后的字符串
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.lower().replace("&", " and ")
+    text = _NON_WORD.sub(" ", text).strip()
+    if text.startswith("the "):
+        text = text[4:]
+    return text
+
+
+def _load_registry() -> Tuple[Dict[str, Institution], Dict[str, Institution]]:
+    """从TSV文件构建名称/别名索引，以及"="开头的歧义名称的整串索引"""
+    index: Dict[str, Institution] = {}
+    exact_index: Dict[str, Institution] = {}
+
+    try:
+        lines = REGISTRY_PATH.read_text(encoding="utf-8").splitlines()
+    except OSError as e:
+        logger.warning(f"[机构注册表] 加载失败: {str(e)}")
+        return index, exact_index
+
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = line.split("\t")
+        if len(fields) < 3:
+            continue
+
+        names = [fields[0], *(a for a in fields[1].split("|") if a)]
+        institution = Institution(
+            name=names[0].lstrip("="),
+            aliases=tuple(a for a in names[1:] if not a.startswith("=")),
+            domains=tuple(d.lower() for d in fields[2].split("|") if d),
+            country=fields[3].strip() if len(fields) > 3 else "",
+            exact_names=tuple(n[1:] for n in names if n.startswith("=")),
+        )
+
+        for key in names:
+            # 先到先得：别名冲突时保留较早的条目
+            target = exact_index if key.startswith("=") else index
+            target.setdefault(normalize_affiliation(key.lstrip("=")), institution)
+
+    logger.info(f"[机构注册表] 已加载{len(index)}个名称/别名（另有{len(exact_index)}个仅整串匹配）")
+    return index, exact_index
+
+
+def _get_index() -> Dict[str, Institution]:
+    """获取（必要时加载）全局索引"""
+    global _index, _exact_index
+    if _index is None:
+        _index, _exact_index = _load_registry()
+    return _index
+
+
+@lru_cache(maxsize=4096)
+def lookup_institution(affiliation: str) -> Optional[Institution]:
+    """
+    查找所属单位对应的机构记录
+
+    先按完整字符串查找（含"Rice"、"Meta"等歧义别名），再按逗号等分隔出的片段逐一查找（不含歧义别名，
+    避免"Berkeley, CA"、"Cambridge, MA"之类的地名命中）
+
+    Args:
+        affiliation: 所属单位字符串
+
+    Returns:
+        匹配的机构记录，未找到则返回None
+    """
+    if not affiliation:
+        return None
+
+    index = _get_index()
+
+    normalized = normalize_affiliation(affiliation)
+    institution = index.get(normalized) or _exact_index.get(normalized)
+    if institution:
+        return institution
+
+    for segment in _SEGMENT_SPLIT.split(affiliation):
+        institution = index.get(normalize_affiliation(segment))
+        if institution:
+            return institution
+
+    return None
+
+
+def _fuzzy_tokens(text: str) -> FrozenSet[str]:
+    """规范化后的词集合（展开常见缩写，去掉虚词）"""
+    words = normalize_affiliation(text).split()
+    return frozenset(_ABBREVIATIONS.get(w, w) for w in words if w not in _FUZZY_STOPWORDS)
+
+
+def _get_token_index() -> Dict[str, List[Tuple[FrozenSet[str], Institution]]]:
+    """获取（必要时构建）模糊匹配用的倒排索引：区分性词 -> [(名称词集合, 机构), ...]"""
+    global _token_index
+    if _token_index is None:
+        _token_index = {}
+        for key, institution in _get_index().items():
+            tokens = _fuzzy_tokens(key)
+            for token in tokens - _GENERIC_WORDS:
+                _token_index.setdefault(token, []).append((tokens, institution))
+    return _token_index
+
+
+@lru_cache(maxsize=4096)
+def fuzzy_lookup_institution(affiliation: str) -> Optional[Institution]:
+    """
+    模糊查找所属单位对应的机构记录（精确查找失败时的回退）
+
+    展开"Univ."、"Inst."等缩写后，按分段与注册表名称的词集合Jaccard相似度匹配；
+    只比较与分段共享至少一个区分性词（非"university"等通用词）的名称
+
+    Args:
+        affiliation: 所属单位字符串
+
+    Returns:
+        相似度不低于FUZZY_MATCH_THRESHOLD的最佳机构记录，未找到则返回None
+    """
+    institution = lookup_institution(affiliation)
+    if institution or not affiliation:
+        return institution
+
+    token_index = _get_token_index()
+    best: Optional[Institution] = None
+    best_score = FUZZY_MATCH_THRESHOLD
+
+    for segment in _SEGMENT_SPLIT.split(affiliation):
+        tokens = _fuzzy_tokens(segment)
+        if not tokens:
+            continue
+        for token in tokens - _GENERIC_WORDS:
+            for name_tokens, candidate in token_index.get(token, ()):
+                score = len(tokens & name_tokens) / len(tokens | name_tokens)
+                if score > best_score or (score == best_score and best is None):
+                    best, best_score = candidate, score
+
+    return best
+
+
+def lookup_domains(affiliation: str) -> Tuple[str, ...]:
+    """
+    获取所属单位的官方域名
+
+    Args:
+        affiliation: 所属单位字符串
+
+    Returns:
+        域名元组，未知机构返回空元组
+    """
+    institution = lookup_institution(affiliation)
+    return institution.domains if institution else ()
+
+
+def affiliation_aliases(affiliation: str) -> List[str]:
+    """
+    获取所属单位可用于页面全文匹配的名称（规范名称 + 别名）
+
+    "Rice"、"Apple"等歧义名称会在无关页面上整词命中，不返回
+
+    Args:
+        affiliation: 所属单位字符串
+
+    Returns:
+        名称列表，未知机构返回空列表
+    """
+    institution = lookup_institution(affiliation)
+    if not institution:
+        return []
+    return [n for n in (institution.name, *institution.aliases) if n not in institution.exact_names]
+
+
+def is_on_domain(url: str, domains: Tuple[str, ...]) -> bool:
+    """
+    检查URL的主机名是否属于给定域名（含子域名）
+
+    Args:
+        url: 要检查的URL
+        domains: 域名元组
+
+    Returns:
+        如果URL位于任一域名下则返回True
+    """
+    if not url or not domains:
+        return False
+
+    host = (urlparse(url).hostname or "").lower()
+    return any(host == d or host.endswith("." + d) for d in domains)
@@ -0,0 +1,489 @@
+"""LLM档案提取 - 单人提取与多候选人批量提取"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain.prompts import ChatPromptTemplate
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+
+from app.agents.tools.context_selector import estimate_tokens, select_llm_context
+from app.agents.tools.llm_json import parse_llm_json
+from app.agents.tools.page_analyzer import PageAnalysis
+from app.core.config import settings
+from app.core.llm import get_llm
+from app.core.llm_gateway import llm_gateway
+from app.services.llm_cache import llm_cache, make_llm_cache_key
+
+logger = logging.getLogger(__name__)
+
+# 提示词说明部分与JSON输出的预估token数（用于LLM网关的token桶预扣）
+PROMPT_OVERHEAD_TOKENS = 400
+
+
+# 提示词版本：修改PROFILE_EXTRACTION_PROMPT或输入构建方式时递增，使LLM缓存失效
+PROMPT_VERSION = "4"
+
+# 可提取的字段及其说明
+FIELD_DESCRIPTIONS = {
+    "name_cn": '中文姓名汉字（例如："张三"）。如果未找到则返回null。',
+    "email": "电子邮箱地址。如果未找到则返回null。",
+    "bachelor_univ": '他们获得学士/本科学位的大学。查找"B.S."、"B.E."、"Bachelor"、"Undergraduate"。如果未找到则返回null。',
+    "is_verified": "布尔值。如果页面明确提到输入所属单位则为True。",
+}
+PROFILE_FIELDS = tuple(FIELD_DESCRIPTIONS)
+
+# 表示"未找到"的常见写法，统一转换为null
+_EMPTY_VALUES = ("", "null", "none", "n/a", "unknown", "未找到", "无")
+
+
+class ExtractedProfile(BaseModel):
+    """LLM提取结果的结构（字段缺失与值为null含义不同：null表示页面上未找到）"""
+    model_config = ConfigDict(extra="ignore")
+
+    name_cn: Optional[str] = None
+    email: Optional[str] = None
+    bachelor_univ: Optional[str] = None
+    is_verified: Optional[bool] = None
+
+    @field_validator("name_cn", "email", "bachelor_univ", mode="before")
+    @classmethod
+    def _normalize_empty(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            value = value.strip()
+            if value.lower() in _EMPTY_VALUES:
+                return None
+        return value
+
+    @field_validator("email")
+    @classmethod
+    def _check_email(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and "@" not in value:
+            raise ValueError("不是邮箱地址")
+        return value
+
+# LLM提示词用于档案提取
+PROFILE_EXTRACTION_PROMPT = """你是一位专业的HR研究员。
+我将提供一位学者主页的文本内容。
+你必须将以下字段提取为JSON格式：
+
+{field_list}
+
+输入姓名: {name}
+输入所属单位: {affiliation}
+
+页面预扫描线索（仅供参考，以页面内容为准）:
+{page_hints}
+
+页面内容:
+{page_text}
+
+仅返回包含以上字段的有效JSON对象。不要额外的文本或解释。
+"""
+
+# 批量提取提示词：多位候选人共享一份说明
+BATCH_PROFILE_EXTRACTION_PROMPT = """你是一位专业的HR研究员。
+我将提供多位学者主页的文本内容（每位候选人以"### 候选人 N"开头）。
+每位候选人只需提取其"需要提取的字段"中列出的字段：
+
+- `index`: 候选人编号N（必须返回）。
+{field_list}
+
+{candidates_block}
+
+仅返回一个JSON对象，格式为 {{"candidates": [每位候选人一个对象]}}。不要额外的文本或解释。
+"""
+
+BATCH_CANDIDATE_TEMPLATE = """### 候选人 {index}
+输入姓名: {name}
+输入所属单位: {affiliation}
+需要提取的字段: {fields}
+
+页面预扫描线索（仅供参考，以页面内容为准）:
+{page_hints}
+
+页面内容:
+{page_text}
+"""
+
+
+def format_field_list(fields: Sequence[str]) -> str:
+    """生成提示词中的字段说明列表"""
+    return "\n".join(f"- `{field}`: {FIELD_DESCRIPTIONS[field]}" for field in fields)
+
+
+def format_page_hints(analysis: Optional[PageAnalysis], page_text: str, max_snippets: int = 3) -> str:
+    """
+    将页面分析结果整理为提示词中的线索段落
+
+    Args:
+        analysis: 页面分析结果
+        page_text: 页面文本（用于截取教育经历片段）
+        max_snippets: 最多包含的教育经历片段数，0表示不包含
+
+    Returns:
+        线索文本，没有线索时返回"无"
+    """
+    if not analysis:
+        return "无"
+
+    lines = []
+    if analysis.emails:
+        lines.append(f"- 邮箱: {', '.join(analysis.emails[:5])}")
+    if analysis.cjk_names:
+        lines.append(f"- 中文姓名候选: {', '.join(analysis.cjk_names[:5])}")
+    for snippet in analysis.education_snippets(page_text)[:max_snippets]:
+        lines.append(f"- 教育经历片段: {snippet}")
+
+    return "\n".join(lines) if lines else "无"
+
+
+def build_llm_input(page_text: str, analysis: Optional[PageAnalysis]) -> Tuple[str, str]:
+    """
+    构建发送给LLM的页面内容和线索
+
+    Args:
+        page_text: 页面文本
+        analysis: 页面分析结果（可选）
+
+    Returns:
+        元组(页面内容, 线索文本)
+    """
+    if settings.LLM_CONTEXT_TOKEN_BUDGET > 0 and analysis is not None:
+        # 只发送与简介/教育经历/联系方式相关的片段（已包含教育经历，线索中不再重复）
+        context = select_llm_context(page_text, analysis, settings.LLM_CONTEXT_TOKEN_BUDGET)
+        return context, format_page_hints(analysis, page_text, max_snippets=0)
+
+    # 限制长度以避免token溢出
+    return page_text[:8000], format_page_hints(analysis, page_text)
+
+
+def validate_extraction(raw: Any, fields: Sequence[str]) -> Dict:
+    """
+    按ExtractedProfile校验LLM输出，只保留请求的、存在且合法的字段
+
+    Args:
+        raw: 解析后的JSON
+        fields: 请求提取的字段
+
+    Returns:
+        字段名 -> 值（缺失或不合法的字段不在结果中，需重试）
+    """
+    if isinstance(raw, list) and len(raw) == 1:
+        raw = raw[0]
+    if not isinstance(raw, dict):
+        return {}
+
+    present = {field: raw[field] for field in fields if field in raw}
+    try:
+        profile = ExtractedProfile.model_validate(present)
+    except ValidationError as e:
+        invalid = {error["loc"][0] for error in e.errors() if error["loc"]}
+        present = {field: value for field, value in present.items() if field not in invalid}
+        profile = ExtractedProfile.model_validate(present)
+
+    return profile.model_dump(include=set(present))
+
+
+def _extraction_llm():
+    """获取用于提取的LLM（JSON模式下服务端保证输出单个JSON对象）"""
+    llm = get_llm()
+    if settings.LLM_JSON_MODE:
+        return llm.bind(response_format={"type": "json_object"})
+    return llm
+
+
+def _cache_key(page_text: str, name: str, affiliation: str, fields: Sequence[str]) -> Optional[str]:
+    """构建LLM缓存键（提取的字段不同时提示词也不同），缓存禁用时返回None"""
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    prompt_version = f"{PROMPT_VERSION}:{'+'.join(sorted(fields))}"
+    return make_llm_cache_key(page_text, name, affiliation, settings.SILICONFLOW_MODEL, prompt_version)
+
+
+async def _request_fields(
+    page_text: str,
+    name: str,
+    affiliation: str,
+    analysis: Optional[PageAnalysis],
+    fields: Sequence[str]
+) -> Dict:
+    """发送一次单人提取请求，返回通过校验的字段（无法解析时为空字典）"""
+    prompt = ChatPromptTemplate.from_template(PROFILE_EXTRACTION_PROMPT)
+    chain = prompt | _extraction_llm()
+
+    context, page_hints = build_llm_input(page_text, analysis)
+
+    response = await llm_gateway.ainvoke(
+        chain,
+        {
+            "field_list": format_field_list(fields),
+            "name": name,
+            "affiliation": affiliation,
+            "page_hints": page_hints,
+            "page_text": context
+        },
+        estimated_tokens=estimate_tokens(context) + estimate_tokens(page_hints) + PROMPT_OVERHEAD_TOKENS,
+    )
+
+    try:
+        return validate_extraction(parse_llm_json(response.content), fields)
+    except ValueError as e:
+        logger.warning(f"[审计节点] LLM响应无法解析: {str(e)}")
+        return {}
+
+
+async def extract_profile_with_llm(
+    page_text: str,
+    name: str,
+    affiliation: str,
+    analysis: Optional[PageAnalysis] = None,
+    use_cache: bool = True,
+    fields: Sequence[str] = PROFILE_FIELDS
+) -> Optional[Dict]:
+    """
+    使用LLM从主页文本中提取结构化信息
+
+    响应缺少字段或字段不合法时只重试这些字段（最多LLM_FIELD_RETRIES次），
+    完整结果按(页面内容哈希, 候选人, 模型, 提示词版本)持久化缓存
+
+    Args:
+        page_text: 主页的文本内容
+        name: 候选人姓名
+        affiliation: 预期所属单位
+        analysis: 页面分析结果（可选），作为线索附加到提示词中
+        use_cache: 设为False时跳过缓存读取（仍会写入新结果）
+        fields: 需要提取的字段（默认全部）
+
+    Returns:
+        包含提取字段的字典（重试后仍缺失的字段不在其中），如果提取失败则返回None
+    """
+    cache_key = _cache_key(page_text, name, affiliation, fields)
+    if cache_key and use_cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"[审计节点] LLM缓存命中: {name}")
+            return cached
+
+    try:
+        extracted = await _request_fields(page_text, name, affiliation, analysis, fields)
+
+        for _ in range(settings.LLM_FIELD_RETRIES):
+            missing = [field for field in fields if field not in extracted]
+            if not missing:
+                break
+            logger.warning(f"[审计节点] LLM响应缺少字段 {missing}，仅重试缺失字段: {name}")
+            extracted.update(await _request_fields(page_text, name, affiliation, analysis, missing))
+
+        if not extracted:
+            return None
+
+        logger.info(f"[审计节点] LLM提取结果: {extracted}")
+
+        # 只缓存完整结果，缺失字段下次仍可重新提取
+        if cache_key and all(field in extracted for field in fields):
+            llm_cache.set(cache_key, extracted)
+
+        return extracted
+
+    except Exception as e:
+        logger.error(f"[审计节点] LLM提取失败: {str(e)}")
+        return None
+
+
+@dataclass
+class BatchItem:
+    """批量提取队列中的一位候选人"""
+    key: Any  # 调用方用于回填结果的标识（例如候选人下标）
+    name: str
+    affiliation: str
+    page_text: str
+    analysis: Optional[PageAnalysis]
+    fields: Sequence[str] = PROFILE_FIELDS
+    context: str = ""
+    page_hints: str = ""
+    tokens: int = 0
+
+    def __post_init__(self):
+        self.context, self.page_hints = build_llm_input(self.page_text, self.analysis)
+        self.tokens = estimate_tokens(self.context) + estimate_tokens(self.page_hints) + 50
+
+
+async def extract_profiles_batch_with_llm(items: List[BatchItem], use_cache: bool = True) -> List[Optional[Dict]]:
+    """
+    在一次LLM请求中提取多位候选人的信息
+
+    批量响应无法解析、缺少某位候选人或缺少部分字段时，只对缺失的部分回退到单人提取
+
+    Args:
+        items: 批量提取项列表
+        use_cache: 设为False时单人提取和缺失字段回退都跳过缓存读取（完整结果仍会写入缓存）
+
+    Returns:
+        与items一一对应的提取结果列表（失败为None）
+    """
+    results: List[Optional[Dict]] = [None] * len(items)
+
+    if len(items) == 1:
+        item = items[0]
+        results[0] = await extract_profile_with_llm(
+            item.page_text, item.name, item.affiliation, item.analysis,
+            use_cache=use_cache, fields=item.fields
+        )
+        return results
+
+    candidates_block = "\n".join(
+        BATCH_CANDIDATE_TEMPLATE.format(
+            index=i + 1,
+            name=item.name,
+            affiliation=item.affiliation,
+            fields=", ".join(item.fields),
+            page_hints=item.page_hints,
+            page_text=item.context,
+        )
+        for i, item in enumerate(items)
+    )
+
+    try:
+        prompt = ChatPromptTemplate.from_template(BATCH_PROFILE_EXTRACTION_PROMPT)
+        chain = prompt | _extraction_llm()
+
+        response = await llm_gateway.ainvoke(
+            chain,
+            {"field_list": format_field_list(PROFILE_FIELDS), "candidates_block": candidates_block},
+            estimated_tokens=sum(item.tokens for item in items) + PROMPT_OVERHEAD_TOKENS,
+        )
+        parsed = parse_llm_json(response.content)
+
+        if isinstance(parsed, dict):
+            parsed = parsed.get("candidates")
+        if not isinstance(parsed, list):
+            raise ValueError("批量响应中没有候选人数组")
+
+        for position, entry in enumerate(parsed):
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get("index", position + 1)
+            if isinstance(index, int) and 1 <= index <= len(items) and results[index - 1] is None:
+                results[index - 1] = validate_extraction(entry, items[index - 1].fields)
+
+        complete = sum(
+            1 for item, result in zip(items, results)
+            if result is not None and all(field in result for field in item.fields)
+        )
+        logger.info(f"[审计节点] LLM批量提取: {complete}/{len(items)}位候选人完整")
+
+    except Exception as e:
+        logger.warning(f"[审计节点] LLM批量提取失败，回退到单人提取: {str(e)}")
+
+    for i, item in enumerate(items):
+        extracted = results[i] or {}
+        missing = [field for field in item.fields if field not in extracted]
+
+        if missing:
+            # 只为缺失的字段单独请求，已提取的字段保留
+            retried = await extract_profile_with_llm(
+                item.page_text, item.name, item.affiliation, item.analysis,
+                use_cache=use_cache, fields=missing
+            )
+            extracted.update(retried or {})
+            results[i] = extracted or None
+        else:
+            cache_key = _cache_key(item.page_text, item.name, item.affiliation, item.fields)
+            if cache_key:
+                llm_cache.set(cache_key, extracted)
+
+    return results
+
+
+class LLMBatchQueue:
+    """
+    任务级的批量提取队列
+
+    按LLM_BATCH_SIZE和LLM_BATCH_TOKEN_BUDGET打包候选人，
+    凑满一批或没有后续候选人时发送
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.items: List[BatchItem] = []
+        self.requests = 0
+        # 刷新缓存是任务级的设置，入队时记录，发送批次时传给批量提取
+        self.use_cache = True
+
+    async def enqueue(self, item: BatchItem, use_cache: bool = True) -> Optional[Dict]:
+        """
+        将候选人加入队列；缓存命中时直接返回结果而不入队
+
+        Args:
+            item: 批量提取项
+            use_cache: 设为False时跳过缓存读取（批次结果仍会写入缓存），并在发送批次时沿用
+
+        Returns:
+            缓存命中时返回提取结果，否则返回None
+        """
+        self.use_cache = use_cache
+        cache_key = _cache_key(item.page_text, item.name, item.affiliation, item.fields)
+        if cache_key and use_cache:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"[审计节点] LLM缓存命中: {item.name}")
+                return cached
+
+        self.items.append(item)
+        return None
+
+    def _next_batch_size(self) -> int:
+        """计算队首可打包进一批的候选人数量"""
+        count = 0
+        tokens = 0
+        for item in self.items[:settings.LLM_BATCH_SIZE]:
+            if count and tokens + item.tokens > settings.LLM_BATCH_TOKEN_BUDGET:
+                break
+            count += 1
+            tokens += item.tokens
+        return count
+
+    async def drain(self, force: bool = False) -> List[Tuple[BatchItem, Optional[Dict]]]:
+        """
+        发送所有已凑满的批次
+
+        Args:
+            force: 为True时连同未凑满的最后一批一起发送
+
+        Returns:
+            (批量提取项, 提取结果) 列表
+        """
+        completed = []
+
+        while self.items:
+            size = self._next_batch_size()
+            batch_full = size < len(self.items) or size >= settings.LLM_BATCH_SIZE
+            if not (batch_full or force):
+                break
+
+            batch, self.items = self.items[:size], self.items[size:]
+            self.requests += 1
+            results = await extract_profiles_batch_with_llm(batch, use_cache=self.use_cache)
+            completed.extend(zip(batch, results))
+
+        return completed
+
+
+# 任务ID -> 批量提取队列
+_batch_queues: Dict[str, LLMBatchQueue] = {}
+
+
+def get_llm_batch_queue(job_id: str) -> LLMBatchQueue:
+    """获取（必要时创建）任务的批量提取队列"""
+    queue = _batch_queues.get(job_id)
+    if queue is None:
+        queue = _batch_queues[job_id] = LLMBatchQueue(job_id)
+    return queue
+
+
+def discard_llm_batch_queue(job_id: str) -> None:
+    """任务结束时丢弃其批量提取队列"""
+    queue = _batch_queues.pop(job_id, None)
+    if queue is not None and queue.items:
+        logger.warning(f"[审计节点] 任务 {job_id} 结束时仍有{len(queue.items)}位候选人未完成LLM提取")
@@ -0,0 +1,106 @@
+"""容错的LLM响应JSON解析 - 跳过多余文字，并从被截断的响应中恢复已完整输出的字段"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+_DECODER = json.JSONDecoder()
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _strip_fences(content: str) -> str:
+    """去掉```json代码块包裹"""
+    if "```json" in content:
+        return content.split("```json", 1)[1].split("```", 1)[0]
+    if "```" in content:
+        parts = content.split("```")
+        if len(parts) >= 3:
+            return parts[1]
+    return content
+
+
+def _cut_points(text: str) -> List[Tuple[int, str]]:
+    """
+    扫描JSON前缀，记录可以安全截断的位置
+
+    安全位置是容器内一个完整值之后（逗号前或右括号后），
+    返回 [(截断位置, 补全所需的右括号), ...]
+    """
+    points: List[Tuple[int, str]] = []
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+            # 空容器也是安全位置（例如 "[" -> "[]"）
+            points.append((i + 1, "".join(reversed(stack))))
+        elif ch in "}]":
+            if not stack:
+                break
+            stack.pop()
+            points.append((i + 1, "".join(reversed(stack))))
+            if not stack:
+                break
+        elif ch == "," and stack:
+            points.append((i, "".join(reversed(stack))))
+
+    return points
+
+
+def _repair_truncated(text: str) -> Optional[Any]:
+    """从被截断的JSON前缀中恢复最长的可解析部分"""
+    for position, closers in reversed(_cut_points(text)):
+        try:
+            return json.loads(text[:position] + closers)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_llm_json(content: str) -> Any:
+    """
+    将LLM响应解析为JSON
+
+    依次尝试：去掉代码块包裹后直接解析；从第一个"{"或"["开始解析并忽略前后的说明文字；
+    响应被截断时保留已完整输出的字段
+
+    Args:
+        content: LLM响应文本
+
+    Returns:
+        解析后的JSON对象（截断时可能只包含部分字段）
+
+    Raises:
+        ValueError: 响应中没有可解析的JSON
+    """
+    text = _strip_fences(content or "").strip()
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    for start in (i for i, ch in enumerate(text) if ch in _CLOSERS):
+        try:
+            value, _ = _DECODER.raw_decode(text, start)
+            return value
+        except ValueError:
+            pass
+        # 截断的响应：空结果说明这里不是真正的JSON起点（例如说明文字中的括号）
+        repaired = _repair_truncated(text[start:])
+        if repaired:
+            return repaired
+
+    raise ValueError(f"响应中没有可解析的JSON: {text[:100]!r}")
@@ -0,0 +1,154 @@
+"""负缓存 - 记录短期内不可访问的主机/URL及与候选人不匹配的页面"""
+
+import logging
+import time
+from typing import Dict, Hashable, Optional
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class NegativeCache:
+    """
+    带TTL的负缓存
+
+    三类条目：
+    1. 主机 - 短期内同一主机上多个不同URL超时/连接失败/5xx，该主机上的所有请求直接失败
+    2. URL - 4xx，或单个URL的超时/连接失败/5xx
+    3. (URL, 候选人) - 页面内容与该候选人不匹配
+    """
+
+    # 超过该条目数时清理过期条目
+    MAX_ENTRIES = 10000
+
+    def __init__(
+        self,
+        host_ttl: float = None,
+        url_ttl: float = None,
+        mismatch_ttl: float = None,
+        host_failure_threshold: int = None
+    ):
+        """
+        初始化负缓存
+
+        Args:
+            host_ttl: 主机不可用条目的有效期（秒），也是统计主机失败次数的时间窗口
+            url_ttl: URL不可访问条目的有效期（秒）
+            mismatch_ttl: (URL, 候选人)不匹配条目的有效期（秒）
+            host_failure_threshold: 标记主机不可用所需的不同失败URL数
+        """
+        self.host_ttl = host_ttl if host_ttl is not None else settings.NEGATIVE_CACHE_HOST_TTL
+        self.url_ttl = url_ttl if url_ttl is not None else settings.NEGATIVE_CACHE_URL_TTL
+        self.mismatch_ttl = mismatch_ttl if mismatch_ttl is not None else settings.NEGATIVE_CACHE_MISMATCH_TTL
+        self.host_failure_threshold = (
+            host_failure_threshold if host_failure_threshold is not None
+            else settings.NEGATIVE_CACHE_HOST_FAILURE_THRESHOLD
+        )
+        self._entries: Dict[Hashable, float] = {}
+        self._host_failures: Dict[str, Dict[str, float]] = {}  # 主机 -> {失败URL: 失败时间}
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    @staticmethod
+    def _candidate_key(name: str, affiliation: str) -> str:
+        return f"{name.strip().lower()}|{affiliation.strip().lower()}"
+
+    def _put(self, key: Hashable, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        if len(self._entries) >= self.MAX_ENTRIES:
+            self._entries = {k: exp for k, exp in self._entries.items() if exp > now}
+        self._entries[key] = now + ttl
+
+    def _contains(self, key: Hashable) -> bool:
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False
+        return True
+
+    def record_failure(self, url: str, status_code: int) -> None:
+        """
+        记录一次请求失败
+
+        status_code为0（超时/连接错误）或5xx时先只标记该URL（有效期同主机条目），
+        同一主机在时间窗口内有多个不同URL失败时才标记整个主机；4xx时只标记该URL
+
+        Args:
+            url: 请求的URL
+            status_code: HTTP状态码，网络异常时为0
+        """
+        if status_code == 0 or status_code >= 500:
+            self._put(("url", url), self.host_ttl)
+            host = self._host(url)
+            if not host:
+                return
+
+            now = time.monotonic()
+            failures = {
+                u: at for u, at in self._host_failures.get(host, {}).items() if now - at < self.host_ttl
+            }
+            failures[url] = now
+            if len(self._host_failures) >= self.MAX_ENTRIES:
+                self._host_failures.clear()
+            self._host_failures[host] = failures
+
+            if len(failures) >= self.host_failure_threshold:
+                self._put(("host", host), self.host_ttl)
+                self._host_failures.pop(host, None)
+                logger.info(f"[负缓存] 标记主机不可用: {host} ({len(failures)}个URL失败, 最近状态码 {status_code})")
+        elif status_code >= 400:
+            self._put(("url", url), self.url_ttl)
+
+    def record_mismatch(self, url: str, name: str, affiliation: str) -> None:
+        """
+        记录页面内容与候选人不匹配
+
+        Args:
+            url: 页面URL
+            name: 候选人姓名
+            affiliation: 候选人所属单位
+        """
+        self._put(("mismatch", url, self._candidate_key(name, affiliation)), self.mismatch_ttl)
+
+    def is_host_down(self, url: str) -> bool:
+        """检查URL所在主机是否处于不可用状态"""
+        return self._contains(("host", self._host(url)))
+
+    def is_unreachable(self, url: str) -> bool:
+        """检查URL本身或其主机是否处于不可访问状态"""
+        return self.is_host_down(url) or self._contains(("url", url))
+
+    def should_skip(self, url: str, name: Optional[str] = None, affiliation: Optional[str] = None) -> bool:
+        """
+        检查是否应跳过该URL
+
+        Args:
+            url: 候选URL
+            name: 候选人姓名（可选，提供时同时检查不匹配记录）
+            affiliation: 候选人所属单位
+
+        Returns:
+            如果URL不可访问或已知与该候选人不匹配则返回True
+        """
+        if self.is_unreachable(url):
+            return True
+        if name is not None and affiliation is not None:
+            return self._contains(("mismatch", url, self._candidate_key(name, affiliation)))
+        return False
+
+    def clear(self) -> None:
+        """清空所有条目"""
+        self._entries.clear()
+        self._host_failures.clear()
+
+
+# 全局负缓存实例
+negative_cache = NegativeCache()
@@ -0,0 +1,188 @@
+"""页面分析器 - 单次扫描页面文本，同时提取姓名、单位、邮箱、中文名和教育经历信号"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from app.agents.tools.institution_registry import affiliation_aliases
+
+# 邮箱混淆写法："name [at] cs [dot] cmu [dot] edu"、"name AT domain DOT com"、"name(at)domain.edu"
+_AT = r"(?:\s*[\[\(\{<]\s*(?i:at)\s*[\]\)\}>]\s*|\s+AT\s+|(?P<plain_at>\s+at\s+))"
+_DOT = r"(?:\s*[\[\(\{<]\s*(?i:dot)\s*[\]\)\}>]\s*|\s+DOT\s+|\s+dot\s+|\.)"
+
+# 单次扫描的主正则：按位置依次尝试 邮箱 / 混淆邮箱 / 汉字串 / 教育关键词
+_PAGE_PATTERN = re.compile(
+    r"(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)"
+    rf"|(?P<obf>\b(?P<obf_user>[A-Za-z0-9._%+-]+){_AT}(?P<obf_domain>[A-Za-z0-9-]+(?:{_DOT}[A-Za-z0-9-]+)+))"
+    r"|(?P<cjk>[\u4e00-\u9fff][\u4e00-\u9fff·]+)"
+    r"|(?P<edu>(?<![A-Za-z])(?:B\.\s?S\.?|B\.\s?Sc\.?|B\.\s?E\.?|B\.\s?Eng\.?|B\.\s?A\.?|BS|BSc|BEng"
+    r"|[Bb]achelor(?:'s)?|[Uu]ndergraduate|Ph\.\s?D\.?|PhD|M\.\s?S\.?|M\.\s?Sc\.?|[Mm]aster(?:'s)?"
+    r"|EDUCATION|Education)(?![A-Za-z])|本科|学士|硕士|博士|教育背景|教育经历)"
+)
+_DOT_SPLIT = re.compile(_DOT)
+_TLD = re.compile(r"[A-Za-z]{2,}")
+
+# 常见的邮箱误报
+BLOCKED_EMAIL_DOMAINS = ("example.com", "test.com", "email.com")
+
+# 教育经历片段在关键词前后截取的字符数
+EDUCATION_CONTEXT_BEFORE = 40
+EDUCATION_CONTEXT_AFTER = 160
+
+# 汉字姓名候选与英文姓名的最大距离（字符数）
+CJK_NAME_WINDOW = 40
+
+
+@dataclass
+class PageAnalysis:
+    """页面单次扫描的结构化结果"""
+    name_hits: List[Tuple[int, int]] = field(default_factory=list)  # 英文姓名出现位置 (start, end)
+    affiliation_hits: List[Tuple[str, int]] = field(default_factory=list)  # (命中的单位名称/别名/关键词, 位置)
+    affiliation_exact: bool = False  # 完整单位名称是否出现
+    emails: List[str] = field(default_factory=list)  # 所有邮箱（含还原后的混淆写法），按出现顺序去重
+    cjk_names: List[str] = field(default_factory=list)  # 汉字姓名候选，靠近英文姓名的排在前面
+    education_spans: List[Tuple[int, int]] = field(default_factory=list)  # 教育经历片段 (start, end)
+
+    @property
+    def name_present(self) -> bool:
+        return bool(self.name_hits)
+
+    @property
+    def affiliation_present(self) -> bool:
+        return self.affiliation_exact or bool(self.affiliation_hits)
+
+    @property
+    def is_match(self) -> bool:
+        """页面是否属于目标学者（姓名 + 单位/单位关键词）"""
+        return self.name_present and self.affiliation_present
+
+    @property
+    def primary_email(self) -> Optional[str]:
+        return self.emails[0] if self.emails else None
+
+    def education_snippets(self, page_text: str) -> List[str]:
+        """返回教育经历片段文本"""
+        return [page_text[start:end].strip() for start, end in self.education_spans]
+
+
+def _find_all(haystack: str, needle: str) -> List[int]:
+    """返回子串的所有出现位置"""
+    positions = []
+    if not needle:
+        return positions
+    start = haystack.find(needle)
+    while start != -1:
+        positions.append(start)
+        start = haystack.find(needle, start + 1)
+    return positions
+
+
+def _decode_obfuscated(match: re.Match) -> Optional[str]:
+    """还原混淆邮箱，无法确认时返回None"""
+    domain_parts = [part for part in _DOT_SPLIT.split(match.group("obf_domain")) if part]
+    # 小写的" at "很常见于正文，只有域名也使用拼写形式的"dot"时才认为是邮箱
+    if match.group("plain_at") and not re.search(r"\s(?:dot|DOT)\s|[\[\(\{<]", match.group("obf_domain")):
+        return None
+    if len(domain_parts) < 2 or not _TLD.fullmatch(domain_parts[-1]):
+        return None
+    return f"{match.group('obf_user')}@{'.'.join(domain_parts)}"
+
+
+def _merge_spans(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """合并重叠的区间"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def analyze_page(page_text: str, name: Optional[str] = None, affiliation: Optional[str] = None) -> PageAnalysis:
+    """
+    单次扫描页面文本，提取验证和信息抽取所需的全部信号
+
+    纯CPU函数，可在进程池中执行
+
+    Args:
+        page_text: 页面文本
+        name: 候选人英文姓名（可选）
+        affiliation: 候选人所属单位（可选）
+
+    Returns:
+        PageAnalysis结构化结果
+    """
+    analysis = PageAnalysis()
+    if not page_text:
+        return analysis
+
+    page_lower = page_text.lower()
+
+    # 姓名与单位：在小写文本上做子串查找
+    if name:
+        name_lower = name.lower()
+        analysis.name_hits = [(pos, pos + len(name_lower)) for pos in _find_all(page_lower, name_lower)]
+
+    if affiliation:
+        affiliation_lower = affiliation.lower()
+        exact = page_lower.find(affiliation_lower)
+        analysis.affiliation_exact = exact != -1
+        if exact != -1:
+            analysis.affiliation_hits.append((affiliation, exact))
+
+        # 单位关键词（例如"Carnegie"）
+        for keyword in affiliation.split():
+            if len(keyword) > 3:
+                pos = page_lower.find(keyword.lower())
+                if pos != -1:
+                    analysis.affiliation_hits.append((keyword, pos))
+
+        # 机构注册表中的别名，按整词匹配（避免"MIT"命中"submit"）
+        for alias in affiliation_aliases(affiliation):
+            hit = re.search(rf"\b{re.escape(alias.lower())}\b", page_lower)
+            if hit:
+                analysis.affiliation_hits.append((alias, hit.start()))
+
+    # 邮箱 / 汉字串 / 教育关键词：一次正则扫描
+    seen_emails = set()
+    cjk_candidates: List[Tuple[int, str]] = []
+    education_spans: List[Tuple[int, int]] = []
+
+    for match in _PAGE_PATTERN.finditer(page_text):
+        kind = match.lastgroup if match.lastgroup in ("email", "cjk", "edu") else "obf"
+
+        if kind == "email" or kind == "obf":
+            email = match.group("email") if kind == "email" else _decode_obfuscated(match)
+            if email:
+                email_lower = email.lower()
+                if email_lower not in seen_emails and not any(b in email_lower for b in BLOCKED_EMAIL_DOMAINS):
+                    seen_emails.add(email_lower)
+                    analysis.emails.append(email)
+
+        elif kind == "cjk":
+            run = match.group("cjk")
+            # 中文姓名通常为2-4个汉字；更长的连续汉字串是正文
+            if 2 <= len(run.replace("·", "")) <= 4:
+                cjk_candidates.append((match.start(), run))
+
+        else:
+            education_spans.append((
+                max(0, match.start() - EDUCATION_CONTEXT_BEFORE),
+                min(len(page_text), match.end() + EDUCATION_CONTEXT_AFTER),
+            ))
+
+    # 靠近英文姓名的汉字串更可能是中文名
+    def distance_to_name(position: int) -> int:
+        if not analysis.name_hits:
+            return len(page_text)
+        return min(abs(position - start) for start, _ in analysis.name_hits)
+
+    ordered = sorted(cjk_candidates, key=lambda item: (distance_to_name(item[0]) > CJK_NAME_WINDOW, item[0]))
+    for _, run in ordered:
+        if run not in analysis.cjk_names:
+            analysis.cjk_names.append(run)
+
+    analysis.education_spans = _merge_spans(education_spans)
+
+    return analysis
@@ -0,0 +1,208 @@
+"""任务级页面缓存 - 同一任务中多个候选人共享的实验室/院系页面只下载解析一次"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 页面获取函数：返回(页面文本, 重定向后的最终URL)
+PageFetcher = Callable[[str], Awaitable[Tuple[Optional[str], str]]]
+
+# 规范化时丢弃的跟踪参数前缀
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    规范化URL，用作页面缓存的键
+
+    统一协议/主机大小写，去除默认端口、片段、跟踪参数和末尾斜杠
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        规范化后的URL
+    """
+    if not url:
+        return ""
+
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    for index_page in ("/index.html", "/index.htm", "/index.php"):
+        if path.endswith(index_page):
+            path = path[: -len(index_page)] + "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+class PageStore:
+    """
+    任务级页面缓存（带引用计数的有界LRU）
+
+    使用方式：
+    1. 侦探节点为候选人选定URL后调用retain()登记引用
+    2. 审计节点通过get_text()获取页面文本，同一页面在任务内只下载解析一次
+    3. 候选人处理完毕后调用release()，引用归零的页面保留在LRU中供后续候选人复用，
+       页面数超过max_pages时淘汰最久未使用且无引用的页面；任务结束时整体释放
+    """
+
+    def __init__(self, job_id: str, max_pages: int = None):
+        self.job_id = job_id
+        self.max_pages = max_pages if max_pages is not None else settings.PAGE_STORE_MAX_PAGES
+        self._refs: Dict[str, int] = {}  # 请求URL(规范化) -> 引用计数
+        self._redirects: Dict[str, str] = {}  # 请求URL(规范化) -> 最终URL(规范化)
+        self._texts: "OrderedDict[str, str]" = OrderedDict()  # 最终URL(规范化) -> 页面文本（获取失败不缓存）
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def retain(self, url: str) -> None:
+        """为URL登记一个消费者"""
+        key = canonicalize_url(url)
+        self._refs[key] = self._refs.get(key, 0) + 1
+
+    def release(self, url: str) -> None:
+        """
+        释放URL的一个消费者，引用归零后页面可被LRU淘汰
+
+        Args:
+            url: 之前retain()过的URL
+        """
+        key = canonicalize_url(url)
+        count = self._refs.get(key, 0) - 1
+        if count > 0:
+            self._refs[key] = count
+            return
+
+        self._refs.pop(key, None)
+        self._evict()
+
+    def _evict(self) -> None:
+        """页面数超过上限时按最久未使用淘汰无引用的页面"""
+        if not self.max_pages or len(self._texts) <= self.max_pages:
+            return
+
+        pinned = {self._redirects.get(key, key) for key in self._refs}
+        for final in list(self._texts):
+            if len(self._texts) <= self.max_pages:
+                break
+            if final in pinned:
+                continue
+            del self._texts[final]
+
+        live = set(self._texts)
+        self._redirects = {key: final for key, final in self._redirects.items() if final in live or key in self._refs}
+
+    def contains(self, url: str) -> bool:
+        """检查URL对应页面是否已缓存"""
+        key = canonicalize_url(url)
+        return self._redirects.get(key, key) in self._texts
+
+    async def get_text(self, url: str, fetcher: PageFetcher) -> Optional[str]:
+        """
+        获取页面文本，同一规范URL的并发请求只触发一次下载
+
+        获取失败（返回None）时只把None交给正在等待的并发请求，不写入缓存，
+        以免一次超时等临时错误让该URL在整个任务中都不可用
+
+        Args:
+            url: 页面URL
+            fetcher: 实际下载解析页面的函数
+
+        Returns:
+            页面文本或None
+        """
+        key = canonicalize_url(url)
+
+        final = self._redirects.get(key, key)
+        if final in self._texts:
+            self._texts.move_to_end(final)
+            self.hits += 1
+            return self._texts[final]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                result = await asyncio.shield(inflight)
+                self.hits += 1
+                return result
+            except asyncio.CancelledError:
+                # 只有下载方被取消时才自行重新获取，自身被取消则继续向上抛出
+                if not inflight.cancelled():
+                    raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            text, final_url = await fetcher(url)
+            final = canonicalize_url(final_url or url)
+
+            if final != key:
+                self._redirects[key] = final
+            # 重定向到已缓存页面时复用已有文本
+            if final in self._texts and self._texts[final]:
+                text = self._texts[final]
+                self._texts.move_to_end(final)
+            elif text is not None:
+                self._texts[final] = text
+                self._evict()
+
+            future.set_result(text)
+            return text
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 避免"Future exception was never retrieved"警告
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """返回缓存统计"""
+        return {
+            "pages": len(self._texts),
+            "references": sum(self._refs.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# 任务ID -> 页面缓存
+_stores: Dict[str, PageStore] = {}
+
+
+def get_page_store(job_id: str) -> PageStore:
+    """获取（必要时创建）任务的页面缓存"""
+    store = _stores.get(job_id)
+    if store is None:
+        store = _stores[job_id] = PageStore(job_id)
+    return store
+
+
+def close_page_store(job_id: str) -> None:
+    """任务结束时丢弃其页面缓存"""
+    store = _stores.pop(job_id, None)
+    if store is not None:
+        logger.info(f"[页面缓存] 任务 {job_id} 结束: {store.stats()}")
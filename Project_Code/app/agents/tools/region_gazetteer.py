@@ -0,0 +1,139 @@
+"""地区词典 - 编译后的整词匹配，从所属单位字符串识别国家/地区"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from app.agents.tools.institution_registry import normalize_affiliation
+
+MAINLAND_CHINA = "中国大陆"
+
+# 匹配优先级：城市/州/机构等具体地名高于国家名
+# （例如"Hong Kong, China"判为中国香港，"University of California"判为美国）
+PRIORITY_SPECIFIC = 2
+PRIORITY_COUNTRY = 1
+
+# 地区 -> (具体地名/机构关键词, 国家名关键词)
+# 不收录公司名（Baidu、Tencent等在多国设有研究院，所在地由地名判断）和"us"等常见英文单词
+REGION_GAZETTEER: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    MAINLAND_CHINA: (
+        ("tsinghua", "peking university", "pku", "beijing", "shanghai", "fudan", "zhejiang university",
+         "nanjing", "chinese academy of sciences", "chinese academy", "cas", "ucas", "ustc", "sjtu",
+         "harbin", "wuhan", "xi'an", "xian", "chengdu", "guangzhou", "shenzhen", "hangzhou", "tianjin",
+         "hefei", "changsha", "xiamen", "jinan", "qingdao", "dalian", "chongqing", "suzhou", "sun yat sen",
+         "renmin university", "beihang"),
+        ("china", "p r china", "pr china", "prc", "people's republic of china"),
+    ),
+    "中国香港": (
+        ("hong kong", "hkust", "hku", "cuhk", "polyu", "cityu", "kowloon", "hkbu"),
+        (),
+    ),
+    "中国澳门": (("macau", "macao"), ()),
+    "中国台湾": (
+        ("taiwan", "taipei", "hsinchu", "tainan", "taichung", "academia sinica", "tsing hua"),
+        (),
+    ),
+    "新加坡": (("nus", "nanyang technological university", "a star", "smu singapore"), ("singapore",)),
+    "美国": (
+        ("california", "massachusetts", "new york", "texas", "washington", "pennsylvania", "illinois",
+         "michigan", "new jersey", "maryland", "virginia", "north carolina", "ohio", "arizona", "utah",
+         "colorado", "minnesota", "wisconsin", "indiana", "florida", "oregon", "seattle", "boston",
+         "pittsburgh", "chicago", "los angeles", "san diego", "san francisco", "mountain view",
+         "redmond", "mit", "stanford", "harvard", "princeton", "yale", "cornell", "caltech", "cmu",
+         "carnegie mellon", "ucla", "ucsd", "uiuc", "berkeley", "columbia university",
+         "georgia institute of technology", "georgia tech", "purdue", "duke university", "rutgers"),
+        ("usa", "united states", "u s"),
+    ),
+    "加拿大": (
+        ("toronto", "montreal", "vancouver", "waterloo", "alberta", "mcgill", "ontario", "quebec",
+         "british columbia", "mila"),
+        ("canada",),
+    ),
+    "英国": (
+        ("london", "edinburgh", "manchester", "university of oxford", "university of cambridge",
+         "imperial college", "ucl", "glasgow", "bristol", "warwick"),
+        ("uk", "united kingdom", "england", "scotland", "wales"),
+    ),
+    "澳大利亚": (
+        ("sydney", "melbourne", "monash", "brisbane", "queensland", "adelaide", "canberra", "unsw", "anu"),
+        ("australia",),
+    ),
+    "新西兰": (("auckland", "wellington", "otago"), ("new zealand",)),
+    "德国": (("munich", "berlin", "tubingen", "max planck", "darmstadt", "heidelberg", "saarland"), ("germany",)),
+    "法国": (("paris", "inria", "grenoble", "sorbonne", "cnrs"), ("france",)),
+    "瑞士": (("eth zurich", "epfl", "zurich", "lausanne", "geneva"), ("switzerland",)),
+    "荷兰": (("amsterdam", "delft", "eindhoven", "leiden", "utrecht"), ("netherlands",)),
+    "以色列": (("technion", "tel aviv", "weizmann", "hebrew university"), ("israel",)),
+    "日本": (("tokyo", "kyoto", "osaka", "riken"), ("japan",)),
+    "韩国": (("seoul", "kaist", "postech", "daejeon"), ("korea", "south korea")),
+    "印度": (("iit", "iisc", "bangalore", "bengaluru", "delhi", "mumbai"), ("india",)),
+    "意大利": (("rome", "milan", "politecnico di milano", "turin"), ("italy",)),
+    "西班牙": (("madrid", "barcelona"), ("spain",)),
+    "瑞典": (("stockholm", "kth", "chalmers", "uppsala"), ("sweden",)),
+    "丹麦": (("copenhagen", "aarhus"), ("denmark",)),
+    "芬兰": (("helsinki", "aalto"), ("finland",)),
+    "奥地利": (("vienna", "graz", "linz"), ("austria",)),
+    "比利时": (("leuven", "ghent", "brussels"), ("belgium",)),
+    "爱尔兰": (("dublin",), ("ireland",)),
+    "阿联酋": (("mbzuai", "abu dhabi", "dubai"), ("uae", "united arab emirates")),
+    "沙特阿拉伯": (("kaust",), ("saudi arabia",)),
+}
+
+
+def _build_matcher() -> Tuple["re.Pattern[str]", Dict[str, Tuple[str, int]]]:
+    """将词典编译为一个整词匹配的正则（长词优先）及关键词 -> (地区, 优先级) 映射"""
+    keywords: Dict[str, Tuple[str, int]] = {}
+    for region, (specific, countries) in REGION_GAZETTEER.items():
+        for terms, priority in ((specific, PRIORITY_SPECIFIC), (countries, PRIORITY_COUNTRY)):
+            for term in terms:
+                # 先到先得：关键词冲突时保留较早的地区
+                keywords.setdefault(normalize_affiliation(term), (region, priority))
+
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})\b"), keywords
+
+
+_PATTERN, _KEYWORDS = _build_matcher()
+
+
+@lru_cache(maxsize=16384)
+def _region_for_normalized(text: str) -> Optional[Tuple[str, int]]:
+    best: Optional[Tuple[int, int]] = None
+    region = None
+    for match in _PATTERN.finditer(text):
+        candidate_region, priority = _KEYWORDS[match.group(0)]
+        # 同优先级取最靠后的匹配（所属单位通常由具体到笼统，末尾的地名更能代表所在地）
+        rank = (priority, match.start())
+        if best is None or rank > best:
+            best = rank
+            region = candidate_region
+    return (region, best[0]) if region else None
+
+
+def lookup_region_match(affiliation: str) -> Optional[Tuple[str, int]]:
+    """
+    识别所属单位所在的国家/地区，并返回命中关键词的优先级
+
+    Args:
+        affiliation: 所属单位字符串
+
+    Returns:
+        (国家/地区名称, PRIORITY_SPECIFIC或PRIORITY_COUNTRY)，无法识别时返回None
+    """
+    if not affiliation:
+        return None
+    return _region_for_normalized(normalize_affiliation(affiliation))
+
+
+def lookup_region(affiliation: str) -> Optional[str]:
+    """
+    识别所属单位所在的国家/地区
+
+    Args:
+        affiliation: 所属单位字符串
+
+    Returns:
+        国家/地区名称（例如"中国大陆"、"美国"），无法识别时返回None
+    """
+    match = lookup_region_match(affiliation)
+    return match[0] if match else None
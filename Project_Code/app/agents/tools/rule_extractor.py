@@ -0,0 +1,229 @@
+"""规则提取器 - 从页面分析结果中确定性地提取邮箱、中文名和本科院校，并给出置信度"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.agents.tools.institution_registry import lookup_domains, lookup_institution
+from app.agents.tools.page_analyzer import CJK_NAME_WINDOW, PageAnalysis
+
+# 规则提取覆盖的字段（其余字段仍由LLM提取）
+RULE_FIELDS = ("email", "name_cn", "bachelor_univ")
+
+# 本科学位关键词
+_BACHELOR_PATTERN = re.compile(
+    r"(?<![A-Za-z])(?:B\.\s?S\.?|B\.\s?Sc\.?|B\.\s?E\.?|B\.\s?Eng\.?|B\.\s?A\.?|BS|BSc|BEng"
+    r"|[Bb]achelor(?:'s)?|[Uu]ndergraduate)(?![A-Za-z])|本科|学士"
+)
+
+# 学位关键词之后的院校名称：英文"... University / University of ..."或中文"...大学/学院"
+_INSTITUTION_PATTERN = re.compile(
+    r"(?:(?:[A-Z][\w&.'-]*\s+){0,5}(?:University|Institute|College|Polytechnic)"
+    r"(?:\s+of(?:\s+(?:of|and|the|at|[A-Z][\w&'-]*))+)?)"
+    r"|[\u4e00-\u9fff]{2,12}(?:大学|学院)"
+)
+_TRAILING_LOWER = re.compile(r"(?:\s+(?:of|and|the|at))+$")
+
+# 学位关键词之后查找院校名称的窗口（字符数）
+BACHELOR_WINDOW = 120
+
+# 常见汉字姓氏（单姓）与复姓：高置信度的中文名必须以姓氏开头
+_CJK_SURNAMES = frozenset(
+    "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐韩冯于董萧程曹袁邓许傅沈曾彭吕苏卢蒋蔡贾丁魏薛叶阎余"
+    "潘杜戴夏钟汪田任姜范方石姚谭廖邹熊金陆郝孔白崔康毛邱秦江史顾侯邵孟龙万段雷钱汤尹黎易常武乔贺赖龚文"
+    "庞樊兰殷施陶洪翟安颜倪严牛温芦季俞章鲁葛伍韦申尤毕聂丛焦向柳邢路岳齐沿梅莫庄辛管祝左涂谷祁时舒耿牟卜"
+    "詹关苗凌费纪靳盛童欧甄项曲成游阳裴席卫查屈鲍位覃霍翁隋植甘景薄单包司柏宁柯阮桂闵解强柴华车冉房边"
+    "辜吉饶刁瞿戚丘古米池滕晋苑邬臧畅宫来嵺苟全褚廉简娄盖符奚木穆党燕郎邸冀谈姬屠连郜晏栾郁商蒙计喻揭窦"
+    "迟宇敖糜鄢冷卓花仇艾蓝都巩稽井练仲乐虞卞封竺冼原官衣楚佟栗匡宗应台巫鞠僧桑荆谌银扬明沙薄伏岑习胥保和蔺"
+)
+_CJK_COMPOUND_SURNAMES = frozenset({"欧阳", "司马", "上官", "诸葛", "司徒", "东方", "皇甫", "尉迟", "公孙", "慕容", "令狐", "长孙", "夏侯", "端木"})
+
+# 页面导航、栏目等常见汉字串，不是人名
+_CJK_STOPWORDS = frozenset({
+    "首页", "主页", "中文", "中文版", "英文", "英文版", "简介", "个人", "欢迎", "联系", "联系我们", "研究",
+    "教授", "副教授", "讲师", "博士", "硕士", "学生", "招生", "论文", "新闻", "团队", "成员", "课程", "教学",
+    "学院", "大学", "实验室", "方向", "项目", "成果", "荣誉", "简历", "邮箱", "地址", "电话", "更多", "返回",
+})
+
+# 非个人邮箱的常见前缀
+_GENERIC_MAILBOXES = ("info", "admin", "contact", "office", "webmaster", "support", "help", "hr")
+
+
+@dataclass
+class FieldGuess:
+    """单个字段的规则提取结果"""
+    value: Optional[str]
+    confidence: float  # 0-1
+    source: str  # page（页面规则）/ upstream（AMiner等上游来源）
+
+
+def _name_tokens(name: str) -> List[str]:
+    return [t for t in re.split(r"[^a-z]+", (name or "").lower()) if t]
+
+
+def _email_matches_name(email: str, name: str) -> bool:
+    """邮箱用户名是否与姓名对应（包含姓/名，或首字母+姓）"""
+    local = re.sub(r"[^a-z]", "", email.split("@")[0].lower())
+    tokens = _name_tokens(name)
+    if not local or not tokens:
+        return False
+    if any(len(t) >= 3 and t in local for t in tokens):
+        return True
+    initials = "".join(t[0] for t in tokens)
+    return local in (initials, initials[::-1]) or local == tokens[0][0] + tokens[-1]
+
+
+def guess_email(analysis: PageAnalysis, name: str, affiliation: str) -> FieldGuess:
+    """
+    从页面邮箱中选出最可能属于候选人的一个
+
+    Args:
+        analysis: 页面分析结果
+        name: 候选人英文姓名
+        affiliation: 候选人所属单位
+
+    Returns:
+        邮箱提取结果
+    """
+    emails = [e for e in analysis.emails if e.split("@")[0].lower() not in _GENERIC_MAILBOXES]
+    if not emails:
+        return FieldGuess(None, 0.0, "page")
+
+    domains = lookup_domains(affiliation)
+
+    def score(email: str) -> float:
+        domain = email.split("@")[-1].lower()
+        on_domain = any(domain == d or domain.endswith("." + d) for d in domains)
+        return 0.6 * _email_matches_name(email, name) + 0.3 * on_domain
+
+    best = max(emails, key=score)  # 同分时保留页面中先出现的邮箱
+    confidence = 0.35 + score(best)
+    if len(emails) == 1:
+        # 页面上唯一的个人邮箱
+        confidence = max(confidence, 0.8)
+    return FieldGuess(best, min(confidence, 0.95), "page")
+
+
+def _looks_like_cjk_name(text: str) -> bool:
+    """汉字串是否像中文姓名：以常见姓氏开头的2-3字（复姓3-4字），且不是导航/栏目词"""
+    if text in _CJK_STOPWORDS:
+        return False
+    if text[:2] in _CJK_COMPOUND_SURNAMES:
+        return 3 <= len(text) <= 4
+    return 2 <= len(text) <= 3 and text[0] in _CJK_SURNAMES
+
+
+def guess_name_cn(page_text: str, analysis: PageAnalysis) -> FieldGuess:
+    """
+    选出中文姓名候选
+
+    汉字串紧邻英文姓名且像中文姓名（常见姓氏开头、不是"首页"等栏目词）时置信度高
+
+    Args:
+        page_text: 页面文本
+        analysis: 页面分析结果
+
+    Returns:
+        中文名提取结果
+    """
+    if not analysis.cjk_names:
+        return FieldGuess(None, 0.0, "page")
+
+    def near_name(text: str) -> bool:
+        position = page_text.find(text)
+        return any(abs(position - start) <= CJK_NAME_WINDOW for start, _ in analysis.name_hits)
+
+    # PageAnalysis已将靠近英文姓名的候选排在最前
+    for text in analysis.cjk_names:
+        if _looks_like_cjk_name(text) and near_name(text):
+            return FieldGuess(text, 0.85, "page")
+
+    # 低于跳过LLM的阈值：只作为LLM未给出结果时的参考
+    first = analysis.cjk_names[0]
+    if near_name(first) and first not in _CJK_STOPWORDS:
+        return FieldGuess(first, 0.6, "page")
+    return FieldGuess(first, 0.3, "page")
+
+
+def _clean_institution(text: str) -> str:
+    return _TRAILING_LOWER.sub("", text.strip(" ,.;:()")).strip()
+
+
+def guess_bachelor_univ(page_text: str, analysis: PageAnalysis) -> FieldGuess:
+    """
+    在教育经历片段中查找"B.S., <University>"形式的本科院校
+
+    只找到一所院校时置信度高；多所不同院校（有歧义）时置信度低
+
+    Args:
+        page_text: 页面文本
+        analysis: 页面分析结果
+
+    Returns:
+        本科院校提取结果
+    """
+    found: List[str] = []
+
+    for start, end in analysis.education_spans:
+        snippet = page_text[start:end]
+        for keyword in _BACHELOR_PATTERN.finditer(snippet):
+            window = snippet[keyword.end():keyword.end() + BACHELOR_WINDOW]
+            institution = _INSTITUTION_PATTERN.search(window)
+            if not institution:
+                continue
+            # 学位关键词与院校之间不能隔着其他学位（例如"B.S. ... Ph.D., MIT"）
+            gap = window[:institution.start()]
+            if re.search(r"Ph\.\s?D|PhD|M\.\s?S\.|Master|博士|硕士", gap):
+                continue
+            name = _clean_institution(institution.group(0))
+            if name and name not in found:
+                found.append(name)
+
+    if not found:
+        return FieldGuess(None, 0.0, "page")
+
+    # 按注册表规范名称去重（"MIT"与"Massachusetts Institute of Technology"视为同一所）
+    distinct = {
+        (lookup_institution(name).name if lookup_institution(name) else name.lower())
+        for name in found
+    }
+    if len(distinct) == 1:
+        return FieldGuess(found[0], 0.9, "page")
+    return FieldGuess(found[0], 0.4, "page")
+
+
+def extract_profile_rules(
+    page_text: str,
+    analysis: PageAnalysis,
+    name: str,
+    affiliation: str,
+    known: Optional[Dict[str, Optional[str]]] = None
+) -> Dict[str, FieldGuess]:
+    """
+    规则提取邮箱、中文名和本科院校
+
+    AMiner等上游来源已提供的字段视为高置信度，优先于页面规则结果
+
+    Args:
+        page_text: 页面文本
+        analysis: 页面分析结果
+        name: 候选人英文姓名
+        affiliation: 候选人所属单位
+        known: 已知字段值（例如AMiner提供的name_cn/email）
+
+    Returns:
+        字段名 -> FieldGuess
+    """
+    known = known or {}
+
+    guesses = {
+        "email": guess_email(analysis, name, affiliation),
+        "name_cn": guess_name_cn(page_text, analysis),
+        "bachelor_univ": guess_bachelor_univ(page_text, analysis),
+    }
+
+    for field, value in known.items():
+        if value and field in guesses:
+            guesses[field] = FieldGuess(value, 0.9, "upstream")
+
+    return guesses
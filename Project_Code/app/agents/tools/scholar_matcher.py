@@ -0,0 +1,222 @@
+"""学者匹配器 - 预计算词集合，对AMiner搜索结果批量评分"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set
+
+# 评分权重
+NAME_EXACT_WEIGHT = 0.4
+NAME_SURNAME_WEIGHT = 0.3
+NAME_PARTIAL_WEIGHT = 0.2
+ORG_WEIGHT = 0.35
+EMAIL_EXACT_WEIGHT = 0.25
+EMAIL_DOMAIN_WEIGHT = 0.15
+
+
+def _email_domain(email: str) -> str:
+    return email.rsplit("@", 1)[1] if "@" in email else ""
+
+
+@dataclass(frozen=True)
+class ScholarQuery:
+    """预处理后的查询（姓名/单位/邮箱只规范化一次）"""
+    name: str
+    name_parts: tuple
+    affiliation: str
+    affiliation_words: FrozenSet[str]
+    email: str
+    email_domain: str
+
+    @classmethod
+    def build(cls, name: str, affiliation: str, email: Optional[str] = None) -> "ScholarQuery":
+        name_lower = (name or "").lower()
+        affiliation_lower = (affiliation or "").lower()
+        email_lower = (email or "").lower()
+        return cls(
+            name=name_lower,
+            name_parts=tuple(name_lower.split()),
+            affiliation=affiliation_lower,
+            affiliation_words=frozenset(affiliation_lower.split()),
+            email=email_lower,
+            email_domain=_email_domain(email_lower),
+        )
+
+
+@dataclass(frozen=True)
+class PreparedHit:
+    """预处理后的搜索结果"""
+    hit: Dict[str, Any]
+    name: str
+    name_tokens: FrozenSet[str]
+    org: str
+    org_words: FrozenSet[str]
+    email: str
+    email_domain: str
+
+    @classmethod
+    def build(cls, hit: Dict[str, Any]) -> "PreparedHit":
+        name = (hit.get("name") or "").lower()
+        org = (hit.get("org") or "").lower()
+        email = (hit.get("email") or "").lower()
+        return cls(
+            hit=hit,
+            name=name,
+            name_tokens=frozenset(name.split()),
+            org=org,
+            org_words=frozenset(org.split()),
+            email=email,
+            email_domain=_email_domain(email),
+        )
+
+
+def prepare_hits(hits: Iterable[Dict[str, Any]]) -> List[PreparedHit]:
+    """预处理搜索结果列表"""
+    return [PreparedHit.build(hit) for hit in hits]
+
+
+def _org_score(query: ScholarQuery, hit: PreparedHit) -> float:
+    """机构匹配分"""
+    if not hit.org:
+        return 0.0
+    if query.affiliation in hit.org or hit.org in query.affiliation:
+        return ORG_WEIGHT  # 机构包含关系
+    if len(hit.org) > 5:
+        # 模糊匹配：关键词重叠比例
+        denominator = max(len(query.affiliation_words), len(hit.org_words))
+        if denominator:
+            return ORG_WEIGHT * len(query.affiliation_words & hit.org_words) / denominator
+    return 0.0
+
+
+def score_hit(query: ScholarQuery, hit: PreparedHit, org_scores: Optional[Dict[str, float]] = None) -> float:
+    """
+    计算单个搜索结果与查询的匹配分
+
+    评分维度：名字（0.4）、机构（0.35）、邮箱（0.25，如有）
+
+    Args:
+        query: 预处理后的查询
+        hit: 预处理后的搜索结果
+        org_scores: 该查询的机构分缓存（机构名 -> 分数），同一机构在结果中反复出现时复用
+
+    Returns:
+        匹配分（未归一化）
+    """
+    score = 0.0
+
+    # 维度1: 名字匹配
+    if hit.name == query.name:
+        score += NAME_EXACT_WEIGHT  # 完全匹配
+    elif query.name_parts and query.name_parts[-1] in hit.name_tokens:
+        score += NAME_SURNAME_WEIGHT  # 姓氏匹配
+    elif any(part in hit.name for part in query.name_parts):
+        score += NAME_PARTIAL_WEIGHT  # 部分匹配
+
+    # 维度2: 机构匹配
+    if org_scores is None:
+        score += _org_score(query, hit)
+    else:
+        org_score = org_scores.get(hit.org)
+        if org_score is None:
+            org_score = org_scores[hit.org] = _org_score(query, hit)
+        score += org_score
+
+    # 维度3: 邮箱匹配
+    if query.email and hit.email:
+        if hit.email == query.email:
+            score += EMAIL_EXACT_WEIGHT
+        elif hit.email_domain and hit.email_domain == query.email_domain:
+            score += EMAIL_DOMAIN_WEIGHT  # 同域名
+
+    return score
+
+
+def _best_of(query: ScholarQuery, hits: Sequence[PreparedHit]) -> Dict[str, Any]:
+    """选出得分最高的结果（同分时保留靠前的）"""
+    best_hit = None
+    best_score = 0.0
+    org_scores: Dict[str, float] = {}
+
+    for hit in hits:
+        score = score_hit(query, hit, org_scores)
+        if score > best_score:
+            best_score = score
+            best_hit = hit.hit
+
+    result = best_hit.copy() if best_hit else {"id": None}
+    result["confidence_score"] = min(best_score, 1.0)  # 归一化到[0, 1]
+    return result
+
+
+def find_best_match(
+    name: str,
+    affiliation: str,
+    hits: Iterable[Dict[str, Any]],
+    email: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    在一次搜索的结果中找到最佳匹配的学者
+
+    Args:
+        name: 候选人英文姓名
+        affiliation: 候选人机构
+        hits: 搜索结果列表
+        email: 候选人邮箱（可选）
+
+    Returns:
+        最佳匹配记录的副本（含confidence_score），无结果时为{"id": None, "confidence_score": 0.0}
+    """
+    return _best_of(ScholarQuery.build(name, affiliation, email), prepare_hits(hits))
+
+
+def match_many(
+    queries: Iterable[Dict[str, Optional[str]]],
+    hits: Iterable[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    批量将多个查询与同一组学者记录对齐（例如离线AMiner数据）
+
+    学者记录只预处理一次，并按名字词和邮箱建立倒排索引；
+    每个查询只对名字中包含其任一名字部分（与find_best_match的部分匹配规则相同，按子串判断）
+    或邮箱相同的记录评分。名字完全不匹配的记录最高0.6分（机构+邮箱），达不到验证阈值，
+    因此分块不会漏掉find_best_match能够通过验证的结果
+
+    Args:
+        queries: 查询列表，每项包含name、affiliation和可选的email
+        hits: 学者记录列表
+
+    Returns:
+        与queries一一对应的最佳匹配列表（结构同find_best_match）
+    """
+    prepared = prepare_hits(hits)
+
+    by_token: Dict[str, List[int]] = defaultdict(list)
+    by_email: Dict[str, List[int]] = defaultdict(list)
+    for i, hit in enumerate(prepared):
+        for token in hit.name_tokens:
+            by_token[token].append(i)
+        if hit.email:
+            by_email[hit.email].append(i)
+
+    # 名字部分 -> 包含该部分的名字词（部分匹配按子串判断，同一部分只扫描一次词表）
+    containing: Dict[str, List[str]] = {}
+
+    def tokens_containing(part: str) -> List[str]:
+        if part not in containing:
+            containing[part] = [token for token in by_token if part in token]
+        return containing[part]
+
+    results = []
+    for item in queries:
+        query = ScholarQuery.build(item.get("name") or "", item.get("affiliation") or "", item.get("email"))
+
+        block: Set[int] = set()
+        for part in query.name_parts:
+            for token in tokens_containing(part):
+                block.update(by_token[token])
+        if query.email:
+            block.update(by_email.get(query.email, ()))
+
+        results.append(_best_of(query, [prepared[i] for i in sorted(block)]))
+
+    return results
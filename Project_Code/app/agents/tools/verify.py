@@ -1,10 +1,14 @@
 """HTTP验证和内容检查工具"""
 
 import httpx
-from bs4 import BeautifulSoup
 from typing import Optional, Dict, Tuple
 import logging
 from app.agents.tools.firecrawl_scraper import firecrawl_scrape_page, is_firecrawl_enabled
+from app.agents.tools.page_analyzer import analyze_page
+from app.agents.tools.negative_cache import negative_cache
+from app.agents.tools.html_text import html_to_text
+from app.core.config import settings
+from app.core.executor import run_cpu_bound
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +24,20 @@ async def check_url_connectivity(url: str, timeout: int = 10) -> Tuple[bool, int
     Returns:
         元组(is_accessible, status_code)
     """
+    # 已知不可用的主机/URL直接失败，避免再等待一次完整超时
+    if negative_cache.is_unreachable(url):
+        logger.info(f"{url}命中负缓存，跳过连接检查")
+        return (False, 0)
+    
     try:
         async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
             response = await client.get(url)
+            if response.status_code >= 400:
+                negative_cache.record_failure(url, response.status_code)
             return (response.status_code == 200, response.status_code)
     except Exception as e:
         logger.warning(f"{url}连接检查失败: {str(e)}")
+        negative_cache.record_failure(url, 0)
         return (False, 0)
 
 
@@ -33,10 +45,6 @@ async def fetch_page_text(url: str, timeout: int = 15) -> Optional[str]:
     """
     Fetch and extract text content from a webpage.
     
-    使用双路由策略：
-    1. 优先尝试 Firecrawl（如果启用）- 支持JS渲染、智能清洗
-    2. 降级到 httpx + BeautifulSoup - 传统抓取方式
-    
     Args:
         url: URL to scrape
         timeout: Request timeout in seconds
@@ -44,6 +52,25 @@ async def fetch_page_text(url: str, timeout: int = 15) -> Optional[str]:
     Returns:
         Extracted text content or None if failed
     """
+    text, _ = await fetch_page(url, timeout)
+    return text
+
+
+async def fetch_page(url: str, timeout: int = 15) -> Tuple[Optional[str], str]:
+    """
+    获取网页文本及重定向后的最终URL
+    
+    使用双路由策略：
+    1. 优先尝试 Firecrawl（如果启用）- 支持JS渲染、智能清洗
+    2. 降级到 httpx + HTML文本提取引擎（lxml/流式分词，BeautifulSoup回退）
+    
+    Args:
+        url: 要抓取的URL
+        timeout: 请求超时时间（秒）
+        
+    Returns:
+        元组(页面文本或None, 最终URL)
+    """
     # 策略1: 尝试使用 Firecrawl（增强抓取）
     if is_firecrawl_enabled():
         logger.info(f"[Fetch] Trying Firecrawl for: {url}")
@@ -60,12 +87,16 @@ async def fetch_page_text(url: str, timeout: int = 15) -> Optional[str]:
                     text = text[:max_chars] + "..."
                 
                 logger.info(f"[Fetch] ✓ Firecrawl success: {len(text)} chars")
-                return text
+                return text, url
         
         # Firecrawl 失败，记录日志并降级
         logger.warning(f"[Fetch] Firecrawl failed for {url}, falling back to httpx")
     
-    # 策略2: 降级到传统 httpx + BeautifulSoup
+    # 策略2: 降级到 httpx + HTML文本提取引擎
+    if negative_cache.is_unreachable(url):
+        logger.info(f"[获取] {url}命中负缓存，快速失败")
+        return None, url
+    
     try:
         logger.info(f"[Fetch] Using httpx for: {url}")
         
@@ -74,29 +105,25 @@ async def fetch_page_text(url: str, timeout: int = 15) -> Optional[str]:
             
             if response.status_code != 200:
                 logger.warning(f"Non-200 status for {url}: {response.status_code}")
-                return None
-            
-            # 解析HTML并提取文本
-            soup = BeautifulSoup(response.text, 'lxml')
+                negative_cache.record_failure(url, response.status_code)
+                return None, url
             
-            # 删除script和style元素
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # 获取文本并清理
-            text = soup.get_text(separator=' ', strip=True)
-            
-            # 限制文本长度以避免token溢出
-            max_chars = 10000
-            if len(text) > max_chars:
-                text = text[:max_chars] + "..."
+            # 解析HTML并提取文本（删除script/style，限制长度以避免token溢出）
+            html = response.text
+            text = await run_cpu_bound(
+                html_to_text, html, settings.HTML_TEXT_ENGINE, 10000, size_hint=len(html)
+            )
             
             logger.info(f"[获取] ✓ httpx成功: {len(text)}个字符")
-            return text
+            return text, str(response.url)
             
+    except httpx.TransportError as e:
+        logger.error(f"从{url}获取页面文本失败: {str(e)}")
+        negative_cache.record_failure(url, 0)
+        return None, url
     except Exception as e:
         logger.error(f"从{url}获取页面文本失败: {str(e)}")
-        return None
+        return None, url
 
 
 def semantic_match(page_text: str, name: str, affiliation: str) -> bool:
@@ -114,21 +141,8 @@ def semantic_match(page_text: str, name: str, affiliation: str) -> bool:
     if not page_text:
         return False
     
-    page_lower = page_text.lower()
-    name_lower = name.lower()
-    affiliation_lower = affiliation.lower()
-    
-    # 检查1: 姓名必须存在
-    name_present = name_lower in page_lower
-    
-    # 检查2: 所属单位或所属单位关键词存在
-    affiliation_present = affiliation_lower in page_lower
-    
-    # 对于大学，检查缩写形式（例如"CMU"代表"Carnegie Mellon University"）
-    affiliation_keywords = affiliation.split()
-    keyword_match = any(keyword.lower() in page_lower for keyword in affiliation_keywords if len(keyword) > 3)
-    
-    return name_present and (affiliation_present or keyword_match)
+    # 姓名必须存在，且所属单位/单位关键词/注册表别名之一存在
+    return analyze_page(page_text, name, affiliation).is_match
 
 
 def extract_email_simple(page_text: str) -> Optional[str]:
@@ -141,16 +155,8 @@ def extract_email_simple(page_text: str) -> Optional[str]:
     Returns:
         找到的第一个邮箱或None
     """
-    import re
     if not page_text:
         return None
     
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    matches = re.findall(email_pattern, page_text)
-    
-    # 过滤常见的误报
-    blocked = ['example.com', 'test.com', 'email.com']
-    valid_emails = [m for m in matches if not any(b in m.lower() for b in blocked)]
-    
-    return valid_emails[0] if valid_emails else None
-
+    # 包含"name [at] domain [dot] edu"等混淆写法，并过滤常见的误报
+    return analyze_page(page_text).primary_email
@@ -0,0 +1,284 @@
+"""Workshop站点爬虫 - 从Workshops索引页出发，有界并发地抓取各Workshop站点的组织者名单"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import httpx
+
+from app.api.models import CandidateProfile
+from app.agents.tools.html_text import parse_html
+from app.core.config import settings
+from app.core.executor import run_cpu_bound
+
+logger = logging.getLogger(__name__)
+
+# 不是Workshop站点的外部链接（社交媒体、投稿系统、视频等）
+_SKIP_HOSTS = (
+    "twitter.com", "x.com", "facebook.com", "linkedin.com", "youtube.com", "instagram.com",
+    "openreview.net", "cmt3.research.microsoft.com", "easychair.org", "google.com", "zoom.us",
+)
+_SKIP_EXTENSIONS = (".pdf", ".zip", ".png", ".jpg", ".jpeg", ".gif", ".ics", ".mp4")
+
+# Workshop站点内可能包含组织者名单的子页面
+_ORGANIZER_LINK = re.compile(r"organi[sz]|committee|people|team|about|chairs", re.IGNORECASE)
+# 组织者名单所在区块的标题：Organizers、Organizing Committee、(Co-)Chairs；
+# 程序委员会、指导委员会等名单中是审稿人/顾问，不是组织者
+_ORGANIZER_HEADING = re.compile(r"organi[sz](?:er|ing)|\bco-?chairs?\b|\bchairs?\b", re.IGNORECASE)
+_EXCLUDED_HEADING = re.compile(
+    r"\b(?:program(?:me)?|steering|technical|advisory|review(?:ing)?)\s+(?:program\s+)?committee|\bpc\b",
+    re.IGNORECASE,
+)
+
+# 成员行格式："名字 (机构)"、"名字 - 机构"、"名字, 机构"
+_MEMBER_PATTERNS = (
+    re.compile(r"^(?P<name>[^()]+?)\s*\((?P<aff>[^()]+)\)"),
+    re.compile(r"^(?P<name>[^,–—]+?)\s+[-–—]\s+(?P<aff>.+)$"),
+    re.compile(r"^(?P<name>[^,]+?),\s*(?P<aff>.+)$"),
+)
+_NAME_WORD = re.compile(r"^[A-Z][A-Za-z'.\-]*$")
+# 姓名前的头衔："Prof. "、"Dr. "、"Assoc. Prof. "等
+_TITLE_PREFIX = re.compile(
+    r"^(?:(?:assoc(?:iate)?|asst|assistant)\.?\s+)?(?:prof(?:essor)?|dr)\.?\s+", re.IGNORECASE
+)
+
+
+def normalize_url(url: str) -> str:
+    """去掉片段和末尾斜杠，用于已访问集合去重"""
+    url, _ = urldefrag(url)
+    return url.rstrip("/")
+
+
+def _looks_like_name(text: str) -> bool:
+    words = text.split()
+    return 2 <= len(words) <= 5 and all(_NAME_WORD.match(w) for w in words)
+
+
+def parse_member_line(text: str) -> Optional[Tuple[str, str]]:
+    """
+    解析一行组织者信息
+
+    Args:
+        text: 列表项文本
+
+    Returns:
+        (姓名, 机构)，不像人名时返回None
+    """
+    text = " ".join(text.split())
+    # 去掉头衔，否则"Dr. Lei Chen"无法与其他来源的"Lei Chen"合并，也会进入搜索词
+    while _TITLE_PREFIX.match(text):
+        text = _TITLE_PREFIX.sub("", text, count=1)
+    for pattern in _MEMBER_PATTERNS:
+        match = pattern.match(text)
+        if match and _looks_like_name(match.group("name").strip()):
+            return match.group("name").strip(), match.group("aff").strip(" .;")
+    if _looks_like_name(text):
+        return text, "Unknown"
+    return None
+
+
+def parse_workshop_links(html: str, page_url: str) -> List[str]:
+    """
+    从Workshops索引页提取各Workshop站点链接
+
+    纯CPU函数，可在进程池中执行
+
+    Args:
+        html: 索引页HTML源码
+        page_url: 索引页URL
+
+    Returns:
+        去重后的Workshop站点URL列表（保持页面顺序）
+    """
+    soup = parse_html(html)
+    index_host = (urlparse(page_url).hostname or "").lower()
+    index_path = urlparse(page_url).path.rstrip("/")
+
+    links: List[str] = []
+    seen: Set[str] = set()
+
+    for anchor in soup.find_all("a", href=True):
+        url = normalize_url(urljoin(page_url, anchor["href"]))
+        parsed = urlparse(url)
+        host = (parsed.hostname or "").lower()
+
+        if parsed.scheme not in ("http", "https") or url in seen:
+            continue
+        if parsed.path.lower().endswith(_SKIP_EXTENSIONS):
+            continue
+        if any(host == h or host.endswith("." + h) for h in _SKIP_HOSTS):
+            continue
+        # 外部站点，或同站点上索引页之下的Workshop子页面
+        if host == index_host and not (parsed.path.startswith(index_path + "/") and parsed.path.rstrip("/") != index_path):
+            continue
+
+        seen.add(url)
+        links.append(url)
+
+    return links
+
+
+def parse_workshop_site(html: str, page_url: str) -> Tuple[List[CandidateProfile], List[str]]:
+    """
+    解析Workshop站点页面，提取组织者及站内可能包含组织者名单的子页面链接
+
+    纯CPU函数，可在进程池中执行
+
+    Args:
+        html: 页面HTML源码
+        page_url: 页面URL
+
+    Returns:
+        (CandidateProfile列表, 同站点子页面URL列表)
+    """
+    soup = parse_html(html)
+    candidates: List[CandidateProfile] = []
+
+    for heading in soup.find_all(["h1", "h2", "h3", "h4", "h5", "strong"]):
+        heading_text = heading.get_text(" ", strip=True)
+        if not _ORGANIZER_HEADING.search(heading_text) or _EXCLUDED_HEADING.search(heading_text):
+            continue
+
+        section = heading.find_next(["ul", "ol", "table", "div"])
+        if not section:
+            continue
+
+        rows = section.find_all(["li", "tr"]) or section.find_all("p")
+        for row in rows:
+            member = parse_member_line(row.get_text(" ", strip=True))
+            if member:
+                candidates.append(CandidateProfile(
+                    name=member[0],
+                    affiliation=member[1],
+                    role="Workshop Organizer",
+                    status="PENDING"
+                ))
+
+    host = (urlparse(page_url).hostname or "").lower()
+    sublinks: List[str] = []
+    for anchor in soup.find_all("a", href=True):
+        url = normalize_url(urljoin(page_url, anchor["href"]))
+        if (urlparse(url).hostname or "").lower() != host:
+            continue
+        if _ORGANIZER_LINK.search(anchor.get_text(" ", strip=True)) or _ORGANIZER_LINK.search(urlparse(url).path):
+            sublinks.append(url)
+
+    return candidates, sublinks
+
+
+@dataclass
+class CrawlStats:
+    """一次爬取的统计"""
+    pages: int = 0
+    failures: int = 0
+    organizers: int = 0
+    hosts: Set[str] = field(default_factory=set)
+
+
+class WorkshopCrawler:
+    """
+    有界并发爬虫
+
+    - 深度限制：Workshop首页为第0层，只跟随站内组织者相关链接
+    - 页数限制：已访问集合达到上限后不再入队
+    - 并发限制：全局并发 + 每个主机的并发
+    """
+
+    def __init__(
+        self,
+        max_depth: int = None,
+        max_pages: int = None,
+        concurrency: int = None,
+        per_host: int = None
+    ):
+        self.max_depth = max_depth if max_depth is not None else settings.WORKSHOP_CRAWL_MAX_DEPTH
+        self.max_pages = max_pages if max_pages is not None else settings.WORKSHOP_CRAWL_MAX_PAGES
+        self.concurrency = concurrency or settings.WORKSHOP_CRAWL_CONCURRENCY
+        self.per_host = per_host or settings.WORKSHOP_CRAWL_PER_HOST
+        self.visited: Set[str] = set()
+        self.stats = CrawlStats()
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _enqueue(self, queue: asyncio.Queue, url: str, depth: int) -> None:
+        url = normalize_url(url)
+        if url in self.visited or len(self.visited) >= self.max_pages:
+            return
+        self.visited.add(url)
+        queue.put_nowait((url, depth))
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        self.stats.hosts.add(host)
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
+        async with self._host_limit(url):
+            try:
+                response = await client.get(url)
+            except httpx.HTTPError as e:
+                logger.debug(f"获取{url}失败: {str(e)}")
+                return None
+        if response.status_code != 200 or "html" not in response.headers.get("content-type", "html"):
+            return None
+        return response.text
+
+    async def crawl(self, start_urls: List[str]) -> List[CandidateProfile]:
+        """
+        从各Workshop首页开始爬取
+
+        Args:
+            start_urls: Workshop站点URL列表
+
+        Returns:
+            所有页面上找到的组织者
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        results: List[CandidateProfile] = []
+
+        for url in start_urls:
+            self._enqueue(queue, url, 0)
+
+        async def worker(client: httpx.AsyncClient) -> None:
+            while True:
+                url, depth = await queue.get()
+                try:
+                    html = await self._fetch(client, url)
+                    self.stats.pages += 1
+                    if html is None:
+                        self.stats.failures += 1
+                        continue
+
+                    organizers, sublinks = await run_cpu_bound(
+                        parse_workshop_site, html, url, size_hint=len(html)
+                    )
+                    results.extend(organizers)
+                    self.stats.organizers += len(organizers)
+
+                    if depth < self.max_depth:
+                        for link in sublinks:
+                            self._enqueue(queue, link, depth + 1)
+                except Exception as e:
+                    self.stats.failures += 1
+                    logger.debug(f"解析{url}失败: {str(e)}")
+                finally:
+                    queue.task_done()
+
+        async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
+            workers = [asyncio.create_task(worker(client)) for _ in range(self.concurrency)]
+            try:
+                await queue.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+        logger.info(
+            f"[Workshop爬虫] 访问{self.stats.pages}个页面（{len(self.stats.hosts)}个站点，"
+            f"失败{self.stats.failures}），找到{self.stats.organizers}名组织者"
+        )
+        return results
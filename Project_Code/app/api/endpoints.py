@@ -13,7 +13,14 @@ from app.api.models import (
     JobStatusResponse, CandidateProfile
 )
 from app.agents import create_agent_graph, AgentState
+from app.agents.tools.page_store import close_page_store
+from app.agents.tools.llm_extractor import discard_llm_batch_queue
+from app.core.llm_gateway import llm_gateway, PRIORITY_INTERACTIVE, PRIORITY_BATCH
 from app.services.excel_service import generate_excel_report, generate_full_report
+from app.services.ingestion_store import save_candidate_results
+from app.services.llm_cache import llm_cache
+from app.services.scholar_kb import scholar_kb
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -39,13 +46,17 @@ async def check_single_person(request: CheckPersonRequest):
     """
     logger.info(f"[API] 单人检查请求: {request.name} @ {request.affiliation}")
     
+    job_id = f"single-{uuid.uuid4().hex[:8]}"
+    # 单人检查的LLM请求优先于批量任务
+    llm_context = llm_gateway.bind_job(job_id, PRIORITY_INTERACTIVE)
+    
     try:
         # 为单个候选人创建迷你图
         graph = create_agent_graph()
         
         # 单个候选人的初始状态
         initial_state: AgentState = {
-            "job_id": f"single-{uuid.uuid4().hex[:8]}",
+            "job_id": job_id,
             "candidates": [
                 CandidateProfile(
                     name=request.name,
@@ -56,7 +67,8 @@ async def check_single_person(request: CheckPersonRequest):
             ],
             "current_index": 0,
             "is_complete": False,
-            "error_message": ""
+            "error_message": "",
+            "refresh_llm_cache": request.refresh_llm_cache
         }
         
         # 注意：因为是检查单个人，跳过采集步骤，直接进入detective和auditor
@@ -69,6 +81,9 @@ async def check_single_person(request: CheckPersonRequest):
         
         candidate = state["candidates"][0]
         
+        if settings.SCHOLAR_KB_ENABLED:
+            scholar_kb.record_verified([candidate], source=settings.SCHOLAR_KB_SOURCE)
+        
         if candidate.status == "VERIFIED":
             return CheckPersonResponse(
                 name=candidate.name,
@@ -91,17 +106,24 @@ async def check_single_person(request: CheckPersonRequest):
     except Exception as e:
         logger.error(f"[API] Single check failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
+    finally:
+        close_page_store(job_id)
+        discard_llm_batch_queue(job_id)
+        llm_gateway.pop_job_usage(job_id)
+        llm_gateway.unbind_job(llm_context)
 
 
-async def run_batch_job(job_id: str, limit: int = None):
+async def run_batch_job(job_id: str, limit: int = None, refresh_llm_cache: bool = False):
     """
     运行完整智能体工作流的后台任务
     
     Args:
         job_id: 唯一任务标识符
         limit: 可选的候选人处理数量限制
+        refresh_llm_cache: 跳过LLM缓存读取，重新提取
     """
     logger.info(f"[后台任务] 启动任务 {job_id}")
+    llm_context = llm_gateway.bind_job(job_id, PRIORITY_BATCH)
     
     try:
         graph = create_agent_graph()
@@ -111,12 +133,22 @@ async def run_batch_job(job_id: str, limit: int = None):
             "candidates": [],
             "current_index": 0,
             "is_complete": False,
-            "error_message": ""
+            "error_message": "",
+            "refresh_llm_cache": refresh_llm_cache
         }
         
         # 运行完整工作流
         final_state = await graph.ainvoke(initial_state)
         
+        # 保存本次结果，下次任务中未变化的候选人直接沿用
+        saved = save_candidate_results(final_state["candidates"])
+        logger.info(f"[后台任务] 已保存{saved}位候选人的结果供增量采集使用")
+        
+        # 已验证的学者写入知识库，供后续会议的任务直接使用
+        if settings.SCHOLAR_KB_ENABLED:
+            recorded = scholar_kb.record_verified(final_state["candidates"], source=settings.SCHOLAR_KB_SOURCE)
+            logger.info(f"[后台任务] 学者知识库写入{recorded}份档案, 命中统计: {scholar_kb.stats()}")
+        
         # 如果指定了限制则应用（用于测试）
         if limit:
             final_state["candidates"] = final_state["candidates"][:limit]
@@ -125,6 +157,7 @@ async def run_batch_job(job_id: str, limit: int = None):
         job_store[job_id] = final_state
         
         logger.info(f"[后台任务] 任务 {job_id} 成功完成")
+        logger.info(f"[后台任务] LLM缓存统计: {llm_cache.stats()}")
         
     except Exception as e:
         logger.error(f"[后台任务] 任务 {job_id} 失败: {str(e)}")
@@ -136,6 +169,11 @@ async def run_batch_job(job_id: str, limit: int = None):
             "is_complete": False,
             "error_message": str(e)
         }
+    finally:
+        close_page_store(job_id)
+        discard_llm_batch_queue(job_id)
+        logger.info(f"[后台任务] 任务 {job_id} LLM用量: {llm_gateway.pop_job_usage(job_id)}")
+        llm_gateway.unbind_job(llm_context)
 
 
 @router.post("/jobs/aaai-full-scan", response_model=StartJobResponse)
@@ -154,10 +192,10 @@ async def start_batch_job(request: StartJobRequest, background_tasks: Background
     """
     job_id = f"job-{uuid.uuid4().hex[:12]}"
     
-    logger.info(f"[API] 启动批量任务 {job_id} (limit={request.limit})")
+    logger.info(f"[API] 启动批量任务 {job_id} (limit={request.limit}, refresh_llm_cache={request.refresh_llm_cache})")
     
     # 添加到后台任务
-    background_tasks.add_task(run_batch_job, job_id, request.limit)
+    background_tasks.add_task(run_batch_job, job_id, request.limit, request.refresh_llm_cache)
     
     return StartJobResponse(
         job_id=job_id,
@@ -1,7 +1,7 @@
 """API请求/响应的Pydantic模型"""
 
 from pydantic import BaseModel, Field
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, Dict
 from datetime import datetime
 
 
@@ -10,11 +10,13 @@ class CheckPersonRequest(BaseModel):
     """单人验证的请求模型"""
     name: str = Field(..., description="学者的全名")
     affiliation: str = Field(..., description="当前所属单位/大学")
+    refresh_llm_cache: bool = Field(False, description="跳过LLM缓存，重新提取信息")
 
 
 class StartJobRequest(BaseModel):
     """批量任务的请求模型"""
     limit: Optional[int] = Field(None, description="可选的测试限制（仅处理N个候选人）")
+    refresh_llm_cache: bool = Field(False, description="跳过LLM缓存，重新提取信息")
 
 
 # 响应模型
@@ -27,6 +29,7 @@ class CandidateProfile(BaseModel):
     
     # 验证结果
     homepage: Optional[str] = None
+    candidate_urls: Optional[List[str]] = None  # 按评分排序的候选主页URL（用于并发验证）
     email: Optional[str] = None
     name_cn: Optional[str] = None
     bachelor_univ: Optional[str] = None
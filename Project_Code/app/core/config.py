@@ -12,14 +12,85 @@ class Settings(BaseSettings):
     SILICONFLOW_BASE_URL: str = "https://api.siliconflow.cn/v1"
     SILICONFLOW_MODEL: str = "deepseek-ai/DeepSeek-V3"
     
+    # LLM网关：请求/token速率限制（每分钟，0表示不限制）与自适应并发
+    LLM_RPM_LIMIT: int = 1000
+    LLM_TPM_LIMIT: int = 50000
+    LLM_CONCURRENCY_INITIAL: int = 4
+    LLM_CONCURRENCY_MIN: int = 1
+    LLM_CONCURRENCY_MAX: int = 16
+    LLM_TARGET_LATENCY: float = 15.0  # 单次请求延迟超过该值（秒）时降低并发
+    LLM_MAX_RETRIES: int = 3  # 遇到429时的最大重试次数
+    
     # 应用设置
     APP_ENV: Literal["DEV", "PROD"] = "DEV"
     API_VERSION: str = "v1"
     CONCURRENT_SEARCHES: int = 3
     
+    # 并发验证配置：同时审计排名前K的候选URL，取第一个验证通过的
+    HEDGED_VERIFICATION_ENABLED: bool = False
+    HEDGED_VERIFICATION_TOP_K: int = 3
+    
+    # 任务级页面缓存：处理完的页面保留给后续候选人复用的最大页面数（LRU淘汰），0表示不限制
+    PAGE_STORE_MAX_PAGES: int = 1000
+    
+    # HTML文本提取引擎：lxml（直接解析）、stream（流式分词）、bs4（BeautifulSoup）
+    HTML_TEXT_ENGINE: Literal["lxml", "stream", "bs4"] = "lxml"
+    
+    # CPU密集型任务进程池：HTML解析与页面文本分析在独立进程中执行
+    CPU_POOL_ENABLED: bool = True
+    CPU_POOL_WORKERS: int = 0  # 0表示等于CPU核数
+    CPU_POOL_INLINE_MAX_CHARS: int = 8000  # 小于该字符数的输入直接在事件循环中处理
+    
+    # 过滤节点分片：待过滤候选人不少于阈值时按分片交给进程池并行分类
+    FILTER_SHARDING_MIN_CANDIDATES: int = 20000
+    FILTER_SHARD_SIZE: int = 5000
+    
+    # LLM输入的token预算：按相关性挑选简介/教育经历/联系方式片段，0表示沿用前8000字符截断
+    LLM_CONTEXT_TOKEN_BUDGET: int = 1500
+    
+    # 本地持久化缓存目录
+    CACHE_DIR: str = ".cache"
+    
+    # LLM提取结果缓存：页面内容、候选人、模型和提示词版本都未变化时直接复用结果
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 50000
+    LLM_CACHE_TTL_DAYS: int = 90  # 0表示永不过期
+    LLM_CACHE_REFRESH: bool = False  # 强制刷新：跳过缓存读取重新调用LLM（新结果仍写入缓存）
+    
+    # LLM结构化输出：JSON模式（服务端保证输出JSON对象），缺失/不合法字段的重试次数
+    LLM_JSON_MODE: bool = True
+    LLM_FIELD_RETRIES: int = 1
+    
+    # 规则提取快速路径：置信度不低于阈值的字段（邮箱/中文名/本科院校）不再交给LLM
+    RULE_EXTRACTION_ENABLED: bool = True
+    RULE_EXTRACTION_MIN_CONFIDENCE: float = 0.8
+    
+    # LLM批量提取：多位已验证候选人合并为一次请求，共享提示词说明部分
+    LLM_BATCH_SIZE: int = 1  # 每批最多候选人数，1表示不批量
+    LLM_BATCH_TOKEN_BUDGET: int = 6000  # 每批页面内容的token上限
+    
+    # 增量采集：来源页面指纹与候选人结果跨任务持久化，未变化的页面不重新解析、未变化的候选人沿用上次结果
+    INCREMENTAL_INGESTION_ENABLED: bool = True
+    INCREMENTAL_RESULT_TTL_DAYS: int = 30  # 超过该天数的已验证结果重新验证，0表示永不过期
+    
+    # 学者知识库：跨会议保存已验证的学者档案，侦探节点先查知识库，只有超过新鲜期的档案才重新验证
+    SCHOLAR_KB_ENABLED: bool = True
+    SCHOLAR_KB_FRESHNESS_DAYS: int = 180  # 新鲜期（天），0表示永不过期
+    SCHOLAR_KB_SOURCE: str = "AAAI-26"  # 写入档案的来源标识
+    
+    # 负缓存TTL（秒）：不可用主机、不可访问URL、与候选人不匹配的页面
+    NEGATIVE_CACHE_HOST_TTL: int = 600
+    NEGATIVE_CACHE_URL_TTL: int = 1800
+    NEGATIVE_CACHE_MISMATCH_TTL: int = 3600
+    NEGATIVE_CACHE_HOST_FAILURE_THRESHOLD: int = 3  # 同一主机有多少个不同URL失败后才标记整个主机
+    
     # AAAI-26 URL地址
     AAAI_INVITED_SPEAKERS_URL: str = "https://aaai.org/conference/aaai/aaai-26/invited-speakers/"
     AAAI_TECHNICAL_TRACK_URL: str = "https://aaai.org/conference/aaai/aaai-26/technical-track/"
+    # 采集Technical Track论文作者（逐页流式抓取并预过滤）。默认关闭：论文作者大多没有所属单位，
+    # 无法在进入侦探/LLM流程前排除中国大陆学者
+    TECHNICAL_TRACK_ENABLED: bool = False
+    TECHNICAL_TRACK_MAX_PAGES: int = 200
     
     # Firecrawl 配置（可选 - 增强网页抓取）
     FIRECRAWL_API_KEY: str = ""  # 留空则使用httpx回退方案
@@ -28,12 +99,23 @@ class Settings(BaseSettings):
     # AMiner API 配置（可选 - 学者身份验证与信息补充）
     AMINER_API_KEY: str = ""  # 留空则禁用AMiner功能
     AMINER_ENABLED: bool = False  # 设为True以启用AMiner验证
+    AMINER_CACHE_ENABLED: bool = True  # 持久化缓存搜索结果和学者详情（跨任务复用）
+    AMINER_SEARCH_CACHE_TTL_DAYS: int = 7
+    AMINER_DETAIL_CACHE_TTL_DAYS: int = 30
+    AMINER_DETAIL_CONCURRENCY: int = 4  # 批量获取学者详情时的最大并发请求数
     
     # AAAI-26 爬取配置
     BRIDGE_PROGRAM_URL: str = "https://aaai.org/conference/aaai/aaai-26/bridge-program/"
     TUTORIALS_LABS_URL: str = "https://aaai.org/conference/aaai/aaai-26/tutorials-and-labs/"
     WORKSHOPS_URL: str = "https://aaai.org/conference/aaai/aaai-26/workshops/"
     
+    # Workshop站点爬虫：跟随Workshops页面上的链接抓取各站点的组织者名单
+    WORKSHOP_CRAWL_ENABLED: bool = True
+    WORKSHOP_CRAWL_MAX_DEPTH: int = 1  # 0只抓站点首页，1再跟随一层组织者/委员会子页面
+    WORKSHOP_CRAWL_MAX_PAGES: int = 500
+    WORKSHOP_CRAWL_CONCURRENCY: int = 16
+    WORKSHOP_CRAWL_PER_HOST: int = 2
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
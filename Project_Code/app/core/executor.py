@@ -0,0 +1,100 @@
+"""CPU密集型任务执行器 - 将HTML解析与文本分析移出事件循环，交给进程池执行"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 全局进程池（懒加载）
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _pool_size() -> int:
+    """进程池大小：配置值，未配置时等于CPU核数"""
+    return settings.CPU_POOL_WORKERS or os.cpu_count() or 1
+
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """获取或创建全局进程池"""
+    global _pool
+    if _pool is None:
+        # 使用spawn而非fork：事件循环和HTTP客户端线程运行时fork不安全
+        _pool = ProcessPoolExecutor(
+            max_workers=_pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"[执行器] 进程池已启动: {_pool_size()}个工作进程")
+    return _pool
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any, size_hint: int = 0) -> T:
+    """
+    在进程池中执行CPU密集型函数
+
+    输入规模低于CPU_POOL_INLINE_MAX_CHARS时直接在事件循环中执行（快速路径），
+    避免小页面的进程间序列化开销超过解析本身
+
+    Args:
+        func: 模块级函数（必须可被pickle）
+        *args: 函数参数（必须可被pickle）
+        size_hint: 输入规模（通常为字符数），用于选择快速路径
+
+    Returns:
+        函数返回值
+    """
+    global _pool
+
+    if not settings.CPU_POOL_ENABLED or size_hint < settings.CPU_POOL_INLINE_MAX_CHARS:
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_cpu_pool(), partial(func, *args))
+    except BrokenProcessPool:
+        # 工作进程异常退出：丢弃进程池（下次调用时重建），本次在事件循环中执行
+        logger.warning("[执行器] 进程池损坏，本次改为在事件循环中执行")
+        _pool = None
+        return func(*args)
+
+
+def map_sharded(func: Callable[..., T], shards: Sequence[Sequence[Any]]) -> List[T]:
+    """
+    在进程池中并行处理多个分片（同步调用，供同步节点使用）
+
+    Args:
+        func: 模块级函数（必须可被pickle），以单个分片的各字段为参数
+        shards: 分片列表，每个分片为func的参数元组
+
+    Returns:
+        与shards一一对应的结果列表
+    """
+    global _pool
+
+    if not settings.CPU_POOL_ENABLED or len(shards) <= 1:
+        return [func(*shard) for shard in shards]
+
+    try:
+        return list(get_cpu_pool().map(func, *zip(*shards)))
+    except BrokenProcessPool:
+        logger.warning("[执行器] 进程池损坏，分片改为在当前进程中执行")
+        _pool = None
+        return [func(*shard) for shard in shards]
+
+
+def shutdown_cpu_pool() -> None:
+    """关闭全局进程池"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        logger.info("[执行器] 进程池已关闭")
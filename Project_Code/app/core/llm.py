@@ -17,6 +17,7 @@ def get_llm_client() -> ChatOpenAI:
         model=settings.SILICONFLOW_MODEL,
         temperature=0.1,  # 低温度用于结构化提取
         max_tokens=2000,
+        max_retries=0,  # 429重试由LLM网关负责，以便据此调整并发
     )
 
 
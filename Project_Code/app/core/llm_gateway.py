@@ -0,0 +1,299 @@
+"""LLM网关 - 请求/token速率限制、AIMD自适应并发、优先级队列和按任务的token用量统计"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 优先级：数值越小越先执行，单人检查优先于批量任务
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# 当前协程所属的任务ID与优先级（由API端点在运行工作流前绑定）
+_job_context: ContextVar[Tuple[Optional[str], int]] = ContextVar(
+    "llm_job_context", default=(None, PRIORITY_BATCH)
+)
+
+
+class TokenBucket:
+    """
+    令牌桶限流器
+
+    按每分钟速率匀速补充，容量等于一分钟的配额；
+    实际用量超出预估时允许欠账，由后续请求等待补足
+    """
+
+    def __init__(self, per_minute: int):
+        """
+        Args:
+            per_minute: 每分钟配额，0表示不限制
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        """
+        等待直到桶中有足够令牌并扣除
+
+        Args:
+            amount: 需要的令牌数（超过容量时按容量计）
+        """
+        if self.rate <= 0 or amount <= 0:
+            return
+
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, delta: float) -> None:
+        """按实际用量修正（正数为补扣，负数为退还）"""
+        if self.rate <= 0:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD自适应并发限制器
+
+    请求成功且延迟低于目标时并发上限加性增长（每轮约+1），
+    遇到429或延迟过高时乘性下降；等待中的请求按优先级唤醒
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, target_latency: float):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._last_decrease = 0.0
+
+    async def acquire(self, priority: int = PRIORITY_BATCH) -> None:
+        """获取一个并发槽位，槽位已满时按(优先级, 到达顺序)排队"""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # 已分配槽位但调用方被取消时归还槽位
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """归还槽位并唤醒等待者"""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    def on_success(self, latency: float) -> None:
+        """根据请求延迟调整并发上限"""
+        if latency > self.target_latency:
+            self._decrease(0.9, f"延迟{latency:.1f}s")
+        else:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def on_overload(self) -> None:
+        """遇到429时将并发上限减半"""
+        self._decrease(0.5, "429限流")
+
+    def _decrease(self, factor: float, reason: str) -> None:
+        # 一个目标延迟窗口内只下调一次，避免同一波失败连续减半
+        now = time.monotonic()
+        if now - self._last_decrease < self.target_latency:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(float(self.minimum), self.limit * factor)
+        logger.warning(f"[LLM网关] {reason}，并发上限 {previous:.1f} -> {self.limit:.1f}")
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """判断异常是否为429限流"""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or type(error).__name__ == "RateLimitError"
+
+
+def _token_usage(response: Any) -> Dict[str, int]:
+    """从LLM响应中读取token用量"""
+    metadata = getattr(response, "response_metadata", None) or {}
+    usage = metadata.get("token_usage") or {}
+    if usage:
+        return {
+            "prompt_tokens": usage.get("prompt_tokens") or 0,
+            "completion_tokens": usage.get("completion_tokens") or 0,
+            "total_tokens": usage.get("total_tokens") or 0,
+        }
+
+    usage = getattr(response, "usage_metadata", None) or {}
+    return {
+        "prompt_tokens": usage.get("input_tokens") or 0,
+        "completion_tokens": usage.get("output_tokens") or 0,
+        "total_tokens": usage.get("total_tokens") or 0,
+    }
+
+
+class LLMGateway:
+    """所有LLM调用的统一入口"""
+
+    def __init__(self):
+        self.request_bucket = TokenBucket(settings.LLM_RPM_LIMIT)
+        self.token_bucket = TokenBucket(settings.LLM_TPM_LIMIT)
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial=settings.LLM_CONCURRENCY_INITIAL,
+            minimum=settings.LLM_CONCURRENCY_MIN,
+            maximum=settings.LLM_CONCURRENCY_MAX,
+            target_latency=settings.LLM_TARGET_LATENCY,
+        )
+        self._usage: Dict[str, Dict[str, int]] = {}
+
+    def bind_job(self, job_id: str, priority: int = PRIORITY_BATCH) -> Token:
+        """
+        将当前协程（及其创建的子任务）的LLM调用归属到指定任务
+
+        Args:
+            job_id: 任务ID
+            priority: 该任务LLM请求的优先级
+
+        Returns:
+            用于unbind_job的上下文令牌
+        """
+        return _job_context.set((job_id, priority))
+
+    def unbind_job(self, token: Token) -> None:
+        """恢复绑定前的任务上下文"""
+        _job_context.reset(token)
+
+    async def ainvoke(
+        self,
+        runnable: Any,
+        inputs: Dict[str, Any],
+        estimated_tokens: int = 0,
+        priority: Optional[int] = None
+    ) -> Any:
+        """
+        经过限流和并发控制调用LLM链，遇到429时退避重试
+
+        Args:
+            runnable: LangChain可运行对象（例如 prompt | llm）
+            inputs: 调用参数
+            estimated_tokens: 预估token数（提示词+输出），用于token桶预扣
+            priority: 优先级，默认使用当前任务绑定的优先级
+
+        Returns:
+            LLM响应
+        """
+        job_id, job_priority = _job_context.get()
+        if priority is None:
+            priority = job_priority
+
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            backoff = None
+            await self.limiter.acquire(priority)
+            try:
+                await self.request_bucket.acquire(1)
+                await self.token_bucket.acquire(estimated_tokens)
+
+                started = time.monotonic()
+                try:
+                    response = await runnable.ainvoke(inputs)
+                except Exception as e:
+                    if not _is_rate_limited(e) or attempt >= settings.LLM_MAX_RETRIES:
+                        raise
+                    self.limiter.on_overload()
+                    backoff = 2 ** attempt + random.random()
+                    logger.warning(f"[LLM网关] 429限流，{backoff:.1f}s后重试 ({attempt + 1}/{settings.LLM_MAX_RETRIES})")
+                else:
+                    self.limiter.on_success(time.monotonic() - started)
+                    usage = _token_usage(response)
+                    self._record_usage(job_id, usage)
+                    if usage["total_tokens"]:
+                        self.token_bucket.adjust(usage["total_tokens"] - estimated_tokens)
+                    return response
+            finally:
+                self.limiter.release()
+
+            # 退避期间不占用并发槽位
+            await asyncio.sleep(backoff)
+
+    def _job_totals(self, job_id: str) -> Dict[str, int]:
+        return self._usage.setdefault(
+            job_id,
+            {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "avoided_calls": 0},
+        )
+
+    def _record_usage(self, job_id: Optional[str], usage: Dict[str, int]) -> None:
+        if job_id is None:
+            return
+        totals = self._job_totals(job_id)
+        totals["requests"] += 1
+        for key, value in usage.items():
+            totals[key] += value
+
+    def record_avoided_call(self) -> None:
+        """记录当前任务中一次无需调用LLM的提取（例如规则提取已解析全部字段）"""
+        job_id, _ = _job_context.get()
+        if job_id is not None:
+            self._job_totals(job_id)["avoided_calls"] += 1
+
+    def job_usage(self, job_id: str) -> Dict[str, Any]:
+        """返回任务当前的LLM用量（含避免的调用占比）"""
+        usage: Dict[str, Any] = dict(self._usage.get(job_id, {}))
+        attempted = usage.get("requests", 0) + usage.get("avoided_calls", 0)
+        if attempted:
+            usage["avoided_ratio"] = round(usage["avoided_calls"] / attempted, 3)
+        return usage
+
+    def pop_job_usage(self, job_id: str) -> Dict[str, Any]:
+        """返回并清除任务的LLM用量（任务结束时调用）"""
+        usage = self.job_usage(job_id)
+        self._usage.pop(job_id, None)
+        return usage
+
+    def stats(self) -> Dict[str, Any]:
+        """返回网关当前状态"""
+        return {
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "in_flight": self.limiter.in_flight,
+            "queued": len(self.limiter._waiters),
+        }
+
+
+# 全局网关实例
+llm_gateway = LLMGateway()
@@ -7,6 +7,7 @@ import sys
 
 from app.api.endpoints import router
 from app.core.config import settings
+from app.core.executor import shutdown_cpu_pool
 
 # 配置日志
 logging.basicConfig(
@@ -57,6 +58,7 @@ async def startup_event():
 async def shutdown_event():
     """应用关闭任务"""
     logger.info("AAAI-26 人才猎手 - 服务关闭中")
+    shutdown_cpu_pool()
 
 
 @app.get("/")
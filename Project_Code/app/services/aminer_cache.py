@@ -0,0 +1,39 @@
+"""AMiner结果缓存 - 搜索结果按规范化查询缓存，学者详情按AMiner ID缓存"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.cache_store import PersistentCache
+
+_CACHE_PATH = str(Path(settings.CACHE_DIR) / "aminer_cache.sqlite3")
+
+aminer_search_cache = PersistentCache(
+    path=_CACHE_PATH,
+    namespace="aminer_search",
+    ttl=settings.AMINER_SEARCH_CACHE_TTL_DAYS * 86400 if settings.AMINER_SEARCH_CACHE_TTL_DAYS else None,
+)
+
+aminer_detail_cache = PersistentCache(
+    path=_CACHE_PATH,
+    namespace="aminer_detail",
+    ttl=settings.AMINER_DETAIL_CACHE_TTL_DAYS * 86400 if settings.AMINER_DETAIL_CACHE_TTL_DAYS else None,
+)
+
+
+def make_search_cache_key(name: str, organization: str, offset: int, size: int) -> str:
+    """
+    构建搜索缓存键
+
+    Args:
+        name: 规范化后的学者姓名
+        organization: 规范化后的机构名称
+        offset: 分页偏移
+        size: 返回结果数量
+
+    Returns:
+        缓存键（sha256十六进制）
+    """
+    identity = [name, organization, offset, size]
+    return hashlib.sha256(json.dumps(identity, ensure_ascii=False).encode("utf-8")).hexdigest()
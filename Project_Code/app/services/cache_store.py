@@ -0,0 +1,178 @@
+"""基于SQLite的持久化键值缓存（支持TTL、LRU淘汰和命中率统计）"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentCache:
+    """
+    持久化键值缓存
+
+    值以JSON形式存储；超过max_entries时按最近访问时间淘汰，超过ttl的条目视为未命中
+
+    淘汰（TTL删除 + 计数）每隔若干次写入执行一次，而不是每次写入都执行；
+    间隔不超过EVICT_INTERVAL和容量的十分之一，两次淘汰之间条目数只会略超max_entries
+    """
+
+    # 每隔多少次写入执行一次淘汰（上限）
+    EVICT_INTERVAL = 100
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 50000, ttl: Optional[float] = None):
+        """
+        初始化缓存
+
+        Args:
+            path: SQLite数据库文件路径
+            namespace: 表名（同一数据库文件中可存放多个缓存）
+            max_entries: 最大条目数，0表示不限制
+            ttl: 条目有效期（秒），None表示永不过期
+        """
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._evict_interval = self.EVICT_INTERVAL
+        if max_entries:
+            self._evict_interval = min(self.EVICT_INTERVAL, max(1, max_entries // 10))
+        # 距上次淘汰的写入次数；初始即达到间隔，首次写入时清理上次运行遗留的过期条目
+        self._writes_since_evict = self._evict_interval
+
+    def _connect(self) -> sqlite3.Connection:
+        """懒加载数据库连接并建表"""
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.namespace} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.namespace}_accessed ON {self.namespace} (accessed_at)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存值，未命中或已过期时返回None
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    f"SELECT value, created_at FROM {self.namespace} WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                    self.misses += 1
+                    return None
+
+                conn.execute(f"UPDATE {self.namespace} SET accessed_at = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                return json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"[缓存:{self.namespace}] 读取失败: {str(e)}")
+                self.misses += 1
+                return None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        批量读取缓存
+
+        Args:
+            keys: 缓存键列表
+
+        Returns:
+            命中的键 -> 值字典
+        """
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key: str, value: Any, created_at: Optional[float] = None) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 可JSON序列化的值
+            created_at: 条目的创建时间（时间戳），用于TTL判断；默认为当前时间。
+                重新写入沿用的旧结果时传入其原始时间，避免有效期被不断延长
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.namespace} (key, value, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False, default=str), created_at or now, now),
+                )
+                self._writes_since_evict += 1
+                if self._writes_since_evict >= self._evict_interval:
+                    self._evict(conn)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"[缓存:{self.namespace}] 写入失败: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        """删除条目"""
+        with self._lock:
+            try:
+                self._connect().execute(f"DELETE FROM {self.namespace} WHERE key = ?", (key,))
+            except sqlite3.Error as e:
+                logger.warning(f"[缓存:{self.namespace}] 删除失败: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """淘汰过期条目及超出容量的最久未访问条目"""
+        self._writes_since_evict = 0
+        if self.ttl is not None:
+            conn.execute(f"DELETE FROM {self.namespace} WHERE created_at < ?", (time.time() - self.ttl,))
+
+        if self.max_entries:
+            count = conn.execute(f"SELECT COUNT(*) FROM {self.namespace}").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    f"DELETE FROM {self.namespace} WHERE key IN ("
+                    f"SELECT key FROM {self.namespace} ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            try:
+                self._connect().execute(f"DELETE FROM {self.namespace}")
+            except sqlite3.Error as e:
+                logger.warning(f"[缓存:{self.namespace}] 清空失败: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中率统计"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,145 @@
+"""增量采集存储 - 持久化来源页面指纹和候选人验证结果，未变化的页面和已验证的候选人直接沿用上次结果"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, List, Optional
+
+from app.api.models import CandidateProfile
+from app.core.config import settings
+from app.services.cache_store import PersistentCache
+
+logger = logging.getLogger(__name__)
+
+_STORE_PATH = str(Path(settings.CACHE_DIR) / "ingestion_state.sqlite3")
+
+# 来源页面URL -> {"digest": 页面指纹（含解析器版本）, "candidates": [...], "next_url": ...}
+page_fingerprints = PersistentCache(path=_STORE_PATH, namespace="page_fingerprint", max_entries=0)
+
+# 候选人指纹 -> 上次任务中已验证（VERIFIED）的候选人记录
+candidate_results = PersistentCache(
+    path=_STORE_PATH,
+    namespace="candidate_result",
+    max_entries=0,
+    ttl=settings.INCREMENTAL_RESULT_TTL_DAYS * 86400 if settings.INCREMENTAL_RESULT_TTL_DAYS else None,
+)
+
+
+def page_digest(html: str, parser_version: str = "") -> str:
+    """页面指纹（sha256）：页面内容 + 解析器版本，解析逻辑修改后旧的解析结果随之失效"""
+    digest = hashlib.sha256(parser_version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(html.encode("utf-8", "ignore"))
+    return digest.hexdigest()
+
+
+def candidate_fingerprint(candidate: CandidateProfile) -> str:
+    """
+    候选人指纹：规范化的姓名、所属单位和角色
+
+    任一字段变化（例如换了单位）都视为新候选人重新处理
+    """
+    fields = (candidate.name, candidate.affiliation, candidate.role)
+    identity = "|".join(" ".join(value.lower().split()) for value in fields)
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def load_unchanged_page(url: str, html: str, parser_version: str) -> Optional[dict]:
+    """
+    页面内容和解析器版本都与上次相同时返回上次的解析结果
+
+    Args:
+        url: 页面URL
+        html: 本次获取的HTML源码
+        parser_version: 解析器版本标识
+
+    Returns:
+        上次保存的条目（含candidates，分页页面还含next_url），页面有变化或首次抓取时返回None
+    """
+    if not settings.INCREMENTAL_INGESTION_ENABLED:
+        return None
+    stored = page_fingerprints.get(url)
+    if stored and stored.get("digest") == page_digest(html, parser_version):
+        return stored
+    return None
+
+
+def save_page(url: str, html: str, parser_version: str, candidates: List[CandidateProfile], **extra: Any) -> None:
+    """
+    保存页面指纹及解析结果
+
+    Args:
+        url: 页面URL
+        html: HTML源码
+        parser_version: 解析器版本标识
+        candidates: 从该页面解析出的候选人
+        **extra: 其他需要复用的解析结果（例如next_url）
+    """
+    if not settings.INCREMENTAL_INGESTION_ENABLED:
+        return
+    page_fingerprints.set(url, {
+        "digest": page_digest(html, parser_version),
+        "candidates": [c.model_dump(mode="json") for c in candidates],
+        **extra,
+    })
+
+
+def restore_previous_results(candidates: List[CandidateProfile]) -> int:
+    """
+    用上次任务的结果替换未变化的候选人（原地修改）
+
+    被替换的候选人状态已是VERIFIED，后续节点不会再处理；
+    只有新增或变化的候选人保持PENDING进入流水线
+
+    Args:
+        candidates: 本次采集的候选人列表
+
+    Returns:
+        沿用上次结果的候选人数量
+    """
+    if not settings.INCREMENTAL_INGESTION_ENABLED or not candidates:
+        return 0
+
+    fingerprints = [candidate_fingerprint(c) for c in candidates]
+    stored = candidate_results.get_many(fingerprints)
+
+    carried = 0
+    for i, fingerprint in enumerate(fingerprints):
+        previous = stored.get(fingerprint)
+        if previous is None:
+            continue
+        try:
+            candidates[i] = CandidateProfile(**previous)
+            carried += 1
+        except ValueError as e:
+            logger.warning(f"[增量采集] 上次结果无法加载，重新处理 {candidates[i].name}: {str(e)}")
+
+    logger.info(f"[增量采集] {carried}位候选人沿用上次结果, {len(candidates) - carried}位新增或有变化")
+    return carried
+
+
+def save_candidate_results(candidates: List[CandidateProfile]) -> int:
+    """
+    保存已验证（VERIFIED）的候选人结果，供下次任务沿用
+
+    FAILED不保存：失败原因多为暂时性的（搜索限流、主页暂时不可访问），下次任务应重新尝试；
+    SKIPPED不保存：过滤规则可能调整，且过滤本身开销很小。
+    有效期从验证时间起算：本次沿用的旧结果（增量采集或学者知识库）重新保存时不会延长有效期
+
+    Args:
+        candidates: 任务结束时的候选人列表
+
+    Returns:
+        保存的候选人数量
+    """
+    if not settings.INCREMENTAL_INGESTION_ENABLED:
+        return 0
+
+    saved = 0
+    for candidate in candidates:
+        if candidate.status != "VERIFIED":
+            continue
+        verified_at = candidate.verification_time.timestamp() if candidate.verification_time else None
+        candidate_results.set(candidate_fingerprint(candidate), candidate.model_dump(mode="json"), created_at=verified_at)
+        saved += 1
+    return saved
@@ -0,0 +1,55 @@
+"""LLM提取结果缓存 - 页面内容与提示词未变化时不再重复调用模型"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.cache_store import PersistentCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+llm_cache = PersistentCache(
+    path=str(Path(settings.CACHE_DIR) / "llm_cache.sqlite3"),
+    namespace="llm_extraction",
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl=settings.LLM_CACHE_TTL_DAYS * 86400 if settings.LLM_CACHE_TTL_DAYS else None,
+)
+
+
+def hash_page_text(page_text: str) -> str:
+    """对规范化（合并空白）后的页面文本计算哈希"""
+    normalized = _WHITESPACE.sub(" ", page_text or "").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def make_llm_cache_key(
+    page_text: str,
+    name: str,
+    affiliation: str,
+    model: str,
+    prompt_version: str
+) -> str:
+    """
+    构建LLM提取缓存键
+
+    Args:
+        page_text: 页面文本
+        name: 候选人姓名
+        affiliation: 候选人所属单位
+        model: 模型名称
+        prompt_version: 提示词版本
+
+    Returns:
+        缓存键（sha256十六进制）
+    """
+    identity = [
+        hash_page_text(page_text),
+        name.strip().lower(),
+        affiliation.strip().lower(),
+        model,
+        prompt_version,
+        settings.LLM_CONTEXT_TOKEN_BUDGET,  # 预算不同时发送给模型的内容也不同
+    ]
+    return hashlib.sha256(json.dumps(identity, ensure_ascii=False).encode("utf-8")).hexdigest()
@@ -0,0 +1,198 @@
+"""学者知识库 - 跨会议持久化已验证的学者档案，侦探节点在任何外部调用前先查询"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from app.api.models import CandidateProfile
+from app.agents.tools.entity_resolution import identity_key
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 知识库保存的档案字段
+_PROFILE_FIELDS = ("homepage", "email", "name_cn", "bachelor_univ", "country_region", "aminer_id")
+
+
+class ScholarKnowledgeBase:
+    """
+    学者知识库
+
+    以规范化身份键（姓名 + 规范单位）为主键，另按AMiner ID建索引；
+    单位未知的学者只以AMiner ID为键（"aminer:<id>"），避免同名者共享档案；
+    每条记录保存验证时间，超过新鲜期的记录只作为重新验证的线索
+    """
+
+    def __init__(self, path: str, freshness_days: int = 180):
+        """
+        初始化知识库
+
+        Args:
+            path: SQLite数据库文件路径
+            freshness_days: 新鲜期（天），0表示永不过期
+        """
+        self.path = path
+        self.freshness = freshness_days * 86400 if freshness_days else None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """懒加载数据库连接并建表"""
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS scholars ("
+                "identity_key TEXT PRIMARY KEY, aminer_id TEXT, name TEXT NOT NULL, affiliation TEXT, "
+                "profile TEXT NOT NULL, sources TEXT NOT NULL, "
+                "first_seen REAL NOT NULL, verified_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS scholars_aminer ON scholars (aminer_id)")
+        return self._conn
+
+    def lookup(self, name: str, affiliation: str, aminer_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        查找学者档案
+
+        有AMiner ID时优先按ID查找（换了单位也能命中），否则按身份键查找；
+        单位未知且没有AMiner ID时不查找
+
+        Args:
+            name: 英文姓名
+            affiliation: 所属单位
+            aminer_id: AMiner学者ID（可选）
+
+        Returns:
+            档案字典（含verified_at、sources和fresh标记），未收录时返回None
+        """
+        key = identity_key(name, affiliation)
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = None
+                if aminer_id:
+                    row = conn.execute(
+                        "SELECT profile, sources, verified_at FROM scholars WHERE aminer_id = ? "
+                        "ORDER BY verified_at DESC LIMIT 1", (aminer_id,)
+                    ).fetchone()
+                if row is None and key:
+                    row = conn.execute(
+                        "SELECT profile, sources, verified_at FROM scholars WHERE identity_key = ?", (key,)
+                    ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"[学者知识库] 读取失败: {str(e)}")
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            entry = json.loads(row[0])
+            entry["sources"] = json.loads(row[1])
+            entry["verified_at"] = row[2]
+            entry["fresh"] = self.freshness is None or time.time() - row[2] <= self.freshness
+            if entry["fresh"]:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry
+
+    def record_verified(self, candidates: Iterable[CandidateProfile], source: str) -> int:
+        """
+        写入或更新已验证（VERIFIED）的学者档案
+
+        验证时间取candidate.verification_time：直接使用知识库结果的候选人不会刷新新鲜期；
+        单位未知且没有AMiner ID的候选人不写入
+
+        Args:
+            candidates: 任务结束时的候选人列表
+            source: 来源标识（例如"AAAI-26"），累积到档案的sources中
+
+        Returns:
+            写入的档案数量
+        """
+        now = time.time()
+        saved = 0
+        with self._lock:
+            try:
+                conn = self._connect()
+                for candidate in candidates:
+                    if candidate.status != "VERIFIED" or not candidate.homepage:
+                        continue
+
+                    key = identity_key(candidate.name, candidate.affiliation)
+                    if key is None:
+                        if not candidate.aminer_id:
+                            continue
+                        key = f"aminer:{candidate.aminer_id}"
+                    verified_at = candidate.verification_time.timestamp() if candidate.verification_time else now
+                    profile = {field: getattr(candidate, field) for field in _PROFILE_FIELDS}
+                    profile["interests"] = candidate.interests or []
+
+                    existing = conn.execute(
+                        "SELECT sources, first_seen, verified_at FROM scholars WHERE identity_key = ?", (key,)
+                    ).fetchone()
+                    sources = json.loads(existing[0]) if existing else []
+                    if source not in sources:
+                        sources.append(source)
+                    first_seen = existing[1] if existing else verified_at
+
+                    conn.execute(
+                        "INSERT OR REPLACE INTO scholars (identity_key, aminer_id, name, affiliation, profile, "
+                        "sources, first_seen, verified_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            key, candidate.aminer_id, candidate.name, candidate.affiliation,
+                            json.dumps(profile, ensure_ascii=False, default=str),
+                            json.dumps(sources, ensure_ascii=False),
+                            first_seen, max(verified_at, existing[2]) if existing else verified_at,
+                        ),
+                    )
+                    saved += 1
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"[学者知识库] 写入失败: {str(e)}")
+        return saved
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中率统计"""
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+def apply_profile(candidate: CandidateProfile, entry: Dict[str, Any]) -> None:
+    """
+    用知识库档案补全候选人信息（只填补空字段）
+
+    Args:
+        candidate: 候选人
+        entry: lookup返回的档案
+    """
+    for field in _PROFILE_FIELDS:
+        if getattr(candidate, field) is None and entry.get(field) is not None:
+            setattr(candidate, field, entry[field])
+    for interest in entry.get("interests") or []:
+        if candidate.interests is None:
+            candidate.interests = []
+        if interest not in candidate.interests:
+            candidate.interests.append(interest)
+    candidate.verification_time = datetime.fromtimestamp(entry["verified_at"])
+
+
+# 全局知识库实例
+scholar_kb = ScholarKnowledgeBase(
+    path=str(Path(settings.CACHE_DIR) / "scholar_kb.sqlite3"),
+    freshness_days=settings.SCHOLAR_KB_FRESHNESS_DAYS,
+)
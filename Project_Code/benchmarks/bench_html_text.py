@@ -0,0 +1,90 @@
+"""HTML转文本引擎基准测试 - 比较各引擎的吞吐量及与BeautifulSoup输出的一致性
+
+用法（在Project_Code目录下运行）：
+    python -m benchmarks.bench_html_text [--repeat 200] [--fixtures benchmarks/fixtures/homepages]
+"""
+
+import argparse
+import difflib
+import os
+import sys
+import time
+from pathlib import Path
+
+# 基准测试不需要真实的LLM密钥
+os.environ.setdefault("SILICONFLOW_API_KEY", "benchmark")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.agents.tools.html_text import EXTRACTORS  # noqa: E402
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "homepages"
+
+
+def load_corpus(fixtures_dir: Path) -> dict:
+    """加载HTML样本语料"""
+    return {
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted(fixtures_dir.glob("*.html"))
+    }
+
+
+def token_jaccard(a: str, b: str) -> float:
+    """词集合的Jaccard相似度"""
+    set_a, set_b = set(a.split()), set(b.split())
+    if not set_a and not set_b:
+        return 1.0
+    return len(set_a & set_b) / len(set_a | set_b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="每个样本重复解析次数")
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES, help="HTML样本目录")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.fixtures)
+    if not corpus:
+        print(f"未找到HTML样本: {args.fixtures}")
+        return
+
+    total_bytes = sum(len(html.encode("utf-8")) for html in corpus.values())
+    print(f"语料: {len(corpus)}个页面, {total_bytes / 1024:.1f} KB, 每页重复{args.repeat}次\n")
+
+    baseline = {}
+    try:
+        baseline = {name: EXTRACTORS["bs4"](html) for name, html in corpus.items()}
+    except ImportError as e:
+        print(f"BeautifulSoup不可用，跳过一致性比较: {e}\n")
+
+    print(f"{'引擎':<8}{'页面/秒':>12}{'MB/秒':>10}{'词集一致':>10}{'序列相似':>10}")
+    for engine, extractor in EXTRACTORS.items():
+        try:
+            outputs = {name: extractor(html) for name, html in corpus.items()}
+        except ImportError as e:
+            print(f"{engine:<8}不可用: {e}")
+            continue
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for html in corpus.values():
+                extractor(html)
+        elapsed = time.perf_counter() - start
+
+        pages = len(corpus) * args.repeat
+        mb = total_bytes * args.repeat / (1024 * 1024)
+
+        if baseline:
+            jaccard = sum(token_jaccard(outputs[n], baseline[n]) for n in corpus) / len(corpus)
+            ratio = sum(
+                difflib.SequenceMatcher(None, outputs[n], baseline[n], autojunk=False).ratio()
+                for n in corpus
+            ) / len(corpus)
+            parity = f"{jaccard:>10.3f}{ratio:>10.3f}"
+        else:
+            parity = f"{'-':>10}{'-':>10}"
+
+        print(f"{engine:<8}{pages / elapsed:>12.0f}{mb / elapsed:>10.2f}{parity}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""测试配置：将项目根目录加入导入路径"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,61 @@
+"""中文姓名识别测试"""
+
+import pytest
+
+from app.agents.tools.chinese_name import classify_name, classify_names
+
+
+@pytest.mark.parametrize("name", [
+    "Xiaoming Wang",
+    "Wang Xiaoming",
+    "Chen, Lei",
+    "Wei Zhang",
+    "Wai-Kin Lee",
+    "Ka Wai Choi",
+    "Hsiao-Wen Chung",
+    "Xiaoming Kang",
+    "Wai Kin Ho",
+    "Jun Long",
+    "张伟",
+])
+def test_chinese_names(name):
+    assert classify_name(name)
+
+
+@pytest.mark.parametrize("name", [
+    # 姓氏与西方姓氏同形，名字不是拼音
+    "Robert Lee",
+    "Peter Ho",
+    "Ava Long",
+    "Kevin Lee",
+    "Sean Lo",
+    "Maria So",
+    "Anna Lee",
+    "Kate Law",
+    "Mike Long",
+    # 韩国姓名
+    "Yejin Choi",
+    "Joon Son Chung",
+    "U Kang",
+    # 韩国/日本/越南姓名，首词与中文姓氏同形
+    "Jin Kim",
+    "Yu Sato",
+    "Tu Vu",
+    "Tan Nguyen",
+    "Hoang Ma",
+    "Han Solo",
+    # 非中文姓氏
+    "John Smith",
+    "Yoshua Bengio",
+])
+def test_non_chinese_names(name):
+    assert not classify_name(name)
+
+
+def test_empty_name():
+    assert not classify_name("")
+
+
+def test_classify_names_preserves_order():
+    names = ["Wei Zhang", "John Smith", "Wei Zhang"]
+    assert classify_names(names) == [True, False, True]
@@ -0,0 +1,27 @@
+"""国家/地区解析测试"""
+
+import pytest
+
+from app.agents.tools.country_resolver import resolve_country
+from app.agents.tools.region_gazetteer import MAINLAND_CHINA
+
+
+@pytest.mark.parametrize("affiliation, expected", [
+    # 分校区限定词优先于母校别名
+    ("The Hong Kong University of Science and Technology (Guangzhou)", MAINLAND_CHINA),
+    ("HKUST (Guangzhou)", MAINLAND_CHINA),
+    ("The Chinese University of Hong Kong, Shenzhen", MAINLAND_CHINA),
+    ("HKUST", "中国香港"),
+    ("The Chinese University of Hong Kong", "中国香港"),
+    ("Tsinghua University", MAINLAND_CHINA),
+    ("University of Washington", "美国"),
+    ("Microsoft Research Asia, Beijing", MAINLAND_CHINA),
+    ("Baidu Research, Sunnyvale, CA, USA", "美国"),
+])
+def test_resolve_country(affiliation, expected):
+    assert resolve_country(affiliation) == expected
+
+
+def test_unknown_affiliation():
+    assert resolve_country("Unknown") is None
+    assert resolve_country("") is None
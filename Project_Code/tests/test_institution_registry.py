@@ -0,0 +1,32 @@
+"""机构注册表测试"""
+
+import pytest
+
+from app.agents.tools.institution_registry import affiliation_aliases, lookup_institution
+
+
+@pytest.mark.parametrize("affiliation, expected", [
+    ("Rice", "Rice University"),
+    ("Meta", "Meta AI"),
+    ("UW", "University of Washington"),
+    ("Dept. of CS, UC Berkeley", "University of California, Berkeley"),
+    ("Google Research, Mountain View", "Google"),
+])
+def test_lookup_institution(affiliation, expected):
+    assert lookup_institution(affiliation).name == expected
+
+
+@pytest.mark.parametrize("affiliation", [
+    # 歧义单词别名只在整串一致时匹配，地名分段不命中
+    "Berkeley, CA",
+    "Dept. of Physics, Cambridge, MA",
+    "Duke Energy, Charlotte",
+])
+def test_ambiguous_alias_not_matched_in_segments(affiliation):
+    assert lookup_institution(affiliation) is None
+
+
+def test_ambiguous_aliases_excluded_from_page_matching():
+    assert affiliation_aliases("Rice University") == ["Rice University"]
+    assert "Meta" not in affiliation_aliases("Meta AI")
+    assert affiliation_aliases("Apple") == ["Apple ML Research"]
@@ -0,0 +1,55 @@
+"""学者知识库测试"""
+
+from datetime import datetime
+
+import pytest
+
+from app.api.models import CandidateProfile
+from app.services.scholar_kb import ScholarKnowledgeBase
+
+
+def _verified(name, affiliation, aminer_id=None, homepage="https://example.edu/~scholar"):
+    return CandidateProfile(
+        name=name,
+        affiliation=affiliation,
+        role="技术轨道",
+        status="VERIFIED",
+        homepage=homepage,
+        aminer_id=aminer_id,
+        verification_time=datetime.now(),
+    )
+
+
+@pytest.fixture
+def kb(tmp_path):
+    return ScholarKnowledgeBase(path=str(tmp_path / "scholar_kb.sqlite3"), freshness_days=180)
+
+
+def test_lookup_by_identity_key(kb):
+    assert kb.record_verified([_verified("Wei Zhang", "Tsinghua University")], source="AAAI-26") == 1
+
+    entry = kb.lookup("Wei Zhang", "Tsinghua University")
+    assert entry["homepage"] == "https://example.edu/~scholar"
+    assert entry["sources"] == ["AAAI-26"]
+    assert entry["fresh"]
+
+
+def test_lookup_by_aminer_id_after_affiliation_change(kb):
+    kb.record_verified([_verified("Wei Zhang", "Tsinghua University", aminer_id="53f4")], source="AAAI-26")
+
+    # 单位写法变化（或换了单位）后身份键不同，仍按AMiner ID命中
+    entry = kb.lookup("Wei Zhang", "Dept. of CS, Tsinghua Univ., Beijing", aminer_id="53f4")
+    assert entry is not None
+    assert entry["aminer_id"] == "53f4"
+    assert entry["homepage"] == "https://example.edu/~scholar"
+
+    # 没有AMiner ID时不会误命中
+    assert kb.lookup("Wei Zhang", "Peking University") is None
+
+
+def test_unknown_affiliation_keyed_by_aminer_id(kb):
+    assert kb.record_verified([_verified("Wei Zhang", "Unknown")], source="AAAI-26") == 0
+    assert kb.record_verified([_verified("Wei Zhang", "Unknown", aminer_id="53f4")], source="AAAI-26") == 1
+
+    assert kb.lookup("Wei Zhang", "Unknown") is None
+    assert kb.lookup("Wei Zhang", "Unknown", aminer_id="53f4")["aminer_id"] == "53f4"